@@ -19,15 +19,17 @@
 #
 
 import logging
-from typing import Any
+import pathlib
+import sys
+from typing import TYPE_CHECKING, Any, Optional
 from pysonar_scanner import app_logging
-from pysonar_scanner import cache
 from pysonar_scanner import exceptions
-from pysonar_scanner.api import get_base_urls, SonarQubeApi, BaseUrls, MIN_SUPPORTED_SQ_VERSION
-from pysonar_scanner.configuration import configuration_loader
+from pysonar_scanner.configuration import configuration_loader, configuration_snapshot
 from pysonar_scanner.configuration.configuration_loader import ConfigurationLoader
+from pysonar_scanner.configuration.provenance import ConfigurationProvenance
 from pysonar_scanner.configuration.properties import (
     SONAR_VERBOSE,
+    SONAR_SCANNER_ASYNC_LOGGING,
     SONAR_HOST_URL,
     SONAR_SCANNER_API_BASE_URL,
     SONAR_SCANNER_SONARCLOUD_URL,
@@ -36,13 +38,21 @@ from pysonar_scanner.configuration.properties import (
     SONAR_SCANNER_OS,
     SONAR_SCANNER_ARCH,
     SONAR_SCANNER_DRY_RUN,
+    SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT,
+    SONAR_SCANNER_BATCH_PROJECTS,
     SONAR_PROJECT_BASE_DIR,
     SONAR_PYTHON_COVERAGE_REPORT_PATHS,
 )
-from pysonar_scanner.exceptions import SQTooOldException
-from pysonar_scanner.jre import JREResolvedPath, JREProvisioner, JREResolver, JREResolverConfiguration
-from pysonar_scanner.scannerengine import ScannerEngine, ScannerEngineProvisioner
-from pysonar_scanner.dry_run_reporter import DryRunReporter, CoverageReportValidator, ValidationResult
+from pysonar_scanner.exceptions import InconsistentConfiguration, SQTooOldException
+from pysonar_scanner.utils import get_working_directory
+
+CONFIGURATION_SOURCES_FILENAME = "configuration-sources.json"
+
+# The subsystems below pull in the HTTP stack, the archive modules and the XML parser: they are only imported
+# by the phases using them, so that --help, configuration errors and dry runs start quickly
+if TYPE_CHECKING:
+    from pysonar_scanner.api import BaseUrls, SonarQubeApi
+    from pysonar_scanner.jre import JREResolvedPath
 
 
 def main():
@@ -54,6 +64,8 @@ def scan():
         return do_scan()
     except Exception as e:
         return exceptions.log_error(e)
+    finally:
+        app_logging.shutdown()
 
 
 def do_scan():
@@ -62,14 +74,21 @@ def do_scan():
         "Enhance your workflow: Pair pysonar with SonarQube Server per your license or SonarQube Cloud for deeper analysis, and try SonarQube-IDE in your favourite IDE."
     )
     logging.info("Starting Pysonar, the Sonar scanner CLI for Python")
-    config = ConfigurationLoader.load()
+    provenance = ConfigurationProvenance()
+    config = ConfigurationLoader.load(provenance)
     set_logging_options(config)
+    logging.debug(f"Configuration loaded in {provenance.total_duration_ms():.1f} ms")
 
     if config.get(SONAR_SCANNER_DRY_RUN, False):
-        return run_dry_run(config)
+        return run_dry_run(config, provenance)
+
+    if config.get(SONAR_SCANNER_BATCH_PROJECTS):
+        return run_batch(config)
 
     ConfigurationLoader.check_configuration(config)
 
+    from pysonar_scanner import cache
+
     api = build_api(config)
     check_version(api)
     update_config_with_api_urls(config, api.base_urls)
@@ -79,20 +98,57 @@ def do_scan():
     scanner = create_scanner_engine(api, cache_manager, config)
 
     logging.info("Starting the analysis...")
-    return scanner.run(config)
+    # The engine cleans the working directory, where the configuration snapshot is stored
+    with configuration_snapshot.preserved(get_working_directory(config)):
+        return scanner.run(config)
+
+
+def run_batch(config: dict[str, Any]) -> int:
+    """
+    Analyze several projects, sharing the server connection, the JRE and the scanner engine between them.
+    Each project is configured as if the scanner was run from its directory with the same command line.
+    """
+    from pysonar_scanner import batch, cache
+
+    project_dirs = batch.get_project_directories(config)
+    if not project_dirs:
+        raise InconsistentConfiguration(f"No project to analyze was found for {SONAR_SCANNER_BATCH_PROJECTS}")
+
+    api = build_api(config)
+    check_version(api)
+    update_config_with_api_urls(config, api.base_urls)
+    cache_manager = cache.get_cache(config)
+    scanner = create_scanner_engine(api, cache_manager, config)
+
+    def load_project_configuration(project_dir: pathlib.Path) -> dict[str, Any]:
+        project_config = ConfigurationLoader.load(argv=[*sys.argv[1:], "--sonar-project-base-dir", str(project_dir)])
+        ConfigurationLoader.check_configuration(project_config)
+        update_config_with_api_urls(project_config, api.base_urls)
+        project_config[SONAR_SCANNER_JAVA_EXE_PATH] = config[SONAR_SCANNER_JAVA_EXE_PATH]
+        return project_config
+
+    root = pathlib.Path(config.get(SONAR_PROJECT_BASE_DIR) or ".")
+    runner = batch.BatchRunner(scanner, load_project_configuration, root, batch.get_workers(config))
+    return runner.run(project_dirs)
 
 
 def set_logging_options(config):
     app_logging.configure_logging_level(verbose=config.get(SONAR_VERBOSE, False))
+    if str(config.get(SONAR_SCANNER_ASYNC_LOGGING, False)).lower() == "true":
+        app_logging.enable_async_logging()
 
 
-def build_api(config: dict[str, Any]) -> SonarQubeApi:
+def build_api(config: dict[str, Any]) -> "SonarQubeApi":
+    from pysonar_scanner.api import SonarQubeApi, get_base_urls
+
     token = configuration_loader.get_token(config)
     base_urls = get_base_urls(config)
     return SonarQubeApi(base_urls, token)
 
 
-def check_version(api: SonarQubeApi):
+def check_version(api: "SonarQubeApi"):
+    from pysonar_scanner.api import MIN_SUPPORTED_SQ_VERSION
+
     if api.is_sonar_qube_cloud():
         logging.debug(f"SonarQube Cloud url: {api.base_urls.base_url}")
         return
@@ -107,7 +163,7 @@ def check_version(api: SonarQubeApi):
         )
 
 
-def update_config_with_api_urls(config, base_urls: BaseUrls):
+def update_config_with_api_urls(config, base_urls: "BaseUrls"):
     config[SONAR_HOST_URL] = base_urls.base_url
     config[SONAR_SCANNER_API_BASE_URL] = base_urls.api_base_url
     if base_urls.is_sonar_qube_cloud:
@@ -116,29 +172,42 @@ def update_config_with_api_urls(config, base_urls: BaseUrls):
 
 
 def create_scanner_engine(api, cache_manager, config):
+    from pysonar_scanner.scannerengine import ScannerEngine, ScannerEngineProvisioner
+
     jre_path = create_jre(api, cache_manager, config)
     config[SONAR_SCANNER_JAVA_EXE_PATH] = str(jre_path.path)
     logging.debug(f"JRE path: {jre_path.path}")
     scanner_engine_path = ScannerEngineProvisioner(api, cache_manager).provision()
-    scanner = ScannerEngine(jre_path, scanner_engine_path)
+    scanner = ScannerEngine(jre_path, scanner_engine_path, cache_manager)
     return scanner
 
 
-def create_jre(api, cache, config: dict[str, Any]) -> JREResolvedPath:
+def create_jre(api, cache, config: dict[str, Any]) -> "JREResolvedPath":
+    from pysonar_scanner.jre import JREProvisioner, JREResolver, JREResolverConfiguration, SystemJREDetector
+
     jre_provisioner = JREProvisioner(api, cache, config[SONAR_SCANNER_OS], config[SONAR_SCANNER_ARCH])
-    jre_resolver = JREResolver(JREResolverConfiguration.from_dict(config), jre_provisioner)
+    system_jre_detector = SystemJREDetector(cache, config[SONAR_SCANNER_OS])
+    jre_resolver = JREResolver(JREResolverConfiguration.from_dict(config), jre_provisioner, system_jre_detector)
     return jre_resolver.resolve_jre()
 
 
-def run_dry_run(config: dict[str, Any]) -> int:
+def run_dry_run(config: dict[str, Any], provenance: Optional[ConfigurationProvenance] = None) -> int:
     """
     Run in dry-run mode without connecting to SonarQube server.
     Validates configuration and coverage reports.
     """
+    from pysonar_scanner.dry_run_reporter import CoverageReportValidator, DryRunReporter
+
     logging.info("Running in DRY RUN mode")
     logging.info("No server connection will be made and no analysis will be submitted")
 
     DryRunReporter.report_configuration(config)
+    if provenance is not None:
+        # Dry run writes no file unless asked to: the working directory may not exist yet or be read-only
+        json_path = None
+        if str(config.get(SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT, False)).lower() == "true":
+            json_path = get_working_directory(config) / CONFIGURATION_SOURCES_FILENAME
+        DryRunReporter.report_provenance(provenance, json_path)
 
     coverage_paths = config.get(SONAR_PYTHON_COVERAGE_REPORT_PATHS)
     project_base_dir = config.get(SONAR_PROJECT_BASE_DIR, ".")
@@ -18,7 +18,18 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Number of log records buffered in async mode before DEBUG records start being dropped
+ASYNC_LOGGING_QUEUE_SIZE = 10_000
+
+_console_handlers: list[logging.Handler] = []
+_queue_handler: Optional["DroppingQueueHandler"] = None
+_queue_listener: Optional[QueueListener] = None
 
 
 class LevelFilter(logging.Filter):
@@ -40,12 +51,91 @@ def setup() -> None:
     error_handler = logging.StreamHandler(sys.stderr)
     error_handler.setLevel(logging.ERROR)
 
-    formatter = logging.Formatter("%(levelname)s: %(message)s")
+    # In batch mode, log_prefix holds the name of the project a record was logged for
+    formatter = logging.Formatter("%(levelname)s: %(log_prefix)s%(message)s", defaults={"log_prefix": ""})
     non_error_handler.setFormatter(formatter)
     error_handler.setFormatter(formatter)
 
     logger.addHandler(non_error_handler)
     logger.addHandler(error_handler)
+    _console_handlers.extend([non_error_handler, error_handler])
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks on DEBUG records: when the queue is full they are dropped and counted,
+    and a summary of the dropped records is logged before the next record that is not dropped.
+    Records of level INFO and above wait for room in the queue, so they are never lost.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        # QueueHandler types its queue as put_nowait only; the blocking put of this queue is needed as well
+        self.__queue = log_queue
+        self.dropped_records = 0
+        self.__lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno < logging.INFO:
+            try:
+                self.__queue.put_nowait(record)
+            except queue.Full:
+                with self.__lock:
+                    self.dropped_records += 1
+            return
+        self.report_dropped_records()
+        self.__queue.put(record)
+
+    def report_dropped_records(self) -> None:
+        with self.__lock:
+            dropped_records, self.dropped_records = self.dropped_records, 0
+        if dropped_records > 0:
+            summary = logging.makeLogRecord(
+                {
+                    "levelno": logging.WARNING,
+                    "levelname": logging.getLevelName(logging.WARNING),
+                    "msg": f"{dropped_records} DEBUG log lines were dropped because the console could not keep up",
+                }
+            )
+            self.__queue.put(summary)
+
+
+def enable_async_logging(queue_size: int = ASYNC_LOGGING_QUEUE_SIZE) -> None:
+    """Write the console logs from a background thread, so that logging does not block when the console is slow."""
+    global _queue_handler, _queue_listener
+    if _queue_listener is not None:
+        return
+    logger = logging.getLogger()
+    handlers = [handler for handler in _console_handlers if handler in logger.handlers]
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(_queue_handler)
+    _queue_listener.start()
+
+
+def flush() -> None:
+    """Wait until all the log records emitted so far have been written to the console."""
+    if _queue_handler is not None:
+        _queue_handler.report_dropped_records()
+        _queue_handler.queue.join()  # type: ignore[attr-defined]
+
+
+def shutdown() -> None:
+    """Flush the pending log records and go back to writing the console logs synchronously."""
+    global _queue_handler, _queue_listener
+    if _queue_handler is None or _queue_listener is None:
+        return
+    logger = logging.getLogger()
+    logger.removeHandler(_queue_handler)
+    _queue_handler.report_dropped_records()
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        logger.addHandler(handler)
+    _queue_handler = None
+    _queue_listener = None
 
 
 def configure_logging_level(verbose: bool) -> None:
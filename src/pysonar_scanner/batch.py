@@ -0,0 +1,267 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from pysonar_scanner import exceptions
+from pysonar_scanner.configuration import configuration_snapshot
+from pysonar_scanner.configuration.project_files import PYPROJECT_TOML, SONAR_PROJECT_PROPERTIES
+from pysonar_scanner.configuration.properties import (
+    SONAR_PROJECT_BASE_DIR,
+    SONAR_SCANNER_BATCH_PROJECTS,
+    SONAR_SCANNER_BATCH_WORKERS,
+)
+from pysonar_scanner.exceptions import InconsistentConfiguration
+from pysonar_scanner.scannerengine import ScannerEngine, SignalForwarder
+from pysonar_scanner.utils import DEFAULT_WORKING_DIRECTORY, get_working_directory
+
+# Value of sonar.scanner.batchProjects asking for the projects to be discovered below the base directory
+DISCOVER_PROJECTS = "auto"
+PROJECT_MARKERS = (PYPROJECT_TOML, SONAR_PROJECT_PROPERTIES)
+# Directories never holding a project of the repository; hidden directories are skipped as well
+IGNORED_DIRECTORIES = frozenset(
+    ("node_modules", "__pycache__", "venv", "env", "build", "dist", "site-packages", DEFAULT_WORKING_DIRECTORY)
+)
+# The log file of each project is stored in its working directory once its analysis is over
+PROJECT_LOG_FILENAME = "pysonar.log"
+
+
+@dataclass(frozen=True)
+class ProjectResult:
+    project_dir: pathlib.Path
+    returncode: int
+    duration_seconds: float
+    log_path: Optional[pathlib.Path]
+
+
+def discover_projects(root: pathlib.Path) -> list[pathlib.Path]:
+    """
+    Return the directories below root holding a pyproject.toml or a sonar-project.properties file.
+    The directories of a project are not searched for other projects.
+    """
+    projects = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        directory = pathlib.Path(dirpath)
+        if directory != root and any(marker in filenames for marker in PROJECT_MARKERS):
+            projects.append(directory)
+            dirnames.clear()
+            continue
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith(".") and name not in IGNORED_DIRECTORIES)
+    return sorted(projects)
+
+
+def get_project_directories(config: dict[str, Any]) -> list[pathlib.Path]:
+    """Return the directories of the projects to analyze in batch mode, listed or discovered below the base directory."""
+    base_dir = pathlib.Path(config.get(SONAR_PROJECT_BASE_DIR) or ".")
+    projects = str(config[SONAR_SCANNER_BATCH_PROJECTS]).strip()
+    if projects.lower() == DISCOVER_PROJECTS:
+        return discover_projects(base_dir)
+    project_dirs = list(dict.fromkeys(base_dir / project.strip() for project in projects.split(",") if project.strip()))
+    missing_dirs = [str(project_dir) for project_dir in project_dirs if not project_dir.is_dir()]
+    if missing_dirs:
+        raise InconsistentConfiguration(
+            f"The following projects of {SONAR_SCANNER_BATCH_PROJECTS} are not directories: {', '.join(missing_dirs)}"
+        )
+    return project_dirs
+
+
+def get_workers(config: dict[str, Any]) -> int:
+    value = config.get(SONAR_SCANNER_BATCH_WORKERS)
+    if value is None:
+        return 1
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        workers = 0
+    if workers < 1:
+        logging.warning(f"Invalid value '{value}' for {SONAR_SCANNER_BATCH_WORKERS}, expected a positive integer")
+        return 1
+    return workers
+
+
+# Name of the project whose analysis is running in the current thread, if any
+_current_project: ContextVar[Optional[str]] = ContextVar("pysonar_batch_project", default=None)
+
+
+def project_record_factory(factory: Callable[..., logging.LogRecord]) -> Callable[..., logging.LogRecord]:
+    """
+    Wrap a log record factory so that the records logged during the analysis of a project carry its name, in the
+    `project` attribute, and the console prefix naming it, in the `log_prefix` attribute.
+
+    Records are tagged when they are created, by the thread analyzing the project: the engine logs are forwarded
+    from the thread that started the engine, and the console may write the records from another thread.
+    """
+
+    def create_record(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = factory(*args, **kwargs)
+        project = _current_project.get()
+        if project is not None:
+            record.project = project
+            record.log_prefix = f"[{project}] "
+        return record
+
+    return create_record
+
+
+class ProjectFilter(logging.Filter):
+    """Handler filter keeping the records logged during the analysis of a single project."""
+
+    def __init__(self, project: str):
+        super().__init__()
+        self.project = project
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "project", None) == self.project
+
+
+@dataclass
+class ProjectAnalysis:
+    """Analysis of a project of the batch: its log file and its configuration, or the exit code of its failed loading."""
+
+    project_dir: pathlib.Path
+    name: str
+    log_file: pathlib.Path
+    handler: logging.Handler
+    config: dict[str, Any]
+    returncode: Optional[int] = None
+    duration_seconds: float = 0.0
+
+
+class BatchRunner:
+    """
+    Analyze several projects with the same scanner engine, each in its own engine process, at most `workers` of
+    them at the same time. The analysis of each project gets its own log file and exit code.
+
+    The configuration of each project is resolved by `load_configuration` from its directory. The configurations are
+    loaded one after the other before any analysis starts: the configuration loaders share process-wide caches.
+    """
+
+    def __init__(
+        self,
+        scanner: ScannerEngine,
+        load_configuration: Callable[[pathlib.Path], dict[str, Any]],
+        root: pathlib.Path,
+        workers: int = 1,
+    ):
+        self.scanner = scanner
+        self.load_configuration = load_configuration
+        self.root = root
+        self.workers = workers
+        self.signal_forwarder = SignalForwarder()
+
+    def run(self, project_dirs: list[pathlib.Path]) -> int:
+        """Analyze the projects and return the exit code of the first project whose analysis failed, or 0."""
+        concurrent_runs = min(self.workers, len(project_dirs))
+        logging.info(f"Analyzing {len(project_dirs)} projects, {concurrent_runs} at a time")
+        record_factory = logging.getLogRecordFactory()
+        logging.setLogRecordFactory(project_record_factory(record_factory))
+        # Signals are received by the main thread only: one forwarder, installed here, stops all the running engines
+        self.signal_forwarder.install()
+        try:
+            analyses = [self.prepare(project_dir) for project_dir in project_dirs]
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pysonar-batch") as executor:
+                results = list(executor.map(self.analyze, analyses, [concurrent_runs] * len(analyses)))
+        finally:
+            self.signal_forwarder.uninstall()
+            logging.setLogRecordFactory(record_factory)
+        self.report(results)
+        return next((result.returncode for result in results if result.returncode != 0), 0)
+
+    def prepare(self, project_dir: pathlib.Path) -> ProjectAnalysis:
+        """Create the log file of a project and load its configuration."""
+        name = self.project_name(project_dir)
+        fd, log_file = tempfile.mkstemp(prefix="pysonar-", suffix=".log")
+        os.close(fd)
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
+        handler.addFilter(ProjectFilter(name))
+        logging.getLogger().addHandler(handler)
+        analysis = ProjectAnalysis(
+            project_dir, name, pathlib.Path(log_file), handler, {SONAR_PROJECT_BASE_DIR: str(project_dir)}
+        )
+        started_at = time.monotonic()
+        token = _current_project.set(name)
+        try:
+            analysis.config = self.load_configuration(project_dir)
+        except Exception as e:
+            analysis.returncode = exceptions.log_error(e)
+        finally:
+            _current_project.reset(token)
+            analysis.duration_seconds = time.monotonic() - started_at
+        return analysis
+
+    def analyze(self, analysis: ProjectAnalysis, concurrent_runs: int) -> ProjectResult:
+        """Analyze a project, sharing the memory and CPUs of the machine with the other `concurrent_runs` engines."""
+        started_at = time.monotonic()
+        token = _current_project.set(analysis.name)
+        try:
+            received_signal = self.signal_forwarder.received_signal
+            if analysis.returncode is not None:
+                returncode = analysis.returncode
+            elif received_signal is not None:
+                logging.warning(f"The analysis of {analysis.name} was skipped: the batch analysis was cancelled")
+                returncode = 128 + received_signal
+            else:
+                logging.info(f"Starting the analysis of {analysis.project_dir}")
+                with configuration_snapshot.preserved(get_working_directory(analysis.config)):
+                    returncode = self.scanner.run(analysis.config, self.signal_forwarder, concurrent_runs)
+        except Exception as e:
+            returncode = exceptions.log_error(e)
+        finally:
+            _current_project.reset(token)
+            duration_seconds = analysis.duration_seconds + time.monotonic() - started_at
+            logging.getLogger().removeHandler(analysis.handler)
+            analysis.handler.close()
+        log_path = self.__store_log(analysis.log_file, get_working_directory(analysis.config) / PROJECT_LOG_FILENAME)
+        return ProjectResult(analysis.project_dir, returncode, duration_seconds, log_path)
+
+    def project_name(self, project_dir: pathlib.Path) -> str:
+        try:
+            return project_dir.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(project_dir)
+
+    def report(self, results: list[ProjectResult]) -> None:
+        lines = [
+            f"  {result.returncode:>4}  {result.duration_seconds:>8.1f} s  {self.project_name(result.project_dir)}"
+            + (f" ({result.log_path})" if result.log_path is not None else "")
+            for result in results
+        ]
+        logging.info("Batch analysis results (exit code, duration, project):\n" + "\n".join(lines))
+        failures = sum(1 for result in results if result.returncode != 0)
+        if failures > 0:
+            logging.error(f"The analysis of {failures} of {len(results)} projects failed")
+
+    def __store_log(self, log_file: pathlib.Path, target: pathlib.Path) -> Optional[pathlib.Path]:
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(log_file, target)
+        except OSError as e:
+            logging.warning(f"Failed to store the logs of the analysis in {target}, they are kept in {log_file}: {e}")
+            return log_file
+        return target
@@ -0,0 +1,106 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import math
+import os
+import pathlib
+from typing import Optional
+
+CGROUP_ROOT = pathlib.Path("/sys/fs/cgroup")
+PROC_SELF_CGROUP = pathlib.Path("/proc/self/cgroup")
+
+# cgroup v1 reports the absence of a memory limit as LONG_MAX rounded down to the page size
+UNLIMITED_MEMORY_THRESHOLD = 1 << 60
+
+
+def get_memory_limit() -> Optional[int]:
+    """Return the memory limit in bytes of the cgroup of the current process, or None if it is not limited."""
+    value = _read_cgroup_file("", "memory.max")
+    if value is None:
+        value = _read_cgroup_file("memory", "memory.limit_in_bytes")
+    if value is None or not value.isdigit():
+        return None
+    limit = int(value)
+    return limit if 0 < limit < UNLIMITED_MEMORY_THRESHOLD else None
+
+
+def get_cpu_limit() -> Optional[float]:
+    """Return the CPU quota of the cgroup of the current process as a number of CPUs, or None if it is not limited."""
+    value = _read_cgroup_file("", "cpu.max")
+    if value is not None:
+        parts = value.split()
+        quota, period = (parts[0], parts[1]) if len(parts) == 2 else ("max", "")
+    else:
+        quota = _read_cgroup_file("cpu", "cpu.cfs_quota_us") or "-1"
+        period = _read_cgroup_file("cpu", "cpu.cfs_period_us") or ""
+    if not quota.isdigit() or not period.isdigit() or int(period) == 0 or int(quota) == 0:
+        return None
+    return int(quota) / int(period)
+
+
+def get_available_cpus() -> int:
+    """
+    Return the number of CPUs the current process can actually use,
+    taking into account the host CPU count, the CPU affinity and the cgroup CPU quota.
+    """
+    cpus = os.cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        cpus = min(cpus, len(os.sched_getaffinity(0)))
+    cpu_limit = get_cpu_limit()
+    if cpu_limit is not None:
+        cpus = min(cpus, math.ceil(cpu_limit))
+    return max(cpus, 1)
+
+
+def _read_cgroup_file(controller: str, filename: str) -> Optional[str]:
+    """
+    Read a file of the cgroup of the current process for the given cgroup v1 controller,
+    or from the cgroup v2 unified hierarchy when the controller is empty.
+    """
+    controllers, cgroup_path = _get_cgroup(controller)
+    # cgroup v1 controllers mounted together, e.g. cpu and cpuacct, may only be reachable as "cpu,cpuacct"
+    mount_points = [CGROUP_ROOT / controller, CGROUP_ROOT / controllers] if controller else [CGROUP_ROOT]
+    candidates = []
+    for mount_point in dict.fromkeys(mount_points):
+        if cgroup_path is not None:
+            candidates.append(mount_point / cgroup_path.lstrip("/") / filename)
+        # Inside a container, the cgroup of the process is usually mounted as the root of the hierarchy
+        candidates.append(mount_point / filename)
+    for candidate in candidates:
+        try:
+            return candidate.read_text().strip()
+        except OSError:
+            continue
+    return None
+
+
+def _get_cgroup(controller: str) -> tuple[str, Optional[str]]:
+    """Return the controllers of the hierarchy holding the given controller and the cgroup path of the process in it."""
+    try:
+        lines = PROC_SELF_CGROUP.read_text().splitlines()
+    except OSError:
+        return controller, None
+    for line in lines:
+        parts = line.split(":", 2)
+        if len(parts) != 3:
+            continue
+        _, controllers, path = parts
+        if (not controller and controllers == "") or (controller and controller in controllers.split(",")):
+            return controllers, path
+    return controller, None
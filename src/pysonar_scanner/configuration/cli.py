@@ -18,7 +18,10 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
 import argparse
-from typing import Any
+import bisect
+import functools
+import sys
+from typing import Any, Optional
 
 from pysonar_scanner.configuration import properties
 from pysonar_scanner.exceptions import UnexpectedCliArgument
@@ -35,13 +38,11 @@ class PyScannerHelpFormatter(argparse.HelpFormatter):
 class CliConfigurationLoader:
 
     @classmethod
-    def load(cls) -> dict[str, Any]:
-        args, unknown_args = cls.__parse_cli_args()
+    def load(cls, argv: Optional[list[str]] = None) -> dict[str, Any]:
+        args, unknown_args = cls.__parse_cli_args(sys.argv[1:] if argv is None else argv)
         config = {}
-        for prop in properties.PROPERTIES:
-            if prop.cli_getter is not None:
-                value = prop.cli_getter(args)
-                config[prop.name] = value
+        for name, cli_getter in properties.get_property_index().cli_getters.items():
+            config[name] = cli_getter(args)
 
         # Handle unknown args starting with '-D'
         for arg in unknown_args:
@@ -58,9 +59,68 @@ class CliConfigurationLoader:
         return {k: v for k, v in config.items() if v is not None}
 
     @classmethod
-    def __parse_cli_args(cls) -> tuple[argparse.Namespace, list[str]]:
+    def __parse_cli_args(cls, argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+        parser, options, value_options = cls.__get_parser()
+        analysis_properties, other_args = cls.__split_analysis_properties(argv, options, value_options)
+        args, unknown_args = parser.parse_known_args(other_args)
+        return args, analysis_properties + unknown_args
+
+    @classmethod
+    def __split_analysis_properties(
+        cls, argv: list[str], options: list[str], value_options: frozenset[str]
+    ) -> tuple[list[str], list[str]]:
+        """
+        Set aside the -Dkey=value analysis properties that argparse would not recognize anyway,
+        so that argparse does not have to match them against every option.
+        The value of an option is never set aside, e.g. --sonar-scanner-java-opts "-Xmx1g -Dkey=value".
+        """
+        analysis_properties = []
+        other_args = []
+        index = 0
+        while index < len(argv):
+            arg = argv[index]
+            if arg == "--":
+                other_args.extend(argv[index:])
+                break
+            option = cls.__find_option(arg, options)
+            if option is None and arg.startswith("-D"):
+                analysis_properties.append(arg)
+            elif option in value_options and "=" not in arg and cls.__is_option_value(argv, index + 1):
+                other_args.extend(argv[index : index + 2])
+                index += 1
+            else:
+                other_args.append(arg)
+            index += 1
+        return analysis_properties, other_args
+
+    @staticmethod
+    def __is_option_value(argv: list[str], index: int) -> bool:
+        # argparse only takes an argument starting with "-" as the value of an option when it holds a space:
+        # any other one, such as -Dkey, is left out and argparse reports the missing value
+        return index < len(argv) and (not argv[index].startswith("-") or " " in argv[index])
+
+    @staticmethod
+    def __find_option(arg: str, options: list[str]) -> Optional[str]:
+        """Return the option of the parser that the argument stands for, if any."""
+        if not arg.startswith("-"):
+            return None
+        option = arg.split("=", 1)[0]
+        # argparse accepts abbreviations: the option may be the prefix of an option of the parser, e.g. -Dsonar.tok
+        position = bisect.bisect_left(options, option)
+        if position < len(options) and options[position].startswith(option):
+            return options[position]
+        return None
+
+    @classmethod
+    @functools.cache
+    def __get_parser(cls) -> tuple[argparse.ArgumentParser, list[str], frozenset[str]]:
+        """Build the parser once, along with its sorted options and the options that take a value."""
         parser = cls.__create_parser()
-        return parser.parse_known_args()
+        options = sorted(parser._option_string_actions)
+        value_options = frozenset(
+            option for option, action in parser._option_string_actions.items() if action.nargs is None
+        )
+        return parser, options, value_options
 
     @classmethod
     def __create_parser(cls):
@@ -246,6 +306,90 @@ class CliConfigurationLoader:
             default=None,
             help="Increase output verbosity",
         )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-async-logging",
+            "-Dsonar.scanner.asyncLogging",
+            action="store_true",
+            default=None,
+            help="If provided, logs are written to the console from a background thread so that a slow console does not slow down the analysis. DEBUG logs may be dropped when the console cannot keep up",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-engine-log-capture",
+            "-Dsonar.scanner.engineLogCapture",
+            type=str,
+            choices=["gzip", "lzma"],
+            help="If provided, all the logs of the scanner engine, including DEBUG logs, are written with their timestamp to a compressed JSON Lines file in the working directory, whatever the console verbosity",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-sensor-timings",
+            "-Dsonar.scanner.sensorTimings",
+            action="store_true",
+            default=None,
+            help="If provided, the durations of the sensors and of the analysis phases reported by the scanner engine are summarized at the end of the analysis and written to analysis-timings.json in the working directory",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-resource-sampling-interval",
+            "-Dsonar.scanner.resourceSamplingInterval",
+            type=float,
+            help="If provided, the memory, CPU, thread and I/O usage of the scanner engine is sampled every given number of seconds and summarized at the end of the analysis. Linux only",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-resource-sampling-time-series",
+            "-Dsonar.scanner.resourceSamplingTimeSeries",
+            action="store_true",
+            default=None,
+            help="If provided along with the resource sampling interval, the samples are written to engine-resource-usage.csv in the working directory",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-engine-timeout",
+            "-Dsonar.scanner.engineTimeout",
+            type=int,
+            help="Maximum duration of the analysis by the scanner engine (in seconds). When it is exceeded, a thread dump of the engine is logged, the engine is stopped and the scanner exits with code 124",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-engine-inactivity-timeout",
+            "-Dsonar.scanner.engineInactivityTimeout",
+            type=int,
+            help="Maximum time without any log from the scanner engine (in seconds). When it is exceeded, a thread dump of the engine is logged, the engine is stopped and the scanner exits with code 124",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-engine-niceness",
+            "-Dsonar.scanner.engineNiceness",
+            type=int,
+            help="Niceness of the scanner engine process, from -20 (highest priority) to 19 (lowest priority). Linux only",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-engine-io-priority-class",
+            "-Dsonar.scanner.engineIoPriorityClass",
+            type=str,
+            choices=["idle", "best-effort", "realtime"],
+            help="I/O scheduling class of the scanner engine process, as set by ionice. Linux only",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-engine-cpu-affinity",
+            "-Dsonar.scanner.engineCpuAffinity",
+            type=str,
+            help="CPUs the scanner engine process may run on, as a list such as 0-3,6. Linux only",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-configuration-snapshot",
+            "-Dsonar.scanner.configurationSnapshot",
+            action="store_true",
+            default=None,
+            help="If provided, the resolved configuration is stored in the working directory and reused as long as the configuration files of the project, the environment variables and the command line arguments do not change. Only taken into account on the command line or as an environment variable",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-batch-projects",
+            "-Dsonar.scanner.batchProjects",
+            type=str,
+            help="Comma-separated list of project directories, relative to the base directory, to analyze in a single run, or 'auto' to analyze every directory holding a pyproject.toml or a sonar-project.properties file. Each project is configured as if the scanner was run from its directory",
+        )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-batch-workers",
+            "-Dsonar.scanner.batchWorkers",
+            type=int,
+            help="Number of projects analyzed concurrently in batch mode, 1 by default. The heap and CPUs derived from the container limits are shared between the concurrent scanner engines",
+        )
         scanner_behavior_group.add_argument(
             "--sonar-user-home", "-Dsonar.userHome", type=str, help="Base sonar directory, ~/.sonar by default"
         )
@@ -380,6 +524,13 @@ class CliConfigurationLoader:
             default=None,
             help="Enable dry-run mode to validate configuration without connecting to SonarQube server or submitting analysis. See DRY_RUN_MODE.md for details",
         )
+        scanner_behavior_group.add_argument(
+            "--sonar-scanner-configuration-sources-report",
+            "-Dsonar.scanner.configurationSourcesReport",
+            action="store_true",
+            default=None,
+            help="If provided, dry-run mode also writes the source of each property and the duration of each configuration loader to configuration-sources.json in the working directory",
+        )
 
         jvm_group = parser.add_argument_group("JVM Settings")
         jvm_group.add_argument(
@@ -389,6 +540,13 @@ class CliConfigurationLoader:
             default=None,
             help="If provided, the provisioning of the JRE will be skipped",
         )
+        jvm_group.add_argument(
+            "--use-system-jre",
+            "-Dsonar.scanner.useSystemJre",
+            action="store_true",
+            default=None,
+            help="If provided, a Java 17+ runtime found in JAVA_HOME or on the PATH is used instead of provisioning a JRE",
+        )
         jvm_group.add_argument(
             "--sonar-scanner-java-exe-path",
             "-Dsonar.scanner.javaExePath",
@@ -406,7 +564,31 @@ class CliConfigurationLoader:
             "--java-heap-size",
             "-Dsonar.scanner.javaHeapSize",
             type=str,
-            help="Arguments specifies the heap size provided to the JVM when running the scanner",
+            help="Arguments specifies the heap size provided to the JVM when running the scanner, for example 2048m. "
+            "When not set, it is derived from the container memory limit, if any",
+        )
+        jvm_group.add_argument(
+            "--sonar-scanner-class-data-sharing",
+            "-Dsonar.scanner.classDataSharing",
+            action="store_true",
+            default=None,
+            help="Experimental: if provided, a class data sharing archive of the scanner engine is created in the cache and reused to speed up the JVM startup",
+        )
+        jvm_group.add_argument(
+            "--sonar-scanner-jvm-profile",
+            "-Dsonar.scanner.jvmProfile",
+            type=str,
+            choices=["fast-startup", "throughput", "auto"],
+            help="JVM tuning profile of the scanner engine: 'fast-startup' for small analyses, 'throughput' for large ones, or 'auto' to choose from the number of files to analyze. Options set in the Java options take precedence",
+        )
+        jvm_group.add_argument(
+            "--profile-jvm",
+            "-Dsonar.scanner.profileJvm",
+            type=str,
+            nargs="?",
+            const="default",
+            choices=["default", "profile"],
+            help="If provided, the scanner engine is run with Java Flight Recorder using the given settings, 'default' if omitted, and the recording is written to scanner-engine.jfr in the working directory",
         )
 
         truststore_group = parser.add_argument_group("Truststore arguments")
@@ -19,10 +19,28 @@
 #
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from pysonar_scanner.configuration.cli import CliConfigurationLoader
+from pysonar_scanner.configuration.configuration_snapshot import ConfigurationSnapshot
 from pysonar_scanner.configuration.coveragerc_loader import CoverageRCConfigurationLoader
+from pysonar_scanner.configuration.project_files import ProjectFiles
+from pysonar_scanner.configuration.provenance import (
+    COMMAND_LINE,
+    COVERAGERC,
+    DYNAMIC_DEFAULTS,
+    ENVIRONMENT,
+    INFERRED,
+    MODULES,
+    PYPROJECT_PROJECT,
+    PYPROJECT_SONAR,
+    PYPROJECT_TOML,
+    SNAPSHOT,
+    SONAR_PROJECT_PROPERTIES,
+    STATIC_DEFAULTS,
+    TEST_PATHS_DETECTION,
+    ConfigurationProvenance,
+)
 from pysonar_scanner.configuration.pyproject_toml import TomlConfigurationLoader
 from pysonar_scanner.configuration.properties import (
     SONAR_PROJECT_KEY,
@@ -36,6 +54,7 @@ from pysonar_scanner.configuration.properties import (
 )
 from pysonar_scanner.configuration.properties import PROPERTIES
 from pysonar_scanner.configuration import (
+    modules,
     sonar_project_properties,
     environment_variables,
     dynamic_defaults_loader,
@@ -51,30 +70,65 @@ def get_static_default_properties() -> dict[Key, Any]:
 
 class ConfigurationLoader:
     @staticmethod
-    def load() -> dict[Key, Any]:
+    def load(provenance: Optional[ConfigurationProvenance] = None, argv: Optional[list[str]] = None) -> dict[Key, Any]:
+        """
+        Resolve the configuration from all its sources, the command line being given by argv or read from sys.argv.
+
+        When a provenance is given, the source of each property and the duration of each loader are recorded in it.
+        """
         logging.debug("Loading configuration properties...")
+        provenance = provenance if provenance is not None else ConfigurationProvenance()
 
         # each property loader is required to return NO default values.
         # E.g. if no property has been set, an empty dict must be returned.
         # Default values should be set through the get_static_default_properties() method
-        cli_properties = CliConfigurationLoader.load()
+        with provenance.timed(COMMAND_LINE):
+            cli_properties = CliConfigurationLoader.load(argv)
         # CLI properties have a higher priority than properties file,
         # but we need to resolve them first to load the properties file
         base_dir = Path(cli_properties.get(SONAR_PROJECT_BASE_DIR, "."))
 
         toml_path_property = cli_properties.get("toml-path", ".")
         toml_path = Path(toml_path_property) if "toml-path" in cli_properties else base_dir
-        toml_properties = TomlConfigurationLoader.load(toml_path)
-        coverage_properties = CoverageRCConfigurationLoader.load_exclusion_properties(base_dir)
-
-        resolved_properties = get_static_default_properties()
-        resolved_properties.update(dynamic_defaults_loader.load())
-        resolved_properties.update(coverage_properties)
-        resolved_properties.update(toml_properties.project_properties)
-        resolved_properties.update(sonar_project_properties.load(base_dir))
-        resolved_properties.update(toml_properties.sonar_properties)
-        resolved_properties.update(environment_variables.load())
-        resolved_properties.update(cli_properties)
+        # Every project file is read and parsed at most once, whichever loaders need it
+        project_files = ProjectFiles(base_dir)
+        provenance.filesystem_counters = project_files.counters
+        with provenance.timed(ENVIRONMENT):
+            env_properties = environment_variables.load()
+        with provenance.timed(STATIC_DEFAULTS):
+            static_defaults = get_static_default_properties()
+        with provenance.timed(DYNAMIC_DEFAULTS):
+            dynamic_defaults = dynamic_defaults_loader.load()
+
+        with provenance.timed(SNAPSHOT):
+            snapshot = ConfigurationSnapshot.create(
+                {**env_properties, **cli_properties}, {**static_defaults, **dynamic_defaults}, toml_path, project_files
+            )
+            snapshot_properties = snapshot.read() if snapshot is not None else None
+        if snapshot_properties is not None:
+            provenance.record(SNAPSHOT, snapshot_properties)
+            return snapshot_properties
+
+        with provenance.timed(PYPROJECT_TOML):
+            toml_properties = TomlConfigurationLoader.load(toml_path, project_files)
+        with provenance.timed(COVERAGERC):
+            coverage_properties = CoverageRCConfigurationLoader.load_exclusion_properties(base_dir, project_files)
+        with provenance.timed(SONAR_PROJECT_PROPERTIES):
+            project_properties = sonar_project_properties.load(base_dir, project_files)
+
+        resolved_properties: dict[Key, Any] = {}
+        for source, properties in [
+            (STATIC_DEFAULTS, static_defaults),
+            (DYNAMIC_DEFAULTS, dynamic_defaults),
+            (COVERAGERC, coverage_properties),
+            (PYPROJECT_PROJECT, toml_properties.project_properties),
+            (SONAR_PROJECT_PROPERTIES, project_properties),
+            (PYPROJECT_SONAR, toml_properties.sonar_properties),
+            (ENVIRONMENT, env_properties),
+            (COMMAND_LINE, cli_properties),
+        ]:
+            resolved_properties.update(properties)
+            provenance.record(source, properties)
 
         # Auto-detect sonar.tests only when the user has not set it in any higher-priority source
         # and has not explicitly disabled the sonar-python test file heuristic. When the heuristic
@@ -84,11 +138,13 @@ class ConfigurationLoader:
         )
         tests_auto_detected = False
         if SONAR_TESTS not in resolved_properties and not heuristic_disabled:
-            inferred_props, disable_heuristic = test_paths_loader.load(base_dir)
+            with provenance.timed(TEST_PATHS_DETECTION):
+                inferred_props, disable_heuristic = test_paths_loader.load(base_dir, project_files)
+            if disable_heuristic and SONAR_PYTHON_TEST_FILE_HEURISTIC_DISABLED not in resolved_properties:
+                inferred_props[SONAR_PYTHON_TEST_FILE_HEURISTIC_DISABLED] = "true"
             resolved_properties.update(inferred_props)
+            provenance.record(TEST_PATHS_DETECTION, inferred_props)
             tests_auto_detected = SONAR_TESTS in resolved_properties
-            if disable_heuristic and SONAR_PYTHON_TEST_FILE_HEURISTIC_DISABLED not in resolved_properties:
-                resolved_properties[SONAR_PYTHON_TEST_FILE_HEURISTIC_DISABLED] = "true"
 
         sources_defaulted = SONAR_SOURCES not in resolved_properties
         if sources_defaulted:
@@ -97,6 +153,7 @@ class ConfigurationLoader:
                 "Set sonar.sources explicitly to override this behavior."
             )
             resolved_properties[SONAR_SOURCES] = "."
+            provenance.record(INFERRED, {SONAR_SOURCES: "."})
 
         if (sources_defaulted or tests_auto_detected) and SONAR_TESTS in resolved_properties:
             test_dirs = [d.strip() for d in resolved_properties[SONAR_TESTS].split(",") if d.strip()]
@@ -105,6 +162,7 @@ class ConfigurationLoader:
             resolved_properties[SONAR_EXCLUSIONS] = (
                 f"{existing},{test_exclusion_patterns}" if existing else test_exclusion_patterns
             )
+            provenance.record(INFERRED, {SONAR_EXCLUSIONS: resolved_properties[SONAR_EXCLUSIONS]})
             logging.info(
                 "Adding test directories to sonar.exclusions to avoid overlap with sonar.sources: '%s'. "
                 "To manage this manually, set sonar.sources to a path that does not include the test directories, "
@@ -112,6 +170,20 @@ class ConfigurationLoader:
                 test_exclusion_patterns,
             )
 
+        counters = project_files.counters
+        logging.debug(
+            f"Project files: {counters.directory_scans} directory scan, {counters.index_lookups} checks answered "
+            f"from it, {counters.stat_calls} stat calls"
+        )
+
+        # The configuration files of the modules are read here, once, rather than by the engine
+        with provenance.timed(MODULES):
+            expanded_modules = modules.expand(resolved_properties, base_dir)
+        resolved_properties.update(expanded_modules.properties)
+        provenance.record(MODULES, expanded_modules.properties)
+
+        if snapshot is not None:
+            snapshot.write(resolved_properties, expanded_modules.files, project_files.looked_up_paths)
         return resolved_properties
 
     @staticmethod
@@ -0,0 +1,208 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from pysonar_scanner import utils
+from pysonar_scanner.configuration.project_files import PYPROJECT_TOML, ProjectFiles
+from pysonar_scanner.configuration.properties import (
+    Key,
+    SONAR_PROJECT_BASE_DIR,
+    SONAR_SCANNER_CONFIGURATION_SNAPSHOT,
+    SONAR_WORKING_DIRECTORY,
+)
+
+SNAPSHOT_FILENAME = "pysonar-configuration.json"
+# Part of the fingerprint: snapshots written by another version of the format are never reused
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+class ConfigurationSnapshot:
+    """
+    Resolved configuration of a project, stored in its working directory so that the next runs with the same inputs
+    do not have to parse the configuration files of the project again.
+
+    The snapshot is keyed by a fingerprint of all the inputs of the resolution: the command line and environment
+    properties, the computed defaults, and the modification time and size of the project files and of the base
+    directory. Files read because of the resolved configuration itself, such as the configuration files of the modules,
+    are stored along with their modification time and size. Paths whose existence was checked, such as the nested test
+    directories declared in testpaths, are stored along with their type. The command line and environment properties are
+    not stored, so that secrets such as the token are never written to the working directory: they are put back when the
+    snapshot is read.
+    """
+
+    def __init__(self, path: pathlib.Path, fingerprint: str, input_properties: dict[Key, Any]):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.input_properties = input_properties
+
+    @staticmethod
+    def create(
+        input_properties: dict[Key, Any],
+        defaults: dict[Key, Any],
+        toml_path: pathlib.Path,
+        project_files: ProjectFiles,
+    ) -> Optional["ConfigurationSnapshot"]:
+        """
+        Return the snapshot of the configuration resolved from the given command line and environment properties,
+        or None if snapshots are not enabled by them.
+        """
+        if str(input_properties.get(SONAR_SCANNER_CONFIGURATION_SNAPSHOT, False)).lower() != "true":
+            return None
+        working_directory = utils.get_working_directory(
+            {
+                SONAR_PROJECT_BASE_DIR: str(project_files.base_dir),
+                SONAR_WORKING_DIRECTORY: input_properties.get(SONAR_WORKING_DIRECTORY),
+            }
+        )
+        # Creating the working directory modifies the base directory: it must exist before the base directory is stat-ed
+        try:
+            working_directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+        file_stats: dict[str, Any] = dict(project_files.stats())
+        toml_file = toml_path if toml_path.name == PYPROJECT_TOML else toml_path / PYPROJECT_TOML
+        if toml_file.parent != project_files.base_dir:
+            file_stats[str(toml_file)] = _stat(toml_file)
+        fingerprint_inputs = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "properties": input_properties,
+            "defaults": defaults,
+            "tomlPath": str(toml_path),
+            "files": file_stats,
+        }
+        fingerprint = hashlib.sha256(json.dumps(fingerprint_inputs, sort_keys=True, default=str).encode()).hexdigest()
+        return ConfigurationSnapshot(working_directory / SNAPSHOT_FILENAME, fingerprint, input_properties)
+
+    def read(self) -> Optional[dict[Key, Any]]:
+        """Return the stored configuration, or None if there is none or if it was resolved from other inputs."""
+        try:
+            content = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(content, dict)
+            or content.get("fingerprint") != self.fingerprint
+            or not self.__are_dependencies_unchanged(content.get("dependencies", {}))
+            or not self.__are_path_types_unchanged(content.get("pathTypes", {}))
+        ):
+            logging.debug(f"The configuration snapshot {self.path} is outdated")
+            return None
+        try:
+            configuration = content["configuration"]
+            configuration.update({key: self.input_properties[key] for key in content["inputKeys"]})
+        except (KeyError, TypeError, AttributeError):
+            return None
+        logging.info(f"Configuration loaded from the snapshot {self.path}")
+        return configuration
+
+    @staticmethod
+    def __are_dependencies_unchanged(dependencies: Any) -> bool:
+        try:
+            return all(
+                _stat(pathlib.Path(path)) == (tuple(stat) if stat is not None else None)
+                for path, stat in dependencies.items()
+            )
+        except (AttributeError, TypeError):
+            return False
+
+    @staticmethod
+    def __are_path_types_unchanged(path_types: Any) -> bool:
+        try:
+            return all(_path_type(pathlib.Path(path)) == path_type for path, path_type in path_types.items())
+        except (AttributeError, TypeError):
+            return False
+
+    def write(
+        self,
+        configuration: dict[Key, Any],
+        dependencies: Sequence[pathlib.Path] = (),
+        looked_up_paths: Iterable[pathlib.Path] = (),
+    ) -> None:
+        # Properties still holding their command line or environment value are restored from the inputs when read
+        input_keys = [
+            key
+            for key, value in configuration.items()
+            if key in self.input_properties and self.input_properties[key] == value
+        ]
+        content = {
+            "fingerprint": self.fingerprint,
+            "configuration": {key: value for key, value in configuration.items() if key not in input_keys},
+            "inputKeys": input_keys,
+            "dependencies": {str(path): _stat(path) for path in dependencies},
+            "pathTypes": {str(path): _path_type(path) for path in looked_up_paths},
+        }
+        try:
+            serialized = json.dumps(content, indent=2)
+        except (TypeError, ValueError) as e:
+            logging.debug(f"The configuration cannot be stored as a snapshot: {e}")
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Written to a temporary file first: concurrent runs must never read a partially written snapshot
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, prefix=f"{SNAPSHOT_FILENAME}.", delete=False
+            ) as f:
+                f.write(serialized)
+            os.replace(f.name, self.path)
+        except OSError as e:
+            logging.warning(f"Failed to store the configuration snapshot in {self.path}: {e}")
+            return
+        logging.debug(f"The configuration snapshot was written to {self.path}")
+
+
+def _stat(path: pathlib.Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _path_type(path: pathlib.Path) -> Optional[str]:
+    # Only the type matters: the modification time of a directory changes whenever a file is added to it
+    if os.path.isdir(path):
+        return "directory"
+    return "file" if os.path.exists(path) else None
+
+
+@contextlib.contextmanager
+def preserved(working_directory: pathlib.Path) -> Iterator[None]:
+    """Keep the configuration snapshot of a working directory when the scanner engine cleans it."""
+    path = working_directory / SNAPSHOT_FILENAME
+    try:
+        content: Optional[bytes] = path.read_bytes()
+    except OSError:
+        content = None
+    try:
+        yield
+    finally:
+        if content is not None and not path.exists():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(content)
+            except OSError as e:
+                logging.debug(f"Failed to restore the configuration snapshot {path}: {e}")
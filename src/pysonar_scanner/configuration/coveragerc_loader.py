@@ -17,18 +17,22 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
-import configparser
 import logging
 import pathlib
-from typing import Any
+from typing import Any, Optional
+
+from pysonar_scanner.configuration.project_files import COVERAGERC, ProjectFiles
 
 
 class CoverageRCConfigurationLoader:
 
     @staticmethod
-    def load_exclusion_properties(base_dir: pathlib.Path) -> dict[str, str]:
-        config_file_path = base_dir / ".coveragerc"
-        coverage_properties = CoverageRCConfigurationLoader.__read_config(config_file_path)
+    def load_exclusion_properties(
+        base_dir: pathlib.Path, project_files: Optional[ProjectFiles] = None
+    ) -> dict[str, str]:
+        project_files = project_files or ProjectFiles(base_dir)
+        config_file_path = project_files.path(COVERAGERC)
+        coverage_properties = CoverageRCConfigurationLoader.__read_config(project_files, config_file_path)
         if len(coverage_properties) == 0:
             return {}
         translated_exclusions = CoverageRCConfigurationLoader.__extract_coverage_exclusion_patterns(
@@ -40,15 +44,17 @@ class CoverageRCConfigurationLoader:
         return {"sonar.coverage.exclusions": ", ".join(translated_exclusions)}
 
     @staticmethod
-    def __read_config(config_file_path: pathlib.Path) -> dict[str, Any]:
+    def __read_config(project_files: ProjectFiles, config_file_path: pathlib.Path) -> dict[str, Any]:
         config_dict: dict[str, Any] = {}
-        if not config_file_path.exists():
+        if not project_files.is_file(config_file_path):
             logging.debug(f"Coverage file not found: {config_file_path}")
             return config_dict
 
         try:
-            config_parser = configparser.ConfigParser()
-            config_parser.read(config_file_path)
+            config_parser = project_files.ini(config_file_path)
+            if config_parser is None:
+                logging.debug(f"Coverage file not found: {config_file_path}")
+                return config_dict
             for section in config_parser.sections():
                 section_values = {}
                 for key, value in config_parser.items(section):
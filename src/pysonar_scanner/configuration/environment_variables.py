@@ -22,7 +22,7 @@ import os
 import json
 from typing import Dict
 
-from pysonar_scanner.configuration.properties import Key, PROPERTIES
+from pysonar_scanner.configuration.properties import Key, get_property_index
 
 
 def load() -> Dict[Key, str]:
@@ -59,8 +59,7 @@ def load_json_env_variables():
 
 def load_properties_env_variables():
     properties = {}
-    for prop in PROPERTIES:
-        env_var_name = prop.env_variable_name()
+    for env_var_name, prop in get_property_index().by_env_variable_name.items():
         if env_var_name in os.environ:
             properties[prop.name] = os.environ[env_var_name]
             if prop.deprecation_message:
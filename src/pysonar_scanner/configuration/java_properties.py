@@ -0,0 +1,102 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import pathlib
+import re
+from typing import Iterable, Iterator
+
+# Java properties files are read as ISO-8859-1, other characters being written as \uXXXX escapes
+ENCODING = "iso-8859-1"
+
+_WHITESPACE = " \t\f"
+# A key ends at the first unescaped separator or whitespace
+_KEY = re.compile(r"(?:[^\\=: \t\f]|\\.)*", re.DOTALL)
+# Whitespace around the key and the value, and at most one "=" or ":" separator
+_SEPARATOR = re.compile(r"[ \t\f]*[=:]?[ \t\f]*")
+_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|u|.)", re.DOTALL)
+_ESCAPED_CHARACTERS = {"t": "\t", "n": "\n", "r": "\r", "f": "\f"}
+_SURROGATE = re.compile("[\ud800-\udfff]")
+
+
+class PropertiesParseError(ValueError):
+    def __init__(self, message: str, line_number: int):
+        super().__init__(f"Line {line_number}: {message}")
+        self.line_number = line_number
+
+
+def load(path: pathlib.Path) -> dict[str, str]:
+    """Read a Java properties file; when a key is set several times, its last value is kept."""
+    with open(path, encoding=ENCODING) as f:
+        return dict(iter_properties(f))
+
+
+def iter_properties(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """
+    Parse the natural lines of a Java properties file, as java.util.Properties.load does, yielding each key and value
+    as soon as its logical line is complete. Lines must be split with universal newlines, as done when reading a
+    file in text mode.
+    """
+    logical_line: list[str] = []
+    in_logical_line = False
+    line_number = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n").lstrip(_WHITESPACE)
+        if not in_logical_line:
+            # Comments and blank lines are only recognized at the start of a logical line
+            if not line or line[0] in "#!":
+                continue
+            in_logical_line = True
+        # A line ending with an odd number of backslashes continues on the next line
+        if (len(line) - len(line.rstrip("\\"))) % 2 == 1:
+            logical_line.append(line[:-1])
+            continue
+        logical_line.append(line)
+        yield _parse_logical_line("".join(logical_line), line_number)
+        logical_line.clear()
+        in_logical_line = False
+    if in_logical_line:
+        yield _parse_logical_line("".join(logical_line), line_number)
+
+
+def _parse_logical_line(line: str, line_number: int) -> tuple[str, str]:
+    key_end = _KEY.match(line).end()  # type: ignore[union-attr]
+    value_start = _SEPARATOR.match(line, key_end).end()  # type: ignore[union-attr]
+    return _unescape(line[:key_end], line_number), _unescape(line[value_start:], line_number)
+
+
+def _unescape(text: str, line_number: int) -> str:
+    if "\\" not in text:
+        return text
+
+    def replace(escape: re.Match) -> str:
+        escaped = escape.group(1)
+        if escaped[0] == "u":
+            if len(escaped) != 5:
+                raise PropertiesParseError("malformed \\uXXXX escape", line_number)
+            return chr(int(escaped[1:], 16))
+        return _ESCAPED_CHARACTERS.get(escaped, escaped)
+
+    unescaped = _ESCAPE.sub(replace, text)
+    # Characters outside of the Basic Multilingual Plane are escaped as a pair of UTF-16 surrogates
+    if _SURROGATE.search(unescaped):
+        try:
+            unescaped = unescaped.encode("utf-16", "surrogatepass").decode("utf-16")
+        except UnicodeDecodeError:
+            raise PropertiesParseError("unpaired UTF-16 surrogate in a \\uXXXX escape", line_number) from None
+    return unescaped
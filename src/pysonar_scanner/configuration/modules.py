@@ -0,0 +1,118 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pysonar_scanner.configuration import sonar_project_properties
+from pysonar_scanner.configuration.project_files import PYPROJECT_TOML, SONAR_PROJECT_PROPERTIES, ProjectFiles
+from pysonar_scanner.configuration.properties import SONAR_MODULES, SONAR_PROJECT_BASE_DIR, Key
+from pysonar_scanner.configuration.pyproject_toml import TomlConfigurationLoader
+
+MODULE_FILE_NAMES = (PYPROJECT_TOML, SONAR_PROJECT_PROPERTIES)
+# The configuration files of the modules of a level of the module tree are read concurrently
+MODULE_LOADER_THREADS = 8
+
+
+@dataclass(frozen=True)
+class Module:
+    # Prefix of the fully qualified properties of the module, e.g. "parent.child."
+    prefix: str
+    base_dir: Path
+    # Properties set for the module by its parent, e.g. from "child.sonar.projectName", without the module id
+    given_properties: dict[Key, Any]
+
+
+@dataclass(frozen=True)
+class ExpandedModules:
+    # Fully qualified properties of the modules, e.g. "parent.child.sonar.sources", not already set by a parent
+    properties: dict[Key, Any]
+    # Configuration files looked up for the modules, whether they exist or not
+    files: list[Path]
+
+
+def expand(properties: dict[Key, Any], base_dir: Path) -> ExpandedModules:
+    """
+    Expand the modules listed by sonar.modules, recursively, reading the sonar-project.properties and pyproject.toml
+    files of each module. The properties set by a parent for a module have priority over the files of the module.
+    """
+    expanded: dict[Key, Any] = {}
+    files: list[Path] = []
+    visited_dirs = {base_dir.resolve()}
+    level = _get_child_modules("", properties, base_dir, visited_dirs)
+    if not level:
+        return ExpandedModules(expanded, files)
+    module_count = 0
+    with ThreadPoolExecutor(max_workers=MODULE_LOADER_THREADS, thread_name_prefix="pysonar-modules") as executor:
+        while level:
+            module_count += len(level)
+            next_level = []
+            for module, module_files in zip(level, executor.map(_load_module_files, level)):
+                files += [module.base_dir / filename for filename in MODULE_FILE_NAMES]
+                module_properties = {**module_files, **module.given_properties}
+                expanded[f"{module.prefix}{SONAR_PROJECT_BASE_DIR}"] = str(module.base_dir)
+                expanded.update(
+                    (f"{module.prefix}{key}", value)
+                    for key, value in module_files.items()
+                    if key not in module.given_properties
+                )
+                next_level += _get_child_modules(module.prefix, module_properties, module.base_dir, visited_dirs)
+            level = next_level
+    logging.debug(f"{module_count} modules expanded")
+    return ExpandedModules(expanded, files)
+
+
+def _get_child_modules(
+    prefix: str, properties: dict[Key, Any], base_dir: Path, visited_dirs: set[Path]
+) -> list[Module]:
+    modules = []
+    for module_id in (module_id.strip() for module_id in str(properties.get(SONAR_MODULES) or "").split(",")):
+        if not module_id:
+            continue
+        module_key_prefix = f"{module_id}."
+        given_properties = {
+            key[len(module_key_prefix) :]: value
+            for key, value in properties.items()
+            if key.startswith(module_key_prefix)
+        }
+        # The engine resolves relative module base directories against the base directory of their parent
+        module_base_dir = (base_dir / str(given_properties.get(SONAR_PROJECT_BASE_DIR, module_id))).absolute()
+        if not module_base_dir.is_dir():
+            logging.warning(f"The base directory {module_base_dir} of the module {prefix}{module_id} does not exist")
+            continue
+        real_base_dir = module_base_dir.resolve()
+        if real_base_dir in visited_dirs:
+            logging.warning(
+                f"The module {prefix}{module_id} is ignored: its base directory {module_base_dir} is already the base "
+                "directory of the project or of another module"
+            )
+            continue
+        visited_dirs.add(real_base_dir)
+        modules.append(Module(f"{prefix}{module_key_prefix}", module_base_dir, given_properties))
+    return modules
+
+
+def _load_module_files(module: Module) -> dict[Key, Any]:
+    project_files = ProjectFiles(module.base_dir)
+    toml_properties = TomlConfigurationLoader.load(module.base_dir, project_files)
+    project_properties = sonar_project_properties.load(module.base_dir, project_files)
+    return {**toml_properties.project_properties, **project_properties, **toml_properties.sonar_properties}
@@ -0,0 +1,195 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import configparser
+import os
+import pathlib
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+import tomli
+
+from pysonar_scanner.configuration import java_properties
+
+PYPROJECT_TOML = "pyproject.toml"
+SONAR_PROJECT_PROPERTIES = "sonar-project.properties"
+SETUP_CFG = "setup.cfg"
+TOX_INI = "tox.ini"
+PYTEST_INI = "pytest.ini"
+COVERAGERC = ".coveragerc"
+
+PROJECT_FILE_NAMES = frozenset({PYPROJECT_TOML, SONAR_PROJECT_PROPERTIES, SETUP_CFG, TOX_INI, PYTEST_INI, COVERAGERC})
+
+T = TypeVar("T")
+
+
+@dataclass
+class FilesystemCounters:
+    """Filesystem accesses of the configuration loaders, to measure the stat calls saved by the directory index."""
+
+    # Scans of the base directory, each one listing all its entries with a single os.scandir
+    directory_scans: int = 0
+    # Existence and type checks answered from the entries of the base directory, without any system call
+    index_lookups: int = 0
+    # Existence and type checks of paths outside of the base directory, each one costing a stat call
+    stat_calls: int = 0
+
+
+class ProjectFiles:
+    """
+    Registry of the configuration files of a project, shared by the configuration loaders during a run.
+
+    The entries of the base directory are listed with a single directory scan, which answers every existence and
+    type check of a file or directory directly under the base directory. Each file is parsed lazily, at most once:
+    later requests get the same parsed content, or the same parsing error, without reading it again.
+    Parsed contents are shared and must not be modified.
+    """
+
+    def __init__(self, base_dir: pathlib.Path):
+        self.base_dir = base_dir
+        self.counters = FilesystemCounters()
+        # Paths outside of the base directory whose existence or type was checked: the configuration depends on them
+        self.looked_up_paths: set[pathlib.Path] = set()
+        self.__base_dir_entries: Optional[dict[str, os.DirEntry]] = None
+        self.__parsed: dict[pathlib.Path, Any] = {}
+
+    def path(self, filename: str) -> pathlib.Path:
+        return self.base_dir / filename
+
+    def is_file(self, path: pathlib.Path) -> bool:
+        if self.__is_indexed(path):
+            entry = self.__scan_base_dir().get(path.name)
+            return entry is not None and _is_file(entry)
+        self.__look_up(path)
+        return os.path.isfile(path)
+
+    def is_dir(self, path: pathlib.Path) -> bool:
+        if self.__is_indexed(path):
+            entry = self.__scan_base_dir().get(path.name)
+            return entry is not None and _is_dir(entry)
+        self.__look_up(path)
+        return os.path.isdir(path)
+
+    def exists(self, path: pathlib.Path) -> bool:
+        if self.__is_indexed(path):
+            return path.name in self.__scan_base_dir()
+        self.__look_up(path)
+        return os.path.exists(path)
+
+    def stats(self) -> dict[str, tuple[int, int]]:
+        """
+        Return the modification time in nanoseconds and the size of the base directory, under ".", and of each of
+        its project files. The modification time of the base directory changes when files are added or removed.
+        """
+        stats = {}
+        entries: list[tuple[str, os.DirEntry | pathlib.Path]] = [(".", self.base_dir)]
+        entries += [
+            (name, entry)
+            for name, entry in self.__scan_base_dir().items()
+            if name in PROJECT_FILE_NAMES and _is_file(entry)
+        ]
+        for name, entry in entries:
+            try:
+                stat = entry.stat() if isinstance(entry, os.DirEntry) else os.stat(entry)
+            except OSError:
+                continue
+            stats[name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def toml(self, path: pathlib.Path) -> Optional[dict[str, Any]]:
+        """Return the content of a TOML file, None if it does not exist; raise the parsing error if it is invalid."""
+        return self.__parse(path, _parse_toml)
+
+    def ini(self, path: pathlib.Path) -> Optional[configparser.ConfigParser]:
+        """Return the content of an INI file, None if it does not exist; raise the parsing error if it is invalid."""
+        return self.__parse(path, _parse_ini)
+
+    def properties(self, path: pathlib.Path) -> Optional[dict[str, str]]:
+        """Return the content of a Java properties file, None if it does not exist."""
+        return self.__parse(path, java_properties.load)
+
+    def __parse(self, path: pathlib.Path, parser: Callable[[pathlib.Path], T]) -> Optional[T]:
+        if path not in self.__parsed:
+            if not self.is_file(path):
+                self.__parsed[path] = None
+            else:
+                try:
+                    self.__parsed[path] = parser(path)
+                except FileNotFoundError:
+                    # Removed since the base directory was scanned
+                    self.__parsed[path] = None
+                except Exception as e:
+                    self.__parsed[path] = _ParsingError(e)
+        parsed = self.__parsed[path]
+        if isinstance(parsed, _ParsingError):
+            raise parsed.error
+        return parsed
+
+    def __is_indexed(self, path: pathlib.Path) -> bool:
+        indexed = path.parent == self.base_dir and path.name not in ("", ".", "..")
+        if indexed:
+            self.counters.index_lookups += 1
+        return indexed
+
+    def __look_up(self, path: pathlib.Path) -> None:
+        self.counters.stat_calls += 1
+        self.looked_up_paths.add(path)
+
+    def __scan_base_dir(self) -> dict[str, os.DirEntry]:
+        if self.__base_dir_entries is None:
+            self.counters.directory_scans += 1
+            try:
+                with os.scandir(self.base_dir) as entries:
+                    self.__base_dir_entries = {entry.name: entry for entry in entries}
+            except OSError:
+                self.__base_dir_entries = {}
+        return self.__base_dir_entries
+
+
+def _is_file(entry: os.DirEntry) -> bool:
+    # The type of an entry comes with the directory listing; only symbolic links need a stat call to be resolved
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+class _ParsingError:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _parse_toml(path: pathlib.Path) -> dict[str, Any]:
+    with open(path, "rb") as f:
+        return tomli.load(f)
+
+
+def _parse_ini(path: pathlib.Path) -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    # read skips the files it cannot open, such as a file removed since the base directory was scanned
+    if not config.read(path):
+        raise FileNotFoundError(f"Cannot read {path}")
+    return config
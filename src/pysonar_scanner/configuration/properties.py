@@ -18,8 +18,11 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
 import argparse
+import functools
 import time
+from collections.abc import Mapping
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Callable, Optional
 
 Key = str
@@ -35,10 +38,24 @@ SONAR_SCANNER_BOOTSTRAP_START_TIME: Key = "sonar.scanner.bootstrapStartTime"
 SONAR_SCANNER_WAS_JRE_CACHE_HIT: Key = "sonar.scanner.wasJreCacheHit"
 SONAR_SCANNER_WAS_ENGINE_CACHE_HIT: Key = "sonar.scanner.wasEngineCacheHit"
 SONAR_VERBOSE: Key = "sonar.verbose"
+SONAR_SCANNER_ASYNC_LOGGING: Key = "sonar.scanner.asyncLogging"
+SONAR_SCANNER_ENGINE_LOG_CAPTURE: Key = "sonar.scanner.engineLogCapture"
+SONAR_SCANNER_SENSOR_TIMINGS: Key = "sonar.scanner.sensorTimings"
+SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL: Key = "sonar.scanner.resourceSamplingInterval"
+SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES: Key = "sonar.scanner.resourceSamplingTimeSeries"
+SONAR_SCANNER_ENGINE_TIMEOUT: Key = "sonar.scanner.engineTimeout"
+SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT: Key = "sonar.scanner.engineInactivityTimeout"
+SONAR_SCANNER_ENGINE_NICENESS: Key = "sonar.scanner.engineNiceness"
+SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS: Key = "sonar.scanner.engineIoPriorityClass"
+SONAR_SCANNER_ENGINE_CPU_AFFINITY: Key = "sonar.scanner.engineCpuAffinity"
+SONAR_SCANNER_CONFIGURATION_SNAPSHOT: Key = "sonar.scanner.configurationSnapshot"
+SONAR_SCANNER_BATCH_PROJECTS: Key = "sonar.scanner.batchProjects"
+SONAR_SCANNER_BATCH_WORKERS: Key = "sonar.scanner.batchWorkers"
 SONAR_TOKEN: Key = "sonar.token"
 SONAR_SCANNER_OS: Key = "sonar.scanner.os"
 SONAR_SCANNER_ARCH: Key = "sonar.scanner.arch"
 SONAR_SCANNER_SKIP_JRE_PROVISIONING: Key = "sonar.scanner.skipJreProvisioning"
+SONAR_SCANNER_USE_SYSTEM_JRE: Key = "sonar.scanner.useSystemJre"
 SONAR_USER_HOME: Key = "sonar.userHome"
 SONAR_SCANNER_JAVA_EXE_PATH: Key = "sonar.scanner.javaExePath"
 SONAR_SCANNER_INTERNAL_DUMP_TO_FILE: Key = "sonar.scanner.internal.dumpToFile"
@@ -57,6 +74,9 @@ SONAR_SCANNER_PROXY_PASSWORD: Key = "sonar.scanner.proxyPassword"
 SONAR_SCANNER_METADATA_FILEPATH: Key = "sonar.scanner.metadataFilePath"
 SONAR_SCANNER_JAVA_OPTS: Key = "sonar.scanner.javaOpts"
 SONAR_SCANNER_JAVA_HEAP_SIZE: Key = "sonar.scanner.javaHeapSize"
+SONAR_SCANNER_CLASS_DATA_SHARING: Key = "sonar.scanner.classDataSharing"
+SONAR_SCANNER_PROFILE_JVM: Key = "sonar.scanner.profileJvm"
+SONAR_SCANNER_JVM_PROFILE: Key = "sonar.scanner.jvmProfile"
 SONAR_PROJECT_BASE_DIR: Key = "sonar.projectBaseDir"
 SONAR_PROJECT_KEY: Key = "sonar.projectKey"
 SONAR_PROJECT_NAME: Key = "sonar.projectName"
@@ -104,6 +124,7 @@ SONAR_PYTHON_BANDIT_REPORT_PATHS: Key = "sonar.python.bandit.reportPaths"
 SONAR_PYTHON_FLAKE8_REPORT_PATHS: Key = "sonar.python.flake8.reportPaths"
 SONAR_PYTHON_RUFF_REPORT_PATHS: Key = "sonar.python.ruff.reportPaths"
 SONAR_SCANNER_DRY_RUN: Key = "sonar.scanner.dryRun"
+SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT: Key = "sonar.scanner.configurationSourcesReport"
 TOML_PATH: Key = "toml-path"
 
 # ============ DEPRECATED ==============
@@ -180,6 +201,71 @@ PROPERTIES: list[Property] = [
         default_value=False, 
         cli_getter=lambda args: args.verbose
     ),
+    Property(
+        name=SONAR_SCANNER_ASYNC_LOGGING,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_async_logging
+    ),
+    Property(
+        name=SONAR_SCANNER_ENGINE_LOG_CAPTURE,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_engine_log_capture
+    ),
+    Property(
+        name=SONAR_SCANNER_SENSOR_TIMINGS,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_sensor_timings
+    ),
+    Property(
+        name=SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_resource_sampling_interval
+    ),
+    Property(
+        name=SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_resource_sampling_time_series
+    ),
+    Property(
+        name=SONAR_SCANNER_ENGINE_TIMEOUT,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_engine_timeout
+    ),
+    Property(
+        name=SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_engine_inactivity_timeout
+    ),
+    Property(
+        name=SONAR_SCANNER_ENGINE_NICENESS,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_engine_niceness
+    ),
+    Property(
+        name=SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_engine_io_priority_class
+    ),
+    Property(
+        name=SONAR_SCANNER_ENGINE_CPU_AFFINITY,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_engine_cpu_affinity
+    ),
+    Property(
+        name=SONAR_SCANNER_CONFIGURATION_SNAPSHOT,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_configuration_snapshot
+    ),
+    Property(
+        name=SONAR_SCANNER_BATCH_PROJECTS,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_batch_projects
+    ),
+    Property(
+        name=SONAR_SCANNER_BATCH_WORKERS,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_batch_workers
+    ),
     Property(
         name=SONAR_HOST_URL, 
         default_value=None, 
@@ -225,6 +311,11 @@ PROPERTIES: list[Property] = [
         default_value=False,
         cli_getter=lambda args: args.skip_jre_provisioning
     ),
+    Property(
+        name=SONAR_SCANNER_USE_SYSTEM_JRE,
+        default_value=None,
+        cli_getter=lambda args: args.use_system_jre
+    ),
     Property(
         name=SONAR_USER_HOME, 
         default_value=None,
@@ -315,6 +406,21 @@ PROPERTIES: list[Property] = [
         default_value=None,
         cli_getter=lambda args: args.sonar_scanner_java_heap_size
     ),
+    Property(
+        name=SONAR_SCANNER_CLASS_DATA_SHARING,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_class_data_sharing
+    ),
+    Property(
+        name=SONAR_SCANNER_PROFILE_JVM,
+        default_value=None,
+        cli_getter=lambda args: args.profile_jvm
+    ),
+    Property(
+        name=SONAR_SCANNER_JVM_PROFILE,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_jvm_profile
+    ),
     Property(
         name=SONAR_SCANNER_METADATA_FILEPATH,
         default_value=None,
@@ -567,5 +673,32 @@ PROPERTIES: list[Property] = [
         default_value=False,
         cli_getter=lambda args: args.dry_run
     ),
+    Property(
+        name=SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT,
+        default_value=None,
+        cli_getter=lambda args: args.sonar_scanner_configuration_sources_report
+    ),
 ]
 # fmt: on
+
+
+@dataclass(frozen=True)
+class PropertyIndex:
+    """Lookup tables over PROPERTIES, computed once and shared by all configuration loaders."""
+
+    by_name: Mapping[Key, Property]
+    by_python_name: Mapping[str, Property]
+    by_env_variable_name: Mapping[str, Property]
+    cli_getters: Mapping[Key, Callable[[argparse.Namespace], Any]]
+
+
+@functools.cache
+def get_property_index() -> PropertyIndex:
+    return PropertyIndex(
+        by_name=MappingProxyType({prop.name: prop for prop in PROPERTIES}),
+        by_python_name=MappingProxyType({prop.python_name(): prop for prop in PROPERTIES}),
+        by_env_variable_name=MappingProxyType({prop.env_variable_name(): prop for prop in PROPERTIES}),
+        cli_getters=MappingProxyType(
+            {prop.name: prop.cli_getter for prop in PROPERTIES if prop.cli_getter is not None}
+        ),
+    )
@@ -0,0 +1,92 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import contextlib
+import time
+from typing import Any, Iterator, Optional
+
+from pysonar_scanner.configuration.project_files import FilesystemCounters
+from pysonar_scanner.configuration.properties import Key
+
+# Loaders whose duration is measured, besides the sources below
+PYPROJECT_TOML = "pyproject.toml"
+# Sources of the configuration, from the lowest to the highest priority
+STATIC_DEFAULTS = "static defaults"
+DYNAMIC_DEFAULTS = "dynamic defaults"
+COVERAGERC = ".coveragerc"
+PYPROJECT_PROJECT = "pyproject.toml [project]"
+SONAR_PROJECT_PROPERTIES = "sonar-project.properties"
+PYPROJECT_SONAR = "pyproject.toml [tool.sonar]"
+ENVIRONMENT = "environment variables"
+COMMAND_LINE = "command line"
+TEST_PATHS_DETECTION = "test paths detection"
+INFERRED = "inferred"
+MODULES = "module configuration files"
+SNAPSHOT = "configuration snapshot"
+
+
+class ConfigurationProvenance:
+    """
+    Record of where each configuration property comes from and of how long each configuration loader took.
+
+    Besides the source of the final value of each property, the sources whose value was overridden by a source
+    of higher priority are kept, to spot accidental overrides.
+    """
+
+    def __init__(self):
+        self.sources: dict[Key, str] = {}
+        self.overridden_sources: dict[Key, list[str]] = {}
+        self.durations_ms: dict[str, float] = {}
+        self.filesystem_counters: Optional[FilesystemCounters] = None
+
+    @contextlib.contextmanager
+    def timed(self, loader: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            self.durations_ms[loader] = self.durations_ms.get(loader, 0.0) + elapsed_ms
+
+    def record(self, source: str, properties: dict[Key, Any]) -> None:
+        """Record that the given properties were set by the source, overriding the ones set by previous sources."""
+        for key in properties:
+            previous_source = self.sources.get(key)
+            if previous_source is not None and previous_source != source:
+                self.overridden_sources.setdefault(key, []).append(previous_source)
+            self.sources[key] = source
+
+    def total_duration_ms(self) -> float:
+        return sum(self.durations_ms.values())
+
+    def to_json(self) -> dict[str, Any]:
+        content: dict[str, Any] = {
+            "loaders": [{"name": name, "durationMs": round(ms, 3)} for name, ms in self.durations_ms.items()],
+            "properties": {
+                key: {"source": source, "overriddenSources": self.overridden_sources.get(key, [])}
+                for key, source in sorted(self.sources.items())
+            },
+        }
+        if self.filesystem_counters is not None:
+            content["filesystem"] = {
+                "directoryScans": self.filesystem_counters.directory_scans,
+                "indexLookups": self.filesystem_counters.index_lookups,
+                "statCalls": self.filesystem_counters.stat_calls,
+            }
+        return content
@@ -19,11 +19,10 @@
 #
 import logging
 from pathlib import Path
-from typing import Any, Dict
-import os
-import tomli
+from typing import Any, Dict, Optional
 
 from pysonar_scanner.configuration import properties
+from pysonar_scanner.configuration.project_files import PYPROJECT_TOML, ProjectFiles
 
 
 class TomlProperties:
@@ -37,18 +36,21 @@ class TomlProperties:
 
 class TomlConfigurationLoader:
     @staticmethod
-    def load(toml_path: Path) -> TomlProperties:
-        if toml_path.name == "pyproject.toml":
+    def load(toml_path: Path, project_files: Optional[ProjectFiles] = None) -> TomlProperties:
+        if toml_path.name == PYPROJECT_TOML:
             filepath = toml_path
         else:
-            filepath = toml_path / "pyproject.toml"
-        if not os.path.isfile(filepath):
+            filepath = toml_path / PYPROJECT_TOML
+        project_files = project_files or ProjectFiles(filepath.parent)
+        if not project_files.is_file(filepath):
             logging.debug(f"No pyproject.toml at {filepath}")
             return TomlProperties({}, {})
         logging.debug(f"pyproject.toml loaded from {filepath}")
         try:
-            with open(filepath, "rb") as f:
-                toml_dict = tomli.load(f)
+            toml_dict = project_files.toml(filepath)
+            if toml_dict is None:
+                logging.debug(f"No pyproject.toml at {filepath}")
+                return TomlProperties({}, {})
             # Look for configuration in the tool.sonar section
             sonar_properties = TomlConfigurationLoader.__read_sonar_properties(toml_dict)
             # Look for general project configuration
@@ -64,10 +66,14 @@ class TomlConfigurationLoader:
     def __read_sonar_properties(toml_dict) -> Dict[str, str]:
         if "tool" in toml_dict and "sonar" in toml_dict["tool"]:
             sonar_config = toml_dict["tool"]["sonar"]
-            python_to_java_names = {prop.python_name(): prop.name for prop in properties.PROPERTIES}
+            properties_by_python_name = properties.get_property_index().by_python_name
             flattened_sonar_config = TomlConfigurationLoader.__flatten_config_dict(sonar_config, prefix="sonar.")
             return {
-                python_to_java_names.get(key, TomlConfigurationLoader.__kebab_to_camel_case(key)): value
+                (
+                    properties_by_python_name[key].name
+                    if key in properties_by_python_name
+                    else TomlConfigurationLoader.__kebab_to_camel_case(key)
+                ): value
                 for key, value in flattened_sonar_config.items()
             }
         return {}
@@ -19,20 +19,18 @@
 #
 import logging
 from pathlib import Path
-from typing import Dict
-import os
-from jproperties import Properties
+from typing import Dict, Optional
 
+from pysonar_scanner.configuration.project_files import SONAR_PROJECT_PROPERTIES, ProjectFiles
 
-def load(base_dir: Path) -> Dict[str, str]:
-    filepath = base_dir / "sonar-project.properties"
-    if not os.path.isfile(filepath):
+
+def load(base_dir: Path, project_files: Optional[ProjectFiles] = None) -> Dict[str, str]:
+    project_files = project_files or ProjectFiles(base_dir)
+    filepath = project_files.path(SONAR_PROJECT_PROPERTIES)
+    if not project_files.is_file(filepath):
         logging.debug(f"no sonar-project.properties file found at {filepath}")
         return {}
 
     logging.debug(f"sonar-project.properties loaded from {filepath}")
-    props = Properties()
-    with open(filepath, "rb") as f:
-        props.load(f)
-
-    return {key: value.data for key, value in props.items() if value.data is not None}
+    # Parsed contents are shared between the loaders: the caller gets its own copy
+    return dict(project_files.properties(filepath) or {})
@@ -24,13 +24,20 @@ from typing import Optional
 
 import tomli
 
+from pysonar_scanner.configuration.project_files import (
+    PYPROJECT_TOML,
+    PYTEST_INI,
+    SETUP_CFG,
+    TOX_INI,
+    ProjectFiles,
+)
 from pysonar_scanner.configuration.properties import SONAR_TESTS
 
 _CONVENTIONAL_TEST_DIRS = ["tests", "test", "testing"]
 _SETUP_CFG_PYTEST_SECTION = "tool:pytest"
 
 
-def load(base_dir: pathlib.Path) -> tuple[dict[str, str], bool]:
+def load(base_dir: pathlib.Path, project_files: Optional[ProjectFiles] = None) -> tuple[dict[str, str], bool]:
     """Infer sonar.tests from Python tooling configuration and filesystem conventions.
 
     Returns (properties, disable_heuristic) where:
@@ -38,8 +45,9 @@ def load(base_dir: pathlib.Path) -> tuple[dict[str, str], bool]:
     - disable_heuristic is True when a config file declared testpaths but all paths were
       invalid — the user expressed intent, so the sonar-python heuristic should not fire
     """
+    project_files = project_files or ProjectFiles(base_dir)
     for loader in [_load_from_pyproject_toml, _load_from_pytest_ini, _load_from_tox_ini, _load_from_setup_cfg]:
-        result = loader(base_dir)
+        result = loader(project_files)
         if result is None:
             continue  # file absent, no testpaths key, or empty testpaths (no restriction) — try next
         if result:
@@ -47,19 +55,20 @@ def load(base_dir: pathlib.Path) -> tuple[dict[str, str], bool]:
         return {}, True  # declared but all paths invalid: user expressed intent, disable heuristic
 
     # No config file gave a non-empty testpaths declaration; fall back to filesystem conventions.
-    filesystem_result = _load_from_filesystem(base_dir)
+    filesystem_result = _load_from_filesystem(project_files)
     if filesystem_result:
         return {SONAR_TESTS: filesystem_result}, False
     return {}, False
 
 
-def _existing_paths(base_dir: pathlib.Path, paths: list[str]) -> list[str]:
+def _existing_paths(project_files: ProjectFiles, paths: list[str]) -> list[str]:
     """Filter a list of candidate paths to those that exist as directories under base_dir.
 
     Absolute paths are relativised against the project root. If an absolute path falls
     outside the project root it is skipped with a warning. Relative paths that resolve
     to a file (not a directory) are skipped with a debug message.
     """
+    base_dir = project_files.base_dir
     abs_base = base_dir.resolve()
     result = []
     for p in paths:
@@ -79,25 +88,26 @@ def _existing_paths(base_dir: pathlib.Path, paths: list[str]) -> list[str]:
                 )
                 continue
         resolved = base_dir / p
-        if resolved.is_dir():
+        if project_files.is_dir(resolved):
             result.append(p)
-        elif resolved.exists():
+        elif project_files.exists(resolved):
             logging.debug(
                 f"Ignoring '{p}' in testpaths — it is a file, not a directory; sonar.tests uses directory roots"
             )
     return result
 
 
-def _load_from_pyproject_toml(base_dir: pathlib.Path) -> Optional[str]:
-    pyproject_path = base_dir / "pyproject.toml"
-    if not pyproject_path.is_file():
+def _load_from_pyproject_toml(project_files: ProjectFiles) -> Optional[str]:
+    pyproject_path = project_files.path(PYPROJECT_TOML)
+    if not project_files.is_file(pyproject_path):
         return None
     try:
-        with open(pyproject_path, "rb") as f:
-            toml_dict = tomli.load(f)
+        toml_dict = project_files.toml(pyproject_path)
     except tomli.TOMLDecodeError as e:
         logging.debug(f"Error reading pyproject.toml for pytest testpaths: {e}")
         return None
+    if toml_dict is None:
+        return None
     ini_options = toml_dict.get("tool", {}).get("pytest", {}).get("ini_options", {})
     if "testpaths" not in ini_options:
         return None
@@ -111,7 +121,7 @@ def _load_from_pyproject_toml(base_dir: pathlib.Path) -> Optional[str]:
     raw = [str(p) for p in (testpaths if isinstance(testpaths, list) else testpaths.split()) if str(p).strip()]
     if not raw:
         return None  # testpaths = [] means "no path restriction" — same as key absent, continue chain
-    paths = _existing_paths(base_dir, raw)
+    paths = _existing_paths(project_files, raw)
     if paths:
         result = ",".join(paths)
         logging.debug(f"Detected test paths from pyproject.toml [tool.pytest.ini_options]: {result}")
@@ -123,22 +133,21 @@ def _load_from_pyproject_toml(base_dir: pathlib.Path) -> Optional[str]:
     return ""  # declared but all paths invalid: stop the chain
 
 
-def _load_from_ini_file(base_dir: pathlib.Path, filename: str, section: str) -> Optional[str]:
-    config_path = base_dir / filename
-    if not config_path.is_file():
+def _load_from_ini_file(project_files: ProjectFiles, filename: str, section: str) -> Optional[str]:
+    config_path = project_files.path(filename)
+    if not project_files.is_file(config_path):
         return None
     try:
-        config = configparser.ConfigParser()
-        config.read(config_path)
+        config = project_files.ini(config_path)
     except configparser.Error as e:
         logging.debug(f"Error reading {filename} for pytest testpaths: {e}")
         return None
-    if section not in config or "testpaths" not in config[section]:
+    if config is None or section not in config or "testpaths" not in config[section]:
         return None
     raw = [p for p in config[section]["testpaths"].split() if p]
     if not raw:
         return None  # empty testpaths means "no path restriction" — same as key absent, continue chain
-    paths = _existing_paths(base_dir, raw)
+    paths = _existing_paths(project_files, raw)
     if paths:
         result = ",".join(paths)
         logging.debug(f"Detected test paths from {filename} [{section}]: {result}")
@@ -150,20 +159,20 @@ def _load_from_ini_file(base_dir: pathlib.Path, filename: str, section: str) ->
     return ""
 
 
-def _load_from_pytest_ini(base_dir: pathlib.Path) -> Optional[str]:
-    return _load_from_ini_file(base_dir, "pytest.ini", "pytest")
+def _load_from_pytest_ini(project_files: ProjectFiles) -> Optional[str]:
+    return _load_from_ini_file(project_files, PYTEST_INI, "pytest")
 
 
-def _load_from_tox_ini(base_dir: pathlib.Path) -> Optional[str]:
-    return _load_from_ini_file(base_dir, "tox.ini", "pytest")
+def _load_from_tox_ini(project_files: ProjectFiles) -> Optional[str]:
+    return _load_from_ini_file(project_files, TOX_INI, "pytest")
 
 
-def _load_from_setup_cfg(base_dir: pathlib.Path) -> Optional[str]:
-    return _load_from_ini_file(base_dir, "setup.cfg", _SETUP_CFG_PYTEST_SECTION)
+def _load_from_setup_cfg(project_files: ProjectFiles) -> Optional[str]:
+    return _load_from_ini_file(project_files, SETUP_CFG, _SETUP_CFG_PYTEST_SECTION)
 
 
-def _load_from_filesystem(base_dir: pathlib.Path) -> Optional[str]:
-    found = [d for d in _CONVENTIONAL_TEST_DIRS if (base_dir / d).is_dir()]
+def _load_from_filesystem(project_files: ProjectFiles) -> Optional[str]:
+    found = [d for d in _CONVENTIONAL_TEST_DIRS if project_files.is_dir(project_files.path(d))]
     if found:
         result = ",".join(found)
         logging.debug(f"Detected test paths from filesystem conventions: {result}")
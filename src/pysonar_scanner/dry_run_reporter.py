@@ -18,6 +18,7 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
 
+import json
 import logging
 import re
 import xml.etree.ElementTree as ET
@@ -33,6 +34,7 @@ from pysonar_scanner.configuration.properties import (
     SONAR_PROJECT_NAME,
     SONAR_HOST_URL,
 )
+from pysonar_scanner.configuration.provenance import DYNAMIC_DEFAULTS, STATIC_DEFAULTS, ConfigurationProvenance
 
 
 class DryRunReporter:
@@ -73,6 +75,46 @@ class DryRunReporter:
             },
         )
 
+    @staticmethod
+    def report_provenance(provenance: ConfigurationProvenance, json_path: Optional[Path] = None) -> None:
+        """Log the duration of each configuration loader and the source of each property that is not a default."""
+        logging.info("=" * 80)
+        logging.info("DRY RUN MODE - Configuration Sources")
+        logging.info("=" * 80)
+
+        logging.info(f"\nLoaders ({provenance.total_duration_ms():.1f} ms):")
+        for loader, duration_ms in provenance.durations_ms.items():
+            logging.info(f"  {loader}: {duration_ms:.1f} ms")
+        counters = provenance.filesystem_counters
+        if counters is not None:
+            logging.info(
+                f"  project files: {counters.directory_scans} directory scan, "
+                f"{counters.index_lookups} checks answered from it, {counters.stat_calls} stat calls"
+            )
+
+        logging.info("\nProperties:")
+        for key, source in sorted(provenance.sources.items()):
+            if source in (STATIC_DEFAULTS, DYNAMIC_DEFAULTS):
+                continue
+            # Overriding a default is the point of setting a property: only overridden user settings are shown
+            overridden = [
+                overridden_source
+                for overridden_source in provenance.overridden_sources.get(key, [])
+                if overridden_source not in (STATIC_DEFAULTS, DYNAMIC_DEFAULTS)
+            ]
+            suffix = f" (overrides {', '.join(overridden)})" if overridden else ""
+            logging.info(f"  {key}: {source}{suffix}")
+
+        if json_path is None:
+            return
+        try:
+            json_path.parent.mkdir(parents=True, exist_ok=True)
+            json_path.write_text(json.dumps(provenance.to_json(), indent=2))
+        except OSError as e:
+            logging.warning(f"Failed to write the configuration sources to {json_path}: {e}")
+            return
+        logging.info(f"\nThe configuration sources were written to {json_path}")
+
     @staticmethod
     def report_validation_results(validation_result: "ValidationResult") -> int:
         logging.info("=" * 80)
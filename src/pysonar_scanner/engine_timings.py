@@ -0,0 +1,119 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import json
+import logging
+import pathlib
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from pysonar_scanner.scannerengine import LogLine
+
+SENSOR = "sensor"
+PHASE = "phase"
+
+# e.g. "Sensor Python Sensor [python] (done) | time=1234ms" or "Load quality profiles (done) | time=12ms"
+DONE_PATTERN = re.compile(r"^(?P<name>.+?) \(done\) \| time=(?P<duration>\d+)ms")
+# e.g. "Analysis report uploaded in 120ms"
+REPORT_PATTERN = re.compile(r"^Analysis report (?P<step>generated|compressed|uploaded) in (?P<duration>\d+)ms")
+# File indexing does not report its duration; it is measured between these two lines
+INDEXING_START = "Indexing files..."
+INDEXING_END_PATTERN = re.compile(r"^\d+ files? indexed")
+
+REPORT_STEPS = {"generated": "Report generation", "compressed": "Report compression", "uploaded": "Report upload"}
+
+
+@dataclass(frozen=True)
+class Timing:
+    category: str
+    name: str
+    duration_ms: int
+
+
+def parse_timing(log_line: "LogLine") -> Optional[Timing]:
+    """Extract the duration of a sensor or of an analysis phase from an engine log line reporting its end."""
+    message = log_line.message
+    # Cheap check first: the vast majority of the lines report no duration at all
+    if "ms" not in message:
+        return None
+    done = DONE_PATTERN.match(message)
+    if done is not None:
+        name = done.group("name")
+        duration_ms = int(done.group("duration"))
+        if name.startswith("Sensor "):
+            return Timing(SENSOR, name.removeprefix("Sensor "), duration_ms)
+        if name.startswith("SCM Publisher"):
+            return Timing(PHASE, "SCM blame", duration_ms)
+        if name.startswith("CPD Executor"):
+            return Timing(PHASE, "CPD", duration_ms)
+        return Timing(PHASE, name, duration_ms)
+    report = REPORT_PATTERN.match(message)
+    if report is not None:
+        return Timing(PHASE, REPORT_STEPS[report.group("step")], int(report.group("duration")))
+    return None
+
+
+class TimingProfiler:
+    """
+    Log line listener collecting the durations of the sensors and of the analysis phases reported by the engine
+    before handing the lines over to the next listener.
+    """
+
+    def __init__(self, log_line_listener: Callable[["LogLine"], None], report_path: Optional[pathlib.Path] = None):
+        self.log_line_listener = log_line_listener
+        self.report_path = report_path
+        self.timings: list[Timing] = []
+        self.indexing_started_at: Optional[float] = None
+
+    def __call__(self, log_line: "LogLine") -> None:
+        timing = parse_timing(log_line)
+        if timing is not None:
+            self.timings.append(timing)
+        elif log_line.message == INDEXING_START:
+            self.indexing_started_at = time.monotonic()
+        elif self.indexing_started_at is not None and INDEXING_END_PATTERN.match(log_line.message):
+            duration_ms = int((time.monotonic() - self.indexing_started_at) * 1000)
+            self.timings.append(Timing(PHASE, "File indexing", duration_ms))
+            self.indexing_started_at = None
+        self.log_line_listener(log_line)
+
+    def sorted_timings(self) -> list[Timing]:
+        return sorted(self.timings, key=lambda timing: timing.duration_ms, reverse=True)
+
+    def complete(self) -> None:
+        """Log the timing summary and write it as a JSON report when a report path is set."""
+        timings = self.sorted_timings()
+        if not timings:
+            logging.info("No sensor or phase timing was reported by the engine")
+            return
+        summary = "\n".join(f"  {t.duration_ms:>10} ms  {t.category:<6}  {t.name}" for t in timings)
+        logging.info(f"Analysis timings:\n{summary}")
+        if self.report_path is None:
+            return
+        report = {"timings": [{"category": t.category, "name": t.name, "durationMs": t.duration_ms} for t in timings]}
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, indent=2))
+        except OSError as e:
+            logging.warning(f"Failed to write the analysis timings to {self.report_path}: {e}")
+            return
+        logging.info(f"The analysis timings were written to {self.report_path}")
@@ -22,7 +22,11 @@
 from dataclasses import dataclass
 import logging
 
+from pysonar_scanner import app_logging
+
 EXCEPTION_RETURN_CODE = 1
+# Same code as the timeout command, returned when the scanner engine was stopped by the watchdog
+ENGINE_TIMEOUT_RETURN_CODE = 124
 
 
 @dataclass
@@ -98,4 +102,5 @@ def log_error(e: Exception):
         logger.error(str(e), exc_info=False)
         logger.info("For more details, please enable debug logging by passing the --verbose option.")
 
+    app_logging.flush()
     return EXCEPTION_RETURN_CODE
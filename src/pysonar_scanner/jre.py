@@ -17,7 +17,9 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
+import json
 import logging
+import os
 import pathlib
 import shutil
 import tarfile
@@ -37,11 +39,16 @@ from pysonar_scanner.exceptions import JreProvisioningException
 from pysonar_scanner.configuration.properties import (
     SONAR_SCANNER_JAVA_EXE_PATH,
     SONAR_SCANNER_SKIP_JRE_PROVISIONING,
+    SONAR_SCANNER_USE_SYSTEM_JRE,
     SONAR_SCANNER_OS,
     Key,
     SONAR_SCANNER_ARCH,
 )
 
+EXTRACTED_MARKER_FILENAME = ".pysonar-extracted"
+SYSTEM_JRE_PROBES_FILENAME = "system-jre-probes.json"
+MIN_SYSTEM_JAVA_VERSION = 17
+
 
 @dataclass(frozen=True)
 class JREResolvedPath:
@@ -54,6 +61,30 @@ class JREResolvedPath:
         return JREResolvedPath(pathlib.Path(path))
 
 
+def parse_java_version(version: str) -> Optional[int]:
+    """Return the major version of a JAVA_VERSION string, e.g. 17 for "17.0.9" or 8 for "1.8.0_392"."""
+    parts = version.strip().strip('"').split(".")
+    major = parts[1] if parts[0] == "1" and len(parts) > 1 else parts[0]
+    major = major.split("-")[0].split("+")[0]
+    return int(major) if major.isdigit() else None
+
+
+def get_java_home(java_exe_path: pathlib.Path) -> pathlib.Path:
+    return java_exe_path.parent.parent
+
+
+def read_release_java_version(java_home: pathlib.Path) -> Optional[int]:
+    """Read the major Java version from the `release` file shipped at the root of every JDK/JRE."""
+    try:
+        release_content = (java_home / "release").read_text()
+    except OSError:
+        return None
+    for line in release_content.splitlines():
+        if line.startswith("JAVA_VERSION="):
+            return parse_java_version(line.split("=", 1)[1])
+    return None
+
+
 class JREProvisioner:
     def __init__(
         self, api: SonarQubeApi, cache: Cache, sonar_scanner_os: utils.OsStr, sonar_scanner_arch: utils.ArchStr
@@ -64,22 +95,26 @@ class JREProvisioner:
         self.sonar_scanner_arch = sonar_scanner_arch
 
     def provision(self) -> JREResolvedPath:
-        jre, resolved_path = self.__attempt_provisioning_jre_with_retry()
+        jre = self.__get_available_jre()
+        unzip_dir = self.__get_unzip_dir(jre.filename)
+        if self.__is_extracted(jre, unzip_dir):
+            logging.debug(f"Reusing the JRE already extracted in {unzip_dir}")
+            return JREResolvedPath(unzip_dir / jre.java_path)
+
+        jre, resolved_path = self.__attempt_provisioning_jre_with_retry(jre)
         return self.__unpack_jre(jre, resolved_path)
 
-    def __attempt_provisioning_jre_with_retry(self) -> tuple[JRE, pathlib.Path]:
-        jre_and_resolved_path = self.__attempt_provisioning_jre()
+    def __attempt_provisioning_jre_with_retry(self, jre: JRE) -> tuple[JRE, pathlib.Path]:
+        jre_and_resolved_path = self.__attempt_provisioning_jre(jre)
         if jre_and_resolved_path is None:
             logging.warning("Something went wrong while provisionning the JRE. Retrying...")
-            jre_and_resolved_path = self.__attempt_provisioning_jre()
+            jre_and_resolved_path = self.__attempt_provisioning_jre(self.__get_available_jre())
         if jre_and_resolved_path is None:
             raise ChecksumException.create("JRE")
 
         return jre_and_resolved_path
 
-    def __attempt_provisioning_jre(self) -> Optional[tuple[JRE, pathlib.Path]]:
-        jre = self.__get_available_jre()
-
+    def __attempt_provisioning_jre(self, jre: JRE) -> Optional[tuple[JRE, pathlib.Path]]:
         jre_path = self.__get_jre_from_cache(jre)
         if jre_path is not None:
             return (jre, jre_path)
@@ -93,7 +128,26 @@ class JREProvisioner:
             raise NoJreAvailableException(
                 f"No JREs are available for {self.sonar_scanner_os} and {self.sonar_scanner_arch}"
             )
-        return jres[0]
+        # sorted() is stable: the order returned by the server breaks ties between candidates of the same rank
+        return sorted(jres, key=self.__rank_jre)[0]
+
+    def __rank_jre(self, jre: JRE) -> int:
+        """
+        Rank a JRE candidate: 0 if already extracted, 1 if its archive is cached, 2 if it must be downloaded.
+        Checksumming an archive means reading all of it: only the archive of the selected candidate is verified.
+        """
+        if self.__is_extracted(jre, self.__get_unzip_dir(jre.filename)):
+            return 0
+        if self.cache.get_file(jre.filename, jre.sha256).exists():
+            return 1
+        return 2
+
+    def __is_extracted(self, jre: JRE, unzip_dir: pathlib.Path) -> bool:
+        marker = unzip_dir / EXTRACTED_MARKER_FILENAME
+        try:
+            return marker.read_text().strip() == jre.sha256 and (unzip_dir / jre.java_path).exists()
+        except OSError:
+            return False
 
     def __get_jre_from_cache(self, jre: JRE) -> Optional[pathlib.Path]:
         cache_file = self.cache.get_file(jre.filename, jre.sha256)
@@ -118,10 +172,15 @@ class JREProvisioner:
     def __unpack_jre(self, jre: JRE, file_path: pathlib.Path) -> JREResolvedPath:
         unzip_dir = self.__prepare_unzip_dir(file_path)
         self.__extract_jre(file_path, unzip_dir)
+        # The marker is only written once extraction succeeded, so that a partially extracted JRE is never reused
+        (unzip_dir / EXTRACTED_MARKER_FILENAME).write_text(jre.sha256)
         return JREResolvedPath(unzip_dir / jre.java_path)
 
+    def __get_unzip_dir(self, filename: str) -> pathlib.Path:
+        return self.cache.get_file_path(f"{filename}_unzip")
+
     def __prepare_unzip_dir(self, file_path: pathlib.Path) -> pathlib.Path:
-        unzip_dir = self.cache.get_file_path(f"{file_path.name}_unzip")
+        unzip_dir = self.__get_unzip_dir(file_path.name)
         try:
             if unzip_dir.exists():
                 shutil.rmtree(unzip_dir)
@@ -147,6 +206,7 @@ class JREResolverConfiguration:
     sonar_scanner_java_exe_path: Optional[str]
     sonar_scanner_skip_jre_provisioning: bool
     sonar_scanner_os: Optional[str]
+    sonar_scanner_use_system_jre: bool = False
 
     @staticmethod
     def from_dict(config_dict: dict[Key, Any]) -> "JREResolverConfiguration":
@@ -154,18 +214,98 @@ class JREResolverConfiguration:
             sonar_scanner_java_exe_path=config_dict.get(SONAR_SCANNER_JAVA_EXE_PATH, None),
             sonar_scanner_skip_jre_provisioning=config_dict.get(SONAR_SCANNER_SKIP_JRE_PROVISIONING, False),
             sonar_scanner_os=config_dict.get(SONAR_SCANNER_OS, None),
+            sonar_scanner_use_system_jre=str(config_dict.get(SONAR_SCANNER_USE_SYSTEM_JRE, False)).lower() == "true",
         )
 
 
+class SystemJREDetector:
+    """
+    Looks for a Java runtime already installed on the machine, first in JAVA_HOME and then on the PATH.
+    The version of each candidate is read from its `release` file and cached, keyed by path and mtime.
+    """
+
+    def __init__(self, cache: Cache, sonar_scanner_os: Optional[str]):
+        self.cache = cache
+        self.exe_suffix = ".exe" if sonar_scanner_os == "windows" else ""
+
+    def detect(self) -> Optional[JREResolvedPath]:
+        probes = self.__load_probes()
+        probes_before = dict(probes)
+        detected = None
+        for java_home in self.__candidate_java_homes():
+            java_exe = java_home / "bin" / f"java{self.exe_suffix}"
+            version = self.__probe(java_home, probes)
+            if version is None or not java_exe.is_file():
+                logging.debug(f"No usable Java runtime found in {java_home}")
+            elif version < MIN_SYSTEM_JAVA_VERSION:
+                logging.debug(
+                    f"Ignoring the Java {version} runtime in {java_home}: Java {MIN_SYSTEM_JAVA_VERSION}+ is required"
+                )
+            else:
+                logging.info(f"Using the Java {version} runtime found in {java_home}")
+                detected = JREResolvedPath(java_exe)
+                break
+        if probes != probes_before:
+            self.__save_probes(probes)
+        return detected
+
+    def __candidate_java_homes(self) -> list[pathlib.Path]:
+        candidates = []
+        if os.environ.get("JAVA_HOME"):
+            candidates.append(pathlib.Path(os.environ["JAVA_HOME"]))
+        java_on_path = shutil.which(f"java{self.exe_suffix}")
+        if java_on_path is not None:
+            # PATH usually points to a symlink (e.g. /usr/bin/java); the release file lives next to the real binary
+            candidates.append(get_java_home(pathlib.Path(java_on_path).resolve()))
+        return list(dict.fromkeys(candidates))
+
+    def __probe(self, java_home: pathlib.Path, probes: dict[str, Any]) -> Optional[int]:
+        release_file = java_home / "release"
+        try:
+            mtime = release_file.stat().st_mtime_ns
+        except OSError:
+            return None
+        key = str(release_file)
+        probe = probes.get(key)
+        if isinstance(probe, dict) and probe.get("mtime") == mtime:
+            return probe.get("version")
+        version = read_release_java_version(java_home)
+        probes[key] = {"mtime": mtime, "version": version}
+        return version
+
+    def __load_probes(self) -> dict[str, Any]:
+        try:
+            probes = json.loads(self.cache.get_file_path(SYSTEM_JRE_PROBES_FILENAME).read_text())
+            return probes if isinstance(probes, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def __save_probes(self, probes: dict[str, Any]) -> None:
+        try:
+            self.cache.get_file_path(SYSTEM_JRE_PROBES_FILENAME).write_text(json.dumps(probes))
+        except OSError as e:
+            logging.debug(f"Failed to cache the Java runtime probes: {e}")
+
+
 class JREResolver:
-    def __init__(self, configuration: JREResolverConfiguration, jre_provisioner: JREProvisioner):
+    def __init__(
+        self,
+        configuration: JREResolverConfiguration,
+        jre_provisioner: JREProvisioner,
+        system_jre_detector: Optional[SystemJREDetector] = None,
+    ):
         self.configuration = configuration
         self.jre_provisioner = jre_provisioner
+        self.system_jre_detector = system_jre_detector
 
     def resolve_jre(self) -> JREResolvedPath:
         exe_suffix = ".exe" if self.configuration.sonar_scanner_os == "windows" else ""
         if self.configuration.sonar_scanner_java_exe_path:
             return JREResolvedPath(pathlib.Path(self.configuration.sonar_scanner_java_exe_path))
+        if self.configuration.sonar_scanner_use_system_jre and self.system_jre_detector is not None:
+            system_jre = self.system_jre_detector.detect()
+            if system_jre is not None:
+                return system_jre
         if not self.configuration.sonar_scanner_skip_jre_provisioning:
             return self.__provision_jre()
         java_path = pathlib.Path(f"java{exe_suffix}")
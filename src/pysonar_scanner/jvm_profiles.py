@@ -0,0 +1,125 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import logging
+import os
+import pathlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from pysonar_scanner.configuration.properties import SONAR_PROJECT_BASE_DIR, SONAR_SCANNER_JVM_PROFILE, SONAR_SOURCES
+
+FAST_STARTUP = "fast-startup"
+THROUGHPUT = "throughput"
+AUTO = "auto"
+
+# Projects with fewer files than this are analyzed quickly enough for the JVM startup to dominate
+AUTO_PROFILE_FILE_COUNT_THRESHOLD = 1000
+
+# Selecting two garbage collectors prevents the JVM from starting
+GC_SELECTION_PATTERN = r"-XX:\+Use\w+GC\b"
+
+
+@dataclass(frozen=True)
+class JvmFlag:
+    option: str
+    min_java_version: int = 8
+    # Patterns of user-provided Java options taking precedence over this flag; by default, the flag itself
+    overridden_by: tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def name(self) -> str:
+        match = re.match(r"-XX:[+-]?(\w+)", self.option)
+        return match.group(1) if match else self.option
+
+    def is_overridden(self, java_opts: Optional[str]) -> bool:
+        if not java_opts:
+            return False
+        # The whole flag name must match: -XX:MaxMetaspaceSize does not override -XX:MetaspaceSize
+        patterns = self.overridden_by or (rf"(?<!\S)-XX:[+-]?{re.escape(self.name)}(?=[=\s]|$)",)
+        return any(re.search(pattern, java_opts) for pattern in patterns)
+
+
+JVM_PROFILES: dict[str, list[JvmFlag]] = {
+    FAST_STARTUP: [
+        JvmFlag("-XX:+UseSerialGC", overridden_by=(GC_SELECTION_PATTERN,)),
+        # C1 only: compiled code is slower, but the JVM reaches it much sooner
+        JvmFlag("-XX:TieredStopAtLevel=1"),
+        JvmFlag("-XX:MetaspaceSize=128m"),
+    ],
+    THROUGHPUT: [
+        JvmFlag("-XX:+UseParallelGC", overridden_by=(GC_SELECTION_PATTERN,)),
+        JvmFlag("-XX:+TieredCompilation"),
+        # String deduplication is only available with the parallel collector since Java 18
+        JvmFlag("-XX:+UseStringDeduplication", min_java_version=18),
+        JvmFlag("-XX:MetaspaceSize=256m"),
+    ],
+}
+
+
+def select_profile(config: dict[str, Any]) -> Optional[str]:
+    """Return the JVM profile configured for the analysis, resolving "auto" from the number of files to analyze."""
+    profile = config.get(SONAR_SCANNER_JVM_PROFILE)
+    if not profile:
+        return None
+    profile = str(profile).lower()
+    if profile == AUTO:
+        base_dir = pathlib.Path(config.get(SONAR_PROJECT_BASE_DIR) or ".")
+        sources = str(config.get(SONAR_SOURCES) or ".").split(",")
+        file_count = estimate_file_count(base_dir, sources, AUTO_PROFILE_FILE_COUNT_THRESHOLD)
+        profile = FAST_STARTUP if file_count < AUTO_PROFILE_FILE_COUNT_THRESHOLD else THROUGHPUT
+        logging.debug(f"Selected the {profile} JVM profile for a project with about {file_count} files")
+        return profile
+    if profile not in JVM_PROFILES:
+        logging.warning(
+            f"Unsupported value '{profile}' for {SONAR_SCANNER_JVM_PROFILE}, "
+            f"expected one of {', '.join([*JVM_PROFILES, AUTO])}. No JVM profile is applied."
+        )
+        return None
+    return profile
+
+
+def get_profile_options(profile: str, java_version: Optional[int], java_opts: Optional[str]) -> list[str]:
+    """Return the options of a JVM profile supported by the given Java version and not overridden by the user."""
+    options = []
+    for flag in JVM_PROFILES[profile]:
+        if flag.is_overridden(java_opts):
+            logging.debug(f"{flag.option} is not applied, it is overridden by the Java options")
+        elif flag.min_java_version > 8 and (java_version is None or java_version < flag.min_java_version):
+            logging.debug(f"{flag.option} is not applied, it requires Java {flag.min_java_version}")
+        else:
+            options.append(flag.option)
+    return options
+
+
+def estimate_file_count(base_dir: pathlib.Path, sources: list[str], limit: int) -> int:
+    """Count the files in the source directories, skipping hidden ones and stopping as soon as the limit is reached."""
+    count = 0
+    for source in sources:
+        source_path = base_dir / source.strip()
+        if source_path.is_file():
+            count += 1
+            continue
+        for _, dirs, files in os.walk(source_path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            count += len(files)
+            if count >= limit:
+                return limit
+    return min(count, limit)
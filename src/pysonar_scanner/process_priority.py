@@ -0,0 +1,201 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import ctypes
+import logging
+import os
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from subprocess import Popen
+from typing import Any, Callable, Optional
+
+from pysonar_scanner.configuration.properties import (
+    SONAR_SCANNER_ENGINE_CPU_AFFINITY,
+    SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS,
+    SONAR_SCANNER_ENGINE_NICENESS,
+)
+
+IO_PRIORITY_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+# Priority within the best-effort and realtime classes, 0 being the highest and 7 the lowest; 4 is the default
+IOPRIO_DEFAULT_LEVEL = 4
+# Number of the ioprio_set system call, which has no wrapper in the C library nor in Python
+IOPRIO_SET_SYSCALLS = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "s390x": 282,
+}
+
+
+def parse_cpu_list(cpu_list: str) -> set[int]:
+    """Parse a CPU list such as "0-3,6" as written for taskset or in /sys/devices/system/cpu."""
+    cpus: set[int] = set()
+    for part in cpu_list.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+@dataclass(frozen=True)
+class ProcessPriority:
+    """Scheduling settings of the scanner engine process, set when it is started. They are only supported on Linux."""
+
+    niceness: Optional[int] = None
+    io_priority_class: Optional[int] = None
+    cpu_affinity: Optional[frozenset[int]] = None
+
+    @staticmethod
+    def create(config: dict[str, Any]) -> Optional["ProcessPriority"]:
+        niceness_value = config.get(SONAR_SCANNER_ENGINE_NICENESS)
+        io_class_value = config.get(SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS)
+        affinity_value = config.get(SONAR_SCANNER_ENGINE_CPU_AFFINITY)
+        if niceness_value is None and io_class_value is None and affinity_value is None:
+            return None
+        if platform.system() != "Linux":
+            logging.debug("The priority and the CPU affinity of the scanner engine can only be set on Linux")
+            return None
+        priority = ProcessPriority(
+            niceness=_parse_niceness(niceness_value),
+            io_priority_class=_parse_io_priority_class(io_class_value),
+            cpu_affinity=_parse_cpu_affinity(affinity_value),
+        )
+        return priority if priority != ProcessPriority() else None
+
+    def spawn(self, start: Callable[[], Popen]) -> Popen:
+        """
+        Start the engine process from a short-lived thread running with the settings. Linux applies them per thread,
+        and a process inherits them from the thread that forks it: every thread of the engine runs with them from its
+        start, while the threads of the scanner keep their own.
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pysonar-engine-spawner") as executor:
+            return executor.submit(self.__spawn_from_current_thread, start).result()
+
+    def __spawn_from_current_thread(self, start: Callable[[], Popen]) -> Popen:
+        try:
+            self.__apply_to_current_thread()
+        except OSError as e:
+            logging.warning(f"Failed to run the scanner engine with {self.describe()}: {e}")
+        return start()
+
+    def __apply_to_current_thread(self) -> None:
+        thread_id = threading.get_native_id()
+        if self.niceness is not None:
+            os.setpriority(os.PRIO_PROCESS, thread_id, self.niceness)
+        if self.io_priority_class is not None:
+            ioprio_set = _get_ioprio_set()
+            if ioprio_set is not None:
+                level = 0 if self.io_priority_class == IO_PRIORITY_CLASSES["idle"] else IOPRIO_DEFAULT_LEVEL
+                ioprio_set(IOPRIO_WHO_PROCESS, thread_id, (self.io_priority_class << IOPRIO_CLASS_SHIFT) | level)
+        if self.cpu_affinity is not None:
+            os.sched_setaffinity(thread_id, self.cpu_affinity)
+
+    def describe(self) -> str:
+        settings = []
+        if self.niceness is not None:
+            settings.append(f"niceness {self.niceness}")
+        if self.io_priority_class is not None:
+            io_class = next(name for name, value in IO_PRIORITY_CLASSES.items() if value == self.io_priority_class)
+            settings.append(f"I/O class {io_class}")
+        if self.cpu_affinity is not None:
+            settings.append(f"CPUs {','.join(str(cpu) for cpu in sorted(self.cpu_affinity))}")
+        return ", ".join(settings)
+
+
+def _parse_niceness(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        niceness = int(value)
+    except ValueError:
+        logging.warning(f"Invalid value '{value}' for {SONAR_SCANNER_ENGINE_NICENESS}, expected an integer")
+        return None
+    niceness = max(-20, min(niceness, 19))
+    if niceness < os.getpriority(os.PRIO_PROCESS, 0) and os.geteuid() != 0:
+        logging.warning(
+            f"Only root can raise the priority of the scanner engine; {SONAR_SCANNER_ENGINE_NICENESS} is ignored"
+        )
+        return None
+    return niceness
+
+
+def _parse_io_priority_class(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    io_class = IO_PRIORITY_CLASSES.get(str(value).lower())
+    if io_class is None:
+        logging.warning(
+            f"Invalid value '{value}' for {SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS}, "
+            f"expected one of {', '.join(IO_PRIORITY_CLASSES)}"
+        )
+        return None
+    if io_class == IO_PRIORITY_CLASSES["realtime"] and os.geteuid() != 0:
+        logging.warning(
+            f"Only root can use the realtime I/O class; {SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS} is ignored"
+        )
+        return None
+    if _get_ioprio_set() is None:
+        logging.warning(
+            f"The I/O priority cannot be set on this architecture; {SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS} is ignored"
+        )
+        return None
+    return io_class
+
+
+def _parse_cpu_affinity(value: Any) -> Optional[frozenset[int]]:
+    if value is None:
+        return None
+    try:
+        cpus = parse_cpu_list(str(value))
+    except ValueError:
+        cpus = set()
+    allowed_cpus = os.sched_getaffinity(0)
+    if not cpus or not cpus <= allowed_cpus:
+        logging.warning(
+            f"Invalid value '{value}' for {SONAR_SCANNER_ENGINE_CPU_AFFINITY}, expected a list of CPUs among "
+            f"{','.join(str(cpu) for cpu in sorted(allowed_cpus))}, such as 0-3,6"
+        )
+        return None
+    return frozenset(cpus)
+
+
+def _get_ioprio_set() -> Optional[Callable[[int, int, int], None]]:
+    syscall_number = IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if syscall_number is None:
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return None
+
+    def ioprio_set(which: int, who: int, ioprio: int) -> None:
+        if libc.syscall(syscall_number, which, who, ioprio) == -1:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"ioprio_set failed: {os.strerror(errno)}")
+
+    return ioprio_set
@@ -0,0 +1,149 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import csv
+import logging
+import os
+import pathlib
+import threading
+import time
+from dataclasses import astuple, dataclass, fields
+from typing import Optional
+
+PROC_ROOT = pathlib.Path("/proc")
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    elapsed_seconds: float
+    rss_bytes: int
+    cpu_seconds: float
+    threads: int
+    read_bytes: Optional[int]
+    write_bytes: Optional[int]
+
+
+def read_process_sample(pid: int, elapsed_seconds: float) -> Optional[ResourceSample]:
+    """Read the resource usage of a process from /proc, or return None if it does not exist or is exiting."""
+    try:
+        stat = (PROC_ROOT / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    # The process name, in parentheses, may contain spaces: the other fields start after its closing parenthesis
+    stat_fields = stat[stat.rindex(")") + 2 :].split()
+    if stat_fields[0] in ("Z", "X"):
+        return None
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    cpu_seconds = (int(stat_fields[11]) + int(stat_fields[12])) / clock_ticks
+    threads = int(stat_fields[17])
+    rss_bytes = int(stat_fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    read_bytes, write_bytes = _read_io_counters(pid)
+    return ResourceSample(elapsed_seconds, rss_bytes, cpu_seconds, threads, read_bytes, write_bytes)
+
+
+def _read_io_counters(pid: int) -> tuple[Optional[int], Optional[int]]:
+    try:
+        lines = (PROC_ROOT / str(pid) / "io").read_text().splitlines()
+    except OSError:
+        return None, None
+    counters = dict(line.split(": ", 1) for line in lines if ": " in line)
+    read_bytes = counters.get("read_bytes")
+    write_bytes = counters.get("write_bytes")
+    return (
+        int(read_bytes) if read_bytes is not None else None,
+        int(write_bytes) if write_bytes is not None else None,
+    )
+
+
+class ProcessSampler:
+    """
+    Poll the resource usage of a process from /proc in a background thread.
+
+    Sampling relies on the Linux /proc file system; elsewhere, no sample is taken.
+    """
+
+    def __init__(self, interval_seconds: float, time_series_path: Optional[pathlib.Path] = None):
+        self.interval_seconds = interval_seconds
+        self.time_series_path = time_series_path
+        self.samples: list[ResourceSample] = []
+        self.__stopped = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def start(self, pid: int) -> None:
+        if not PROC_ROOT.is_dir():
+            logging.debug("The resource usage of the scanner engine cannot be sampled on this platform")
+            return
+        self.__thread = threading.Thread(target=self.__sample, args=(pid,), daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __sample(self, pid: int) -> None:
+        started_at = time.monotonic()
+        while True:
+            sample = read_process_sample(pid, round(time.monotonic() - started_at, 3))
+            if sample is None:
+                return
+            # A process reports no memory while it is still being executed and once it starts exiting:
+            # such samples are skipped, the process is polled until it is gone
+            if sample.rss_bytes > 0:
+                self.samples.append(sample)
+            if self.__stopped.wait(self.interval_seconds):
+                return
+
+    def report(self) -> None:
+        """Log the peak and average resource usage and write the samples as CSV when a time series path is set."""
+        if not self.samples:
+            return
+        last = self.samples[-1]
+        mb = 1024 * 1024
+        rss = [sample.rss_bytes for sample in self.samples]
+        threads = [sample.threads for sample in self.samples]
+        cpu_usage = [
+            (current.cpu_seconds - previous.cpu_seconds) / (current.elapsed_seconds - previous.elapsed_seconds)
+            for previous, current in zip(self.samples, self.samples[1:])
+            if current.elapsed_seconds > previous.elapsed_seconds
+        ]
+        average_cpu = last.cpu_seconds / last.elapsed_seconds if last.elapsed_seconds > 0 else 0.0
+        summary = [
+            f"  RSS: peak {max(rss) / mb:.1f} MB, average {sum(rss) / len(rss) / mb:.1f} MB",
+            f"  CPU: {last.cpu_seconds:.1f} s, peak {max(cpu_usage, default=0.0):.2f} cores, "
+            f"average {average_cpu:.2f} cores",
+            f"  Threads: peak {max(threads)}, average {sum(threads) / len(threads):.0f}",
+        ]
+        if last.read_bytes is not None and last.write_bytes is not None:
+            summary.append(f"  I/O: read {last.read_bytes / mb:.1f} MB, written {last.write_bytes / mb:.1f} MB")
+        logging.info(f"Scanner engine resource usage ({len(self.samples)} samples):\n" + "\n".join(summary))
+        if self.time_series_path is not None:
+            self.__write_time_series(self.time_series_path)
+
+    def __write_time_series(self, path: pathlib.Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(field.name for field in fields(ResourceSample))
+                writer.writerows(astuple(sample) for sample in self.samples)
+        except OSError as e:
+            logging.warning(f"Failed to write the scanner engine resource usage to {path}: {e}")
+            return
+        logging.info(f"The scanner engine resource usage was written to {path}")
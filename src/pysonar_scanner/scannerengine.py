@@ -17,60 +17,319 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
+import functools
+import gzip
+import hashlib
+import io
 import json
 import logging
+import lzma
+import os
 import pathlib
+import queue
 import shlex
+import shutil
+import signal
+import tempfile
+import threading
+import time
 from dataclasses import dataclass
-from subprocess import PIPE, Popen
-from threading import Thread
-from typing import IO, Any, Callable, Optional
+from subprocess import PIPE, Popen, TimeoutExpired
+from threading import Thread, Timer
+from typing import Any, Callable, Iterator, Optional, TextIO
 
+from pysonar_scanner import cgroups, jvm_profiles
+from pysonar_scanner.engine_timings import TimingProfiler
+from pysonar_scanner.process_priority import ProcessPriority
+from pysonar_scanner.process_sampler import ProcessSampler
 from pysonar_scanner.api import EngineInfo, SonarQubeApi
 from pysonar_scanner.cache import Cache, CacheFile
 from pysonar_scanner.configuration.properties import (
+    SONAR_LOG_LEVEL,
+    SONAR_SCANNER_CLASS_DATA_SHARING,
+    SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT,
+    SONAR_SCANNER_ENGINE_LOG_CAPTURE,
+    SONAR_SCANNER_ENGINE_TIMEOUT,
+    SONAR_SCANNER_JAVA_HEAP_SIZE,
     SONAR_SCANNER_JAVA_OPTS,
     SONAR_SCANNER_OPTS,
+    SONAR_SCANNER_PROFILE_JVM,
+    SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL,
+    SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES,
+    SONAR_SCANNER_SENSOR_TIMINGS,
+    SONAR_PYTHON_ANALYSIS_PARALLEL,
+    SONAR_PYTHON_ANALYSIS_THREADS,
+    SONAR_VERBOSE,
 )
-from pysonar_scanner.exceptions import ChecksumException
-from pysonar_scanner.jre import JREResolvedPath
+from pysonar_scanner.exceptions import ENGINE_TIMEOUT_RETURN_CODE, ChecksumException
+from pysonar_scanner.jre import JREResolvedPath, get_java_home, read_release_java_version
+from pysonar_scanner.utils import get_working_directory
 
+# Dynamic CDS archives (-XX:ArchiveClassesAtExit) are supported since Java 13
+CDS_MIN_JAVA_VERSION = 13
+CDS_ARCHIVE_PREFIX = "scanner-engine-cds-"
 
-@dataclass(frozen=True)
+# Settings shipped with every JDK providing Java Flight Recorder, see $JAVA_HOME/lib/jfr
+JFR_SETTINGS = ("default", "profile")
+JFR_RECORDING_FILENAME = "scanner-engine.jfr"
+
+# Share of the container memory limit given to the heap; the rest is left for metaspace, threads and native memory
+HEAP_SHARE_OF_MEMORY_LIMIT = 0.75
+MIN_NON_HEAP_MEMORY_MB = 256
+MIN_HEAP_SIZE_MB = 256
+
+# The engine output is read in chunks of up to LOG_READ_CHUNK_SIZE bytes, each chunk being handed over as one batch.
+# At most LOG_QUEUE_MAX_BATCHES batches are buffered, which bounds the memory used when logging cannot keep up.
+LOG_READ_CHUNK_SIZE = 64 * 1024
+LOG_QUEUE_MAX_BATCHES = 64
+
+# When the watchdog fires, the JVM is given some time to print a thread dump, then to exit before being killed.
+# The same grace period applies when the scanner itself is asked to stop.
+THREAD_DUMP_WAIT_SECONDS = 5
+TERMINATION_GRACE_SECONDS = 10
+FORWARDED_SIGNALS = ("SIGINT", "SIGTERM")
+
+ENGINE_LOG_CAPTURE_FILENAME = "engine-logs.jsonl"
+ANALYSIS_TIMINGS_FILENAME = "analysis-timings.json"
+RESOURCE_USAGE_FILENAME = "engine-resource-usage.csv"
+# Supported compressions of the engine log capture, with the extension and the opener of their files
+ENGINE_LOG_CAPTURE_FORMATS: dict[str, tuple[str, Callable[[pathlib.Path], TextIO]]] = {
+    "gzip": (".gz", lambda path: gzip.open(path, "wt", encoding="utf-8", compresslevel=6)),
+    "lzma": (".xz", lambda path: lzma.open(path, "wt", encoding="utf-8")),
+}
+
+
+@dataclass(frozen=True, slots=True)
 class LogLine:
     level: str
     message: str
     stacktrace: Optional[str] = None
 
     def get_logging_level(self) -> int:
-        if self.level == "ERROR":
-            return logging.ERROR
-        if self.level == "WARN":
-            return logging.WARNING
-        if self.level == "INFO":
-            return logging.INFO
-        if self.level == "DEBUG":
-            return logging.DEBUG
-        if self.level == "TRACE":
-            return logging.DEBUG
-        return logging.INFO
+        return ENGINE_LOGGING_LEVELS.get(self.level, logging.INFO)
+
+
+ENGINE_LOGGING_LEVELS = {
+    "ERROR": logging.ERROR,
+    "WARN": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "TRACE": logging.DEBUG,
+}
 
 
 def parse_log_line(line: str) -> LogLine:
+    # Only JSON objects are structured log lines, anything else is forwarded as is without trying to decode it
+    if not line.startswith("{"):
+        return LogLine(level="INFO", message=line, stacktrace=None)
     try:
         line_json = json.loads(line)
         level = line_json.get("level", "INFO")
         message = line_json.get("message", line)
         stacktrace = line_json.get("stacktrace")
         return LogLine(level=level, message=message, stacktrace=stacktrace)
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, AttributeError):
         return LogLine(level="INFO", message=line, stacktrace=None)
 
 
+def read_lines_in_batches(stream: io.BufferedIOBase) -> Iterator[list[str]]:
+    """
+    Yield the lines of a stream in batches made of whatever the stream has available: a single line when the
+    process writes slowly, many lines at once when it floods its output. A batch never waits for more data.
+    """
+    remainder = b""
+    for chunk in iter(lambda: stream.read1(LOG_READ_CHUNK_SIZE), b""):
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        if lines:
+            yield [line.decode("utf-8", errors="replace").rstrip() for line in lines]
+    if remainder:
+        yield [remainder.decode("utf-8", errors="replace").rstrip()]
+
+
 def default_log_line_listener(log_line: LogLine):
-    logging.log(log_line.get_logging_level(), log_line.message)
+    level = log_line.get_logging_level()
+    # Most engine lines are DEBUG lines that are not displayed; discard them before building any log record
+    if not logging.getLogger().isEnabledFor(level):
+        return
+    logging.log(level, log_line.message)
     if log_line.stacktrace is not None:
-        logging.log(log_line.get_logging_level(), log_line.stacktrace)
+        logging.log(level, log_line.stacktrace)
+
+
+def signal_process_group(process: Popen, signal_number: int) -> None:
+    """
+    Send a signal to the scanner engine and to any process it started. On POSIX systems, the engine runs in its own
+    session, hence its own process group whose id is its pid.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal_number)
+        elif signal_number == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.send_signal(signal_number)
+    except ProcessLookupError:
+        pass
+
+
+def kill_process_group(process: Popen) -> None:
+    if hasattr(signal, "SIGKILL"):
+        signal_process_group(process, signal.SIGKILL)
+    else:
+        process.kill()
+
+
+class SignalForwarder:
+    """
+    Forward SIGINT and SIGTERM received by the scanner to the scanner engines, then kill the engines that have not
+    exited after a grace period. A second signal kills them at once.
+
+    The engine runs in its own process group, so it does not receive the signals sent to the scanner process group,
+    e.g. by Ctrl+C or by a CI runner cancelling a job; without forwarding, it would outlive the scanner.
+    Several engines running at the same time, as in batch mode, can be attached to the same forwarder.
+    Signal handlers can only be installed from the main thread; elsewhere, nothing is forwarded.
+    """
+
+    def __init__(self, grace_period: float = TERMINATION_GRACE_SECONDS):
+        self.grace_period = grace_period
+        self.received_signal: Optional[int] = None
+        self.processes: list[Popen] = []
+        self.__previous_handlers: dict[int, Any] = {}
+        self.__kill_timers: list[Timer] = []
+
+    def install(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for name in FORWARDED_SIGNALS:
+            if hasattr(signal, name):
+                signal_number = getattr(signal, name)
+                self.__previous_handlers[signal_number] = signal.signal(signal_number, self.__handle)
+
+    def attach(self, process: Popen) -> None:
+        self.processes.append(process)
+        # A signal may have been received while the engine was being started
+        if self.received_signal is not None:
+            self.__forward(process, self.received_signal)
+
+    def detach(self, process: Popen) -> None:
+        if process in self.processes:
+            self.processes.remove(process)
+
+    def uninstall(self) -> None:
+        for signal_number, handler in self.__previous_handlers.items():
+            signal.signal(signal_number, handler)
+        self.__previous_handlers.clear()
+        for kill_timer in self.__kill_timers:
+            kill_timer.cancel()
+        self.__kill_timers.clear()
+
+    def __handle(self, signal_number: int, _frame: Any) -> None:
+        # Nothing is logged from the handler: it may interrupt the main thread while it holds a logging lock
+        if self.received_signal is not None:
+            for process in list(self.processes):
+                kill_process_group(process)
+            return
+        self.received_signal = signal_number
+        for process in list(self.processes):
+            self.__forward(process, signal_number)
+
+    def __forward(self, process: Popen, signal_number: int) -> None:
+        signal_process_group(process, signal_number)
+        kill_timer = Timer(self.grace_period, self.__kill, args=(process,))
+        kill_timer.daemon = True
+        kill_timer.start()
+        self.__kill_timers.append(kill_timer)
+
+    def __kill(self, process: Popen) -> None:
+        if process.poll() is None:
+            kill_process_group(process)
+
+
+class EngineWatchdog:
+    """
+    Stop the scanner engine when it runs for longer than the overall timeout, or when it does not log anything for
+    longer than the inactivity timeout.
+
+    The watchdog does not run in its own thread: the thread forwarding the engine logs checks it whenever a batch
+    of lines arrives and whenever it has waited for the delay returned by seconds_until_next_check. When a timeout
+    expires, the JVM is asked for a thread dump with SIGQUIT, then terminated, then killed.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        inactivity_timeout: Optional[float] = None,
+        thread_dump_wait: float = THREAD_DUMP_WAIT_SECONDS,
+        termination_grace: float = TERMINATION_GRACE_SECONDS,
+    ):
+        self.timeout = timeout
+        self.inactivity_timeout = inactivity_timeout
+        self.thread_dump_wait = thread_dump_wait
+        self.termination_grace = termination_grace
+        self.expired = False
+        self.process: Optional[Popen] = None
+        self.started_at = 0.0
+        self.last_activity_at = 0.0
+        # Actions left to stop the process, each with the delay to wait after it before running the next one
+        self.__stop_actions: list[tuple[Callable[[], None], float]] = []
+        self.__next_action_at: Optional[float] = None
+
+    def start(self, process: Popen) -> None:
+        self.process = process
+        self.started_at = self.last_activity_at = time.monotonic()
+
+    def on_activity(self) -> None:
+        self.last_activity_at = time.monotonic()
+
+    def seconds_until_next_check(self) -> Optional[float]:
+        now = time.monotonic()
+        deadlines = []
+        if self.__next_action_at is not None:
+            deadlines.append(self.__next_action_at)
+        elif not self.expired:
+            if self.timeout is not None:
+                deadlines.append(self.started_at + self.timeout)
+            if self.inactivity_timeout is not None:
+                deadlines.append(self.last_activity_at + self.inactivity_timeout)
+        return max(min(deadlines) - now, 0.0) if deadlines else None
+
+    def check(self) -> None:
+        process = self.process
+        if process is None:
+            return
+        now = time.monotonic()
+        if not self.expired:
+            if self.timeout is not None and now - self.started_at >= self.timeout:
+                self.__expire(process, f"The scanner engine did not complete within {self.timeout:g} seconds")
+            elif self.inactivity_timeout is not None and now - self.last_activity_at >= self.inactivity_timeout:
+                self.__expire(
+                    process, f"The scanner engine did not log anything for {self.inactivity_timeout:g} seconds"
+                )
+            return
+        if self.__next_action_at is not None and now >= self.__next_action_at:
+            self.__run_next_stop_action(process)
+
+    def __expire(self, process: Popen, reason: str) -> None:
+        logging.error(f"{reason}; stopping it. The thread dump below shows what it was doing.")
+        self.expired = True
+        if hasattr(signal, "SIGQUIT"):
+            self.__stop_actions.append((lambda: self.__send(process, signal.SIGQUIT), self.thread_dump_wait))
+        self.__stop_actions.append((lambda: self.__send(process, signal.SIGTERM), self.termination_grace))
+        self.__stop_actions.append((lambda: kill_process_group(process), 0))
+        self.__run_next_stop_action(process)
+
+    def __run_next_stop_action(self, process: Popen) -> None:
+        action, delay = self.__stop_actions.pop(0)
+        if process.poll() is None:
+            action()
+        self.__next_action_at = time.monotonic() + delay if self.__stop_actions else None
+
+    def __send(self, process: Popen, signal_number: int) -> None:
+        try:
+            signal_process_group(process, signal_number)
+        except OSError as e:
+            logging.debug(f"Failed to send signal {signal_number} to the scanner engine: {e}")
 
 
 class CmdExecutor:
@@ -79,36 +338,143 @@ class CmdExecutor:
         cmd: list[str],
         properties_str: str,
         log_line_listener: Callable[[LogLine], None] = default_log_line_listener,
+        process_sampler: Optional[ProcessSampler] = None,
+        watchdog: Optional[EngineWatchdog] = None,
+        process_priority: Optional[ProcessPriority] = None,
+        signal_forwarder: Optional[SignalForwarder] = None,
     ):
         self.cmd = cmd
         self.properties_str = properties_str
         self.log_line_listener = log_line_listener
+        self.process_sampler = process_sampler
+        self.watchdog = watchdog
+        self.process_priority = process_priority
+        # A forwarder given by the caller is shared with other engines: the caller installs and uninstalls it
+        self.signal_forwarder = signal_forwarder
 
     def execute(self):
-        process = Popen(self.cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        process.stdin.write(self.properties_str.encode())
-        process.stdin.close()
+        popen_options: dict[str, Any] = {}
+        if os.name == "posix":
+            popen_options["start_new_session"] = True
+        shared_forwarder = self.signal_forwarder is not None
+        signal_forwarder = self.signal_forwarder if self.signal_forwarder is not None else SignalForwarder()
+        if not shared_forwarder:
+            signal_forwarder.install()
+        process: Optional[Popen] = None
+        try:
+            start = functools.partial(Popen, self.cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE, **popen_options)
+            process = self.process_priority.spawn(start) if self.process_priority is not None else start()
+            signal_forwarder.attach(process)
+            if self.process_sampler is not None:
+                self.process_sampler.start(process.pid)
+            if self.watchdog is not None:
+                self.watchdog.start(process)
+            self.__write_properties(process)
+
+            log_queue: queue.Queue[Optional[list[LogLine]]] = queue.Queue(maxsize=LOG_QUEUE_MAX_BATCHES)
+            output_thread = Thread(target=self.__read_output, args=(process.stdout, log_queue), daemon=True)
+            error_thread = Thread(target=self.__read_output, args=(process.stderr, log_queue), daemon=True)
 
-        output_thread = Thread(target=self.__log_output, args=(process.stdout,))
-        error_thread = Thread(target=self.__log_output, args=(process.stderr,))
+            returncode = self.__process_output(output_thread, error_thread, process, log_queue)
+        finally:
+            if process is not None:
+                signal_forwarder.detach(process)
+            if not shared_forwarder:
+                signal_forwarder.uninstall()
+        if signal_forwarder.received_signal is not None:
+            signal_name = signal.Signals(signal_forwarder.received_signal).name
+            logging.warning(f"The analysis was cancelled: the scanner received {signal_name}")
+            # Same exit code as a process killed by the signal, as reported by shells
+            return 128 + signal_forwarder.received_signal
+        return returncode
 
-        return self.__process_output(output_thread, error_thread, process)
+    def __write_properties(self, process: Popen) -> None:
+        stdin = process.stdin
+        if stdin is None:
+            # Only set when the process is started with stdin=PIPE
+            return
+        try:
+            stdin.write(self.properties_str.encode())
+            stdin.close()
+        except BrokenPipeError:
+            # The engine exited before reading its properties, e.g. because it was cancelled; its output tells why
+            pass
 
-    def __log_output(self, stream: IO[bytes]):
-        for line in stream:
-            decoded_line = line.decode("utf-8").rstrip()
-            log_line = parse_log_line(decoded_line)
-            self.log_line_listener(log_line)
+    def __read_output(self, stream: io.BufferedIOBase, log_queue: "queue.Queue[Optional[list[LogLine]]]"):
+        try:
+            for lines in read_lines_in_batches(stream):
+                log_queue.put([parse_log_line(line) for line in lines])
+        finally:
+            # Signals the end of this stream to the thread forwarding the log lines
+            log_queue.put(None)
 
-    def __process_output(self, output_thread: Thread, error_thread: Thread, process: Popen) -> int:
+    def __process_output(
+        self,
+        output_thread: Thread,
+        error_thread: Thread,
+        process: Popen,
+        log_queue: "queue.Queue[Optional[list[LogLine]]]",
+    ) -> int:
         output_thread.start()
         error_thread.start()
-        process.wait()
+        try:
+            self.__forward_logs(log_queue, open_streams=2)
+            self.__wait(process)
+        except BaseException:
+            # Nothing forwards the logs any more: the readers would block on the full queue and the engine on its
+            # full pipes. Stop the engine and discard its remaining output so that every thread ends
+            kill_process_group(process)
+            self.__discard_logs(log_queue, [output_thread, error_thread])
+            process.wait()
+            raise
+        finally:
+            if self.process_sampler is not None:
+                self.process_sampler.stop()
         output_thread.join()
         error_thread.join()
 
+        if self.watchdog is not None and self.watchdog.expired:
+            return ENGINE_TIMEOUT_RETURN_CODE
         return process.returncode
 
+    def __forward_logs(self, log_queue: "queue.Queue[Optional[list[LogLine]]]", open_streams: int):
+        watchdog = self.watchdog
+        while open_streams > 0:
+            try:
+                batch = log_queue.get(timeout=watchdog.seconds_until_next_check() if watchdog is not None else None)
+            except queue.Empty:
+                if watchdog is not None:
+                    watchdog.check()
+                continue
+            if batch is None:
+                open_streams -= 1
+                continue
+            if watchdog is not None:
+                watchdog.on_activity()
+                watchdog.check()
+            for log_line in batch:
+                self.log_line_listener(log_line)
+
+    def __discard_logs(self, log_queue: "queue.Queue[Optional[list[LogLine]]]", reader_threads: list[Thread]):
+        while any(thread.is_alive() for thread in reader_threads):
+            try:
+                log_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for thread in reader_threads:
+            thread.join()
+
+    def __wait(self, process: Popen) -> None:
+        # The process may still be running after closing its output streams
+        watchdog = self.watchdog
+        while True:
+            try:
+                process.wait(timeout=watchdog.seconds_until_next_check() if watchdog is not None else None)
+                return
+            except TimeoutExpired:
+                if watchdog is not None:
+                    watchdog.check()
+
 
 class ScannerEngineProvisioner:
     def __init__(self, api: SonarQubeApi, cache: Cache):
@@ -143,31 +509,405 @@ class ScannerEngineProvisioner:
                 self.api.download_analysis_engine(f)
 
 
+def normalize_heap_size(heap_size: str) -> str:
+    """Convert a heap size such as "8000Mb" or "2GB" to the format expected by -Xmx, e.g. "8000m" or "2g"."""
+    heap_size = heap_size.strip()
+    if len(heap_size) >= 2 and heap_size[-1] in "bB" and heap_size[-2] in "kKmMgGtT":
+        heap_size = heap_size[:-1]
+    return heap_size.lower()
+
+
+class ClassDataSharingArchive:
+    """
+    Dynamic AppCDS archive of the classes loaded by the scanner engine, stored in the cache.
+
+    The archive is dumped by the JVM at exit on the first run and loaded with -XX:SharedArchiveFile on the next ones.
+    Its name is derived from the engine JAR and the JRE, so that a new archive is created whenever either changes.
+    """
+
+    def __init__(self, cache: Cache, archive_path: pathlib.Path):
+        self.cache = cache
+        self.archive_path = archive_path
+        # Engines run concurrently in batch mode each dump their own archive
+        self.dump_path = archive_path.with_name(f"{archive_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    @staticmethod
+    def create(
+        cache: Cache, jre_path: JREResolvedPath, scanner_engine_path: pathlib.Path
+    ) -> Optional["ClassDataSharingArchive"]:
+        java_home = get_java_home(jre_path.path)
+        java_version = read_release_java_version(java_home)
+        if java_version is None or java_version < CDS_MIN_JAVA_VERSION:
+            logging.debug(f"Class data sharing is not available for the JRE {jre_path.path}")
+            return None
+        try:
+            engine_stat = scanner_engine_path.stat()
+            java_stat = jre_path.path.stat()
+            release = (java_home / "release").read_bytes()
+        except OSError as e:
+            logging.debug(f"Class data sharing is disabled: {e}")
+            return None
+        fingerprint = hashlib.sha256()
+        for part in (scanner_engine_path.resolve(), engine_stat.st_size, engine_stat.st_mtime_ns):
+            fingerprint.update(f"{part}\0".encode())
+        for part in (jre_path.path.resolve(), java_stat.st_size, java_stat.st_mtime_ns):
+            fingerprint.update(f"{part}\0".encode())
+        fingerprint.update(release)
+        archive_name = f"{CDS_ARCHIVE_PREFIX}{fingerprint.hexdigest()[:32]}.jsa"
+        return ClassDataSharingArchive(cache, cache.get_file_path(archive_name))
+
+    def is_valid(self) -> bool:
+        try:
+            return self.archive_path.is_file() and self.archive_path.stat().st_size > 0
+        except OSError:
+            return False
+
+    def jvm_options(self) -> list[str]:
+        # The JVM reports every class it cannot archive as a warning; they are of no interest to the user
+        options = ["-Xlog:cds=off,cds+dynamic=off"]
+        if self.is_valid():
+            logging.debug(f"Using the class data sharing archive {self.archive_path}")
+            return options + [f"-XX:SharedArchiveFile={self.archive_path}"]
+        logging.debug(f"Creating the class data sharing archive {self.archive_path}")
+        return options + [f"-XX:ArchiveClassesAtExit={self.dump_path}"]
+
+    def complete(self, returncode: int) -> None:
+        """Publish an archive dumped by a successful run and discard the archives of previous engines or JREs."""
+        if not self.dump_path.exists():
+            return
+        try:
+            if returncode != 0 or self.dump_path.stat().st_size == 0:
+                self.dump_path.unlink()
+                return
+            os.replace(self.dump_path, self.archive_path)
+            for stale_archive in self.cache.cache_folder.glob(f"{CDS_ARCHIVE_PREFIX}*.jsa"):
+                if stale_archive != self.archive_path:
+                    stale_archive.unlink(missing_ok=True)
+        except OSError as e:
+            logging.debug(f"Failed to store the class data sharing archive: {e}")
+
+
+class FlightRecording:
+    """
+    Java Flight Recorder recording of the whole scanner engine run, dumped when the JVM exits.
+
+    As for the engine logs, the recording is written to a temporary directory and moved to the working directory
+    once the engine has exited, since the engine cleans its working directory when the analysis starts.
+    """
+
+    def __init__(self, settings: str, java_version: Optional[int], target_path: pathlib.Path):
+        self.settings = settings
+        self.java_version = java_version
+        self.target_path = target_path
+        self.recording_path = pathlib.Path(tempfile.mkdtemp(prefix="pysonar-jfr-")) / JFR_RECORDING_FILENAME
+
+    @staticmethod
+    def create(config: dict[str, Any], jre_path: JREResolvedPath) -> Optional["FlightRecording"]:
+        settings = config.get(SONAR_SCANNER_PROFILE_JVM)
+        if not settings:
+            return None
+        settings = str(settings).lower()
+        if settings not in JFR_SETTINGS:
+            logging.warning(
+                f"Unsupported value '{settings}' for {SONAR_SCANNER_PROFILE_JVM}, "
+                f"expected one of {', '.join(JFR_SETTINGS)}. The JVM is not profiled."
+            )
+            return None
+        java_version = read_release_java_version(get_java_home(jre_path.path))
+        return FlightRecording(settings, java_version, get_working_directory(config) / JFR_RECORDING_FILENAME)
+
+    def jvm_options(self) -> list[str]:
+        recording = f"dumponexit=true,filename={self.recording_path},settings={self.settings}"
+        if self.java_version is not None and self.java_version < 11:
+            # Before Java 11, JFR is only available from 8u262 on and must be enabled explicitly
+            return ["-XX:+FlightRecorder", f"-XX:StartFlightRecording=defaultrecording=true,{recording}"]
+        return [f"-XX:StartFlightRecording={recording}"]
+
+    def complete(self) -> Optional[pathlib.Path]:
+        """Move the recording to the working directory, returning its final path."""
+        if not self.recording_path.exists():
+            logging.warning("The scanner engine did not write any flight recording")
+            shutil.rmtree(self.recording_path.parent, ignore_errors=True)
+            return None
+        try:
+            self.target_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(self.recording_path, self.target_path)
+            self.recording_path.parent.rmdir()
+        except OSError as e:
+            logging.warning(f"Failed to store the flight recording in {self.target_path}: {e}")
+            return None
+        logging.info(f"The flight recording of the scanner engine was written to {self.target_path}")
+        return self.target_path
+
+
+class EngineLogCapture:
+    """
+    Log line listener writing every engine log line, whatever its level, to a compressed JSON Lines file
+    before handing it over to the console listener.
+
+    The engine cleans its working directory when the analysis starts, so the lines are first written to a temporary
+    file that is moved to the working directory once the engine has exited.
+    """
+
+    def __init__(
+        self,
+        target_path: pathlib.Path,
+        compression: str,
+        log_line_listener: Callable[[LogLine], None] = default_log_line_listener,
+    ):
+        extension, opener = ENGINE_LOG_CAPTURE_FORMATS[compression]
+        self.target_path = target_path
+        self.log_line_listener = log_line_listener
+        fd, temp_path = tempfile.mkstemp(prefix="pysonar-engine-logs-", suffix=extension)
+        os.close(fd)
+        self.temp_path = pathlib.Path(temp_path)
+        self.file = opener(self.temp_path)
+
+    @staticmethod
+    def create(
+        config: dict[str, Any], log_line_listener: Callable[[LogLine], None] = default_log_line_listener
+    ) -> Optional["EngineLogCapture"]:
+        compression = config.get(SONAR_SCANNER_ENGINE_LOG_CAPTURE)
+        if not compression:
+            return None
+        compression = str(compression).lower()
+        if compression not in ENGINE_LOG_CAPTURE_FORMATS:
+            logging.warning(
+                f"Unsupported value '{compression}' for {SONAR_SCANNER_ENGINE_LOG_CAPTURE}, "
+                f"expected one of {', '.join(ENGINE_LOG_CAPTURE_FORMATS)}. The engine logs are not captured."
+            )
+            return None
+        extension = ENGINE_LOG_CAPTURE_FORMATS[compression][0]
+        target_path = get_working_directory(config) / f"{ENGINE_LOG_CAPTURE_FILENAME}{extension}"
+        return EngineLogCapture(target_path, compression, log_line_listener)
+
+    def __call__(self, log_line: LogLine) -> None:
+        record = {
+            "timestamp": int(time.time() * 1000),
+            "level": log_line.level,
+            "message": log_line.message,
+        }
+        if log_line.stacktrace is not None:
+            record["stacktrace"] = log_line.stacktrace
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.file.write("\n")
+        self.log_line_listener(log_line)
+
+    def complete(self) -> Optional[pathlib.Path]:
+        """Close the capture file and move it to the working directory, returning its final path."""
+        self.file.close()
+        try:
+            self.target_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(self.temp_path, self.target_path)
+        except OSError as e:
+            logging.warning(
+                f"Failed to store the engine logs in {self.target_path}: {e}. They are kept in {self.temp_path}"
+            )
+            return None
+        logging.info(f"The engine logs were written to {self.target_path}")
+        return self.target_path
+
+
 class ScannerEngine:
-    def __init__(self, jre_path: JREResolvedPath, scanner_engine_path: pathlib.Path):
+    def __init__(self, jre_path: JREResolvedPath, scanner_engine_path: pathlib.Path, cache: Optional[Cache] = None):
         self.jre_path = jre_path
         self.scanner_engine_path = scanner_engine_path
+        self.cache = cache
 
-    def run(self, config: dict[str, Any]):
+    def run(self, config: dict[str, Any], signal_forwarder: Optional[SignalForwarder] = None, concurrent_runs: int = 1):
+        """
+        Run the scanner engine with the given configuration and return its exit code.
+
+        `concurrent_runs` is the number of engines running at the same time on the machine, such as in batch mode:
+        the heap and the CPUs derived from the container limits are shared between them.
+        """
         # Extract Java options if present; they must influence the JVM invocation, not the scanner engine itself
         java_opts = config.get(SONAR_SCANNER_JAVA_OPTS)
         java_opts = config.get(SONAR_SCANNER_OPTS) if not java_opts else java_opts
 
-        cmd = self.__build_command(self.jre_path, self.scanner_engine_path, java_opts)
+        cds_archive = self.__get_cds_archive(config, java_opts)
+        jvm_options = self.__get_heap_options(config, java_opts, concurrent_runs)
+        config, cpu_options = self.__apply_cpu_limit(config, java_opts, concurrent_runs)
+        jvm_options += cpu_options
+        jvm_options += self.__get_profile_options(config, java_opts)
+        jvm_options += cds_archive.jvm_options() if cds_archive is not None else []
+        flight_recording = self.__get_flight_recording(config, java_opts)
+        jvm_options += flight_recording.jvm_options() if flight_recording is not None else []
+        cmd = self.__build_command(self.jre_path, self.scanner_engine_path, java_opts, jvm_options)
         logging.debug(f"Command: {cmd}")
+        # Engine log lines go through the log capture, then the timing profiler, then to the console
+        log_line_listener: Callable[[LogLine], None] = default_log_line_listener
+        timing_profiler = self.__get_timing_profiler(config, log_line_listener)
+        if timing_profiler is not None:
+            log_line_listener = timing_profiler
+        log_capture = EngineLogCapture.create(config, log_line_listener)
+        if log_capture is not None:
+            config = self.__enable_engine_debug_logs(config)
+            log_line_listener = log_capture
+        process_sampler = self.__get_process_sampler(config)
+        watchdog = self.__get_watchdog(config)
+        process_priority = ProcessPriority.create(config)
+        if process_priority is not None:
+            logging.info(f"Running the scanner engine with {process_priority.describe()}")
         properties_str = self.__config_to_json(config)
         logging.debug(f"Properties: {properties_str}")
-        return CmdExecutor(cmd, properties_str).execute()
+        try:
+            returncode = CmdExecutor(
+                cmd,
+                properties_str,
+                log_line_listener=log_line_listener,
+                process_sampler=process_sampler,
+                watchdog=watchdog,
+                process_priority=process_priority,
+                signal_forwarder=signal_forwarder,
+            ).execute()
+        finally:
+            if log_capture is not None:
+                log_capture.complete()
+        if timing_profiler is not None:
+            timing_profiler.complete()
+        if process_sampler is not None:
+            process_sampler.report()
+        if cds_archive is not None:
+            cds_archive.complete(returncode)
+        if flight_recording is not None:
+            flight_recording.complete()
+        return returncode
+
+    def __get_flight_recording(self, config: dict[str, Any], java_opts: Optional[str]) -> Optional[FlightRecording]:
+        if java_opts and "StartFlightRecording" in java_opts:
+            logging.debug("A flight recording is configured through the Java options; it is left untouched")
+            return None
+        return FlightRecording.create(config, self.jre_path)
+
+    def __get_timing_profiler(
+        self, config: dict[str, Any], log_line_listener: Callable[[LogLine], None]
+    ) -> Optional[TimingProfiler]:
+        if str(config.get(SONAR_SCANNER_SENSOR_TIMINGS, False)).lower() != "true":
+            return None
+        return TimingProfiler(log_line_listener, get_working_directory(config) / ANALYSIS_TIMINGS_FILENAME)
+
+    def __get_process_sampler(self, config: dict[str, Any]) -> Optional[ProcessSampler]:
+        interval_seconds = self.__get_positive_seconds(config, SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL)
+        if interval_seconds is None:
+            return None
+        time_series_path = None
+        if str(config.get(SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES, False)).lower() == "true":
+            time_series_path = get_working_directory(config) / RESOURCE_USAGE_FILENAME
+        return ProcessSampler(interval_seconds, time_series_path)
+
+    def __get_watchdog(self, config: dict[str, Any]) -> Optional[EngineWatchdog]:
+        timeout = self.__get_positive_seconds(config, SONAR_SCANNER_ENGINE_TIMEOUT)
+        inactivity_timeout = self.__get_positive_seconds(config, SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT)
+        if timeout is None and inactivity_timeout is None:
+            return None
+        return EngineWatchdog(timeout, inactivity_timeout)
+
+    def __get_positive_seconds(self, config: dict[str, Any], key: str) -> Optional[float]:
+        value = config.get(key)
+        if value is None:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = 0.0
+        if seconds <= 0:
+            logging.warning(f"Invalid value '{value}' for {key}, expected a positive number of seconds. It is ignored.")
+            return None
+        return seconds
+
+    def __enable_engine_debug_logs(self, config: dict[str, Any]) -> dict[str, Any]:
+        # The capture is only useful with the full trace; the console listener still filters on the scanner log level
+        if config.get(SONAR_VERBOSE) or config.get(SONAR_LOG_LEVEL):
+            return config
+        return {**config, SONAR_LOG_LEVEL: "DEBUG"}
+
+    def __get_heap_options(self, config: dict[str, Any], java_opts: Optional[str], concurrent_runs: int) -> list[str]:
+        heap_size = config.get(SONAR_SCANNER_JAVA_HEAP_SIZE)
+        if heap_size:
+            return [f"-Xmx{normalize_heap_size(str(heap_size))}"]
+        if java_opts and any(opt in java_opts for opt in ("-Xmx", "MaxRAMPercentage", "MaxRAM=")):
+            return []
+        memory_limit = cgroups.get_memory_limit()
+        if memory_limit is None:
+            logging.debug("No container memory limit detected; the JVM default maximum heap size is used")
+            return []
+        limit_mb = memory_limit // (1024 * 1024)
+        share_mb = limit_mb // concurrent_runs
+        heap_mb = min(int(share_mb * HEAP_SHARE_OF_MEMORY_LIMIT), share_mb - MIN_NON_HEAP_MEMORY_MB)
+        shared = f", shared by {concurrent_runs} concurrent engines" if concurrent_runs > 1 else ""
+        if heap_mb < MIN_HEAP_SIZE_MB:
+            logging.info(
+                f"The container memory limit of {limit_mb} MB{shared} is too low to size the JVM heap; "
+                "the JVM default is used"
+            )
+            return []
+        logging.info(
+            f"Setting the maximum JVM heap size to {heap_mb} MB based on the container memory limit of {limit_mb} MB"
+            f"{shared}. Set {SONAR_SCANNER_JAVA_HEAP_SIZE} to override it."
+        )
+        return [f"-Xmx{heap_mb}m"]
+
+    def __apply_cpu_limit(
+        self, config: dict[str, Any], java_opts: Optional[str], concurrent_runs: int
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        Match the analysis threads and the processors seen by the JVM to the CPUs actually available to the process,
+        which can be much fewer than the host cores when a cgroup CPU quota or a CPU affinity is set, or when several
+        engines run at the same time.
+        """
+        available_cpus = cgroups.get_available_cpus()
+        engine_cpus = max(1, available_cpus // concurrent_runs)
+        if engine_cpus >= (os.cpu_count() or 1):
+            return config, []
+        cpu_options = []
+        if not java_opts or "ActiveProcessorCount" not in java_opts:
+            cpu_options.append(f"-XX:ActiveProcessorCount={engine_cpus}")
+        parallel = str(config.get(SONAR_PYTHON_ANALYSIS_PARALLEL, True)).lower() != "false"
+        if parallel and config.get(SONAR_PYTHON_ANALYSIS_THREADS) is None:
+            config = {**config, SONAR_PYTHON_ANALYSIS_THREADS: engine_cpus}
+        if concurrent_runs > 1:
+            availability = (
+                f"{available_cpus} of the {os.cpu_count()} CPUs of the host are shared by {concurrent_runs} engines"
+            )
+        else:
+            availability = f"Only {available_cpus} of the {os.cpu_count()} CPUs of the host are available"
+        logging.info(
+            f"{availability}; the analysis is limited to {engine_cpus} CPUs. "
+            f"Set {SONAR_PYTHON_ANALYSIS_THREADS} to override it."
+        )
+        return config, cpu_options
+
+    def __get_profile_options(self, config: dict[str, Any], java_opts: Optional[str]) -> list[str]:
+        profile = jvm_profiles.select_profile(config)
+        if profile is None:
+            return []
+        java_version = read_release_java_version(get_java_home(self.jre_path.path))
+        options = jvm_profiles.get_profile_options(profile, java_version, java_opts)
+        logging.info(f"Using the {profile} JVM profile: {' '.join(options) or 'no applicable option'}")
+        return options
+
+    def __get_cds_archive(self, config: dict[str, Any], java_opts: Optional[str]) -> Optional[ClassDataSharingArchive]:
+        if self.cache is None or str(config.get(SONAR_SCANNER_CLASS_DATA_SHARING, False)).lower() != "true":
+            return None
+        if java_opts and any(opt in java_opts for opt in ("SharedArchiveFile", "ArchiveClassesAtExit", "-Xshare")):
+            logging.debug("Class data sharing is configured through the Java options; no archive is managed")
+            return None
+        return ClassDataSharingArchive.create(self.cache, self.jre_path, self.scanner_engine_path)
 
     def __build_command(
         self,
         jre_path: JREResolvedPath,
         scanner_engine_path: pathlib.Path,
         java_opts: Optional[str] = None,
+        jvm_options: Optional[list[str]] = None,
     ) -> list[str]:
         cmd: list[str] = []
         cmd.append(str(jre_path.path))
 
+        if jvm_options:
+            cmd.extend(jvm_options)
+
         if java_opts:
             cmd.extend(self.__decompose_java_opts(java_opts))
 
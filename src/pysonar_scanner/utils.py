@@ -21,10 +21,13 @@ import hashlib
 import pathlib
 import platform
 import sys
-import tarfile
 import typing
 from enum import Enum
 
+from pysonar_scanner.configuration.properties import SONAR_PROJECT_BASE_DIR, SONAR_WORKING_DIRECTORY
+
+DEFAULT_WORKING_DIRECTORY = ".scannerwork"
+
 OsStr = typing.Literal["windows", "linux", "mac", "alpine", "other"]
 ArchStr = typing.Literal["x64", "aarch64", "other"]
 
@@ -89,11 +92,19 @@ def get_arch() -> Arch:
     return Arch.OTHER
 
 
+def get_working_directory(config: dict[str, typing.Any]) -> pathlib.Path:
+    """Return the working directory of the analysis, which is relative to the project base directory by default."""
+    base_dir = pathlib.Path(config.get(SONAR_PROJECT_BASE_DIR) or ".")
+    return base_dir / (config.get(SONAR_WORKING_DIRECTORY) or DEFAULT_WORKING_DIRECTORY)
+
+
 def filter_none_values(dictionary: dict) -> dict:
     return {k: v for k, v in dictionary.items() if v is not None}
 
 
 def extract_tar(path: pathlib.Path, target_dir: pathlib.Path):
+    import tarfile
+
     with tarfile.open(path, "r:gz") as tar_ref:
         if sys.version_info >= (3, 12):
             tar_ref.extractall(target_dir, filter="data")
@@ -32,6 +32,7 @@ from pysonar_scanner.configuration.properties import (
     SONAR_PROJECT_KEY,
     SONAR_PROJECT_BASE_DIR,
     PROPERTIES,
+    get_property_index,
 )
 
 
@@ -105,3 +106,17 @@ class TestProperties(unittest.TestCase):
                     expected_env_name,
                     f"Failed to convert {name} to environment variable name, got {prop.env_variable_name()}",
                 )
+
+    def test_property_index(self):
+        index = get_property_index()
+        self.assertIs(index, get_property_index())
+        self.assertEqual(set(index.by_name), {prop.name for prop in PROPERTIES})
+        for prop in PROPERTIES:
+            self.assertEqual(index.by_name[prop.name].name, prop.name)
+            self.assertEqual(index.by_python_name[prop.python_name()].name, prop.name)
+            self.assertEqual(index.by_env_variable_name[prop.env_variable_name()].name, prop.name)
+        self.assertEqual(list(index.cli_getters), list(dict.fromkeys(p.name for p in PROPERTIES if p.cli_getter)))
+
+    def test_property_index_is_read_only(self):
+        with self.assertRaises(TypeError):
+            get_property_index().by_name["sonar.unknown"] = Property(name="sonar.unknown", default_value=None)
@@ -18,6 +18,7 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
 import logging
+import queue
 import unittest
 
 import pytest
@@ -31,7 +32,13 @@ class TestAppLogging(unittest.TestCase):
         self.capsys = capsys
 
     def setUp(self) -> None:
+        root_logger = logging.getLogger()
+        handlers = list(root_logger.handlers)
         app_logging.setup()
+        # The console handlers write to the streams captured for this test only
+        for handler in root_logger.handlers:
+            if handler not in handlers:
+                self.addCleanup(root_logger.removeHandler, handler)
 
     def test_logging_output_destinations(self):
         logging.info("hello world")
@@ -42,3 +49,59 @@ class TestAppLogging(unittest.TestCase):
         self.assertIn("ERROR: boom!", captured.err)
         self.assertEqual(len(captured.err.splitlines()), 1)
         self.assertEqual(len(captured.out.splitlines()), 1)
+
+    def test_log_prefix(self):
+        logging.warning("hello world", extra={"log_prefix": "[api] "})
+
+        self.assertIn("WARNING: [api] hello world", self.capsys.readouterr().out)
+
+
+class TestAsyncLogging(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def set_capsys(self, capsys):
+        self.capsys = capsys
+
+    def setUp(self) -> None:
+        app_logging.setup()
+        app_logging.configure_logging_level(verbose=True)
+        self.addCleanup(app_logging.configure_logging_level, verbose=False)
+        self.addCleanup(app_logging.shutdown)
+
+    def test_logs_are_written_on_flush(self):
+        app_logging.enable_async_logging()
+        logging.info("hello world")
+        logging.error("boom!")
+        app_logging.flush()
+
+        captured = self.capsys.readouterr()
+        self.assertIn("INFO: hello world", captured.out)
+        self.assertIn("ERROR: boom!", captured.err)
+
+    def test_shutdown_restores_synchronous_logging(self):
+        app_logging.enable_async_logging()
+        app_logging.shutdown()
+        logging.info("hello world")
+
+        self.assertIn("INFO: hello world", self.capsys.readouterr().out)
+        self.assertFalse(any(isinstance(h, app_logging.DroppingQueueHandler) for h in logging.getLogger().handlers))
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    def __record(self, level: int, msg: str) -> logging.LogRecord:
+        return logging.makeLogRecord({"levelno": level, "levelname": logging.getLevelName(level), "msg": msg})
+
+    def test_debug_records_are_dropped_when_full(self):
+        log_queue: queue.Queue = queue.Queue(maxsize=2)
+        handler = app_logging.DroppingQueueHandler(log_queue)
+
+        for i in range(5):
+            handler.handle(self.__record(logging.DEBUG, f"debug {i}"))
+        self.assertEqual(handler.dropped_records, 3)
+
+        log_queue.get_nowait()
+        log_queue.get_nowait()
+        handler.handle(self.__record(logging.INFO, "info"))
+
+        messages = [log_queue.get_nowait().getMessage(), log_queue.get_nowait().getMessage()]
+        self.assertEqual(messages, ["3 DEBUG log lines were dropped because the console could not keep up", "info"])
+        self.assertEqual(handler.dropped_records, 0)
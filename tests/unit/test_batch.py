@@ -0,0 +1,227 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import io
+import logging
+import pathlib
+import signal
+import tempfile
+import threading
+from typing import Any
+from unittest.mock import Mock
+
+from pyfakefs import fake_filesystem_unittest as pyfakefs
+
+from pysonar_scanner import batch
+from pysonar_scanner.batch import BatchRunner, discover_projects, get_project_directories, get_workers
+from pysonar_scanner.configuration.properties import (
+    SONAR_PROJECT_BASE_DIR,
+    SONAR_PROJECT_KEY,
+    SONAR_SCANNER_BATCH_PROJECTS,
+    SONAR_SCANNER_BATCH_WORKERS,
+)
+from pysonar_scanner.exceptions import InconsistentConfiguration
+
+ROOT = "/repo"
+
+
+class TestProjectDirectories(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.root = pathlib.Path(ROOT)
+        for path in [
+            "pyproject.toml",
+            "services/api/pyproject.toml",
+            "services/api/plugins/pyproject.toml",
+            "services/worker/sonar-project.properties",
+            "libs/core/src/core/__init__.py",
+            "libs/core/pyproject.toml",
+            "docs/index.md",
+            "node_modules/package/pyproject.toml",
+            ".venv/lib/pyproject.toml",
+        ]:
+            self.fs.create_file(self.root / path)
+
+    def test_discover_projects(self):
+        self.assertEqual(
+            discover_projects(self.root),
+            [self.root / "libs/core", self.root / "services/api", self.root / "services/worker"],
+        )
+
+    def test_listed_projects(self):
+        config = {
+            SONAR_PROJECT_BASE_DIR: ROOT,
+            SONAR_SCANNER_BATCH_PROJECTS: "services/api, libs/core,services/api",
+        }
+        self.assertEqual(get_project_directories(config), [self.root / "services/api", self.root / "libs/core"])
+
+    def test_discovered_projects(self):
+        config = {SONAR_PROJECT_BASE_DIR: ROOT, SONAR_SCANNER_BATCH_PROJECTS: "auto"}
+        self.assertEqual(len(get_project_directories(config)), 3)
+
+    def test_missing_project(self):
+        config = {SONAR_PROJECT_BASE_DIR: ROOT, SONAR_SCANNER_BATCH_PROJECTS: "services/api,services/missing"}
+        with self.assertRaises(InconsistentConfiguration) as context:
+            get_project_directories(config)
+        self.assertIn("/repo/services/missing", str(context.exception))
+
+    def test_workers(self):
+        self.assertEqual(get_workers({}), 1)
+        self.assertEqual(get_workers({SONAR_SCANNER_BATCH_WORKERS: 4}), 4)
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertEqual(get_workers({SONAR_SCANNER_BATCH_WORKERS: "many"}), 1)
+        self.assertIn("Invalid value 'many'", logs.output[0])
+
+
+class TestBatchRunner(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.root = pathlib.Path(ROOT)
+        self.project_dirs = [self.root / "api", self.root / "worker", self.root / "broken"]
+        for project_dir in self.project_dirs:
+            self.fs.create_dir(project_dir)
+
+    def __load_configuration(self, project_dir: pathlib.Path) -> dict[str, Any]:
+        if project_dir.name == "broken":
+            raise InconsistentConfiguration("The configuration of broken is invalid")
+        return {SONAR_PROJECT_BASE_DIR: str(project_dir), SONAR_PROJECT_KEY: project_dir.name}
+
+    def __runner(self, run, workers: int = 1) -> BatchRunner:
+        scanner = Mock()
+        scanner.run.side_effect = run
+        return BatchRunner(scanner, self.__load_configuration, self.root, workers)
+
+    def test_run(self):
+        def run(config, signal_forwarder, concurrent_runs):
+            logging.info(f"Analyzing {config[SONAR_PROJECT_KEY]}")
+            return 0 if config[SONAR_PROJECT_KEY] == "api" else 3
+
+        runner = self.__runner(run)
+        with self.assertLogs(level="INFO") as logs:
+            returncode = runner.run(self.project_dirs)
+
+        self.assertEqual(returncode, 3)
+        self.assertEqual(runner.scanner.run.call_count, 2)
+        project_records = [(getattr(record, "project", None), record.getMessage()) for record in logs.records]
+        self.assertIn(("api", "Analyzing api"), project_records)
+        self.assertIn(("broken", "The configuration of broken is invalid"), project_records)
+        api_logs = (self.root / "api/.scannerwork" / batch.PROJECT_LOG_FILENAME).read_text()
+        self.assertIn("INFO: Analyzing api", api_logs)
+        self.assertNotIn("worker", api_logs)
+        worker_logs = (self.root / "worker/.scannerwork" / batch.PROJECT_LOG_FILENAME).read_text()
+        self.assertIn("INFO: Analyzing worker", worker_logs)
+        broken_logs = (self.root / "broken/.scannerwork" / batch.PROJECT_LOG_FILENAME).read_text()
+        self.assertIn("ERROR: The configuration of broken is invalid", broken_logs)
+        summary = next(line for line in logs.output if "Batch analysis results" in line)
+        self.assertRegex(summary, r"\n\s+0\s+\d+\.\d s  api \(/repo/api/.scannerwork/pysonar.log\)")
+        self.assertRegex(summary, r"\n\s+3\s+\d+\.\d s  worker")
+        self.assertRegex(summary, r"\n\s+1\s+\d+\.\d s  broken")
+        self.assertIn("ERROR:root:The analysis of 2 of 3 projects failed", logs.output)
+        self.assertEqual(list(pathlib.Path(tempfile.gettempdir()).glob("pysonar-*.log")), [])
+
+    def test_projects_run_concurrently(self):
+        # Each analysis waits for the other one: they only complete when run at the same time
+        barrier = threading.Barrier(2, timeout=10)
+
+        def run(config, signal_forwarder, concurrent_runs):
+            barrier.wait()
+            logging.info(f"Analyzing {config[SONAR_PROJECT_KEY]}")
+            return 0
+
+        runner = self.__runner(run, workers=2)
+        with self.assertLogs(level="INFO"):
+            returncode = runner.run(self.project_dirs[:2])
+
+        self.assertEqual(returncode, 0)
+        for project_dir in self.project_dirs[:2]:
+            logs = (project_dir / ".scannerwork" / batch.PROJECT_LOG_FILENAME).read_text()
+            self.assertIn(f"Analyzing {project_dir.name}", logs)
+            other_project = "worker" if project_dir.name == "api" else "api"
+            self.assertNotIn(f"Analyzing {other_project}", logs)
+
+    def test_signal_forwarder_is_shared(self):
+        runner = self.__runner(lambda config, signal_forwarder, concurrent_runs: 0)
+        with self.assertLogs(level="INFO"):
+            runner.run(self.project_dirs[:2])
+
+        for call in runner.scanner.run.call_args_list:
+            self.assertIs(call.args[1], runner.signal_forwarder)
+
+    def test_engines_share_the_machine_with_the_concurrent_analyses(self):
+        runner = self.__runner(lambda config, signal_forwarder, concurrent_runs: 0, workers=4)
+        with self.assertLogs(level="INFO"):
+            runner.run(self.project_dirs[:2])
+
+        self.assertEqual([call.args[2] for call in runner.scanner.run.call_args_list], [2, 2])
+
+    def test_remaining_projects_are_skipped_when_cancelled(self):
+        def run(config, signal_forwarder, concurrent_runs):
+            signal_forwarder.received_signal = signal.SIGTERM
+            return 128 + signal.SIGTERM
+
+        runner = self.__runner(run)
+        with self.assertLogs(level="INFO") as logs:
+            returncode = runner.run(self.project_dirs)
+
+        self.assertEqual(returncode, 128 + signal.SIGTERM)
+        runner.scanner.run.assert_called_once()
+        self.assertIn("WARNING:root:The analysis of worker was skipped: the batch analysis was cancelled", logs.output)
+
+    def test_configurations_are_loaded_before_the_analyses(self):
+        events = []
+
+        def load_configuration(project_dir: pathlib.Path) -> dict[str, Any]:
+            events.append(f"load {project_dir.name}")
+            return {SONAR_PROJECT_BASE_DIR: str(project_dir), SONAR_PROJECT_KEY: project_dir.name}
+
+        def run(config, signal_forwarder, concurrent_runs):
+            events.append(f"run {config[SONAR_PROJECT_KEY]}")
+            return 0
+
+        scanner = Mock()
+        scanner.run.side_effect = run
+        with self.assertLogs(level="INFO"):
+            BatchRunner(scanner, load_configuration, self.root, workers=2).run(self.project_dirs[:2])
+
+        self.assertEqual(events[:2], ["load api", "load worker"])
+        self.assertEqual(sorted(events[2:]), ["run api", "run worker"])
+
+    def test_records_of_child_loggers_are_routed_and_prefixed_once(self):
+        console = io.StringIO()
+        console_handler = logging.StreamHandler(console)
+        console_handler.setFormatter(
+            logging.Formatter("%(levelname)s: %(log_prefix)s%(message)s", defaults={"log_prefix": ""})
+        )
+
+        def run(config, signal_forwarder, concurrent_runs):
+            logging.getLogger("pysonar_scanner.scannerengine").info("Engine started for %s", config[SONAR_PROJECT_KEY])
+            return 0
+
+        with self.assertLogs(level="INFO"):
+            # assertLogs replaces the handlers of the root logger while it is active
+            logging.getLogger().addHandler(console_handler)
+            self.__runner(run).run(self.project_dirs[:1])
+
+        self.assertIn("INFO: [api] Engine started for api\n", console.getvalue())
+        self.assertNotIn("[api] [api]", console.getvalue())
+        self.assertIn("Analyzing 1 projects", console.getvalue())
+        self.assertNotIn("[api] Analyzing 1 projects", console.getvalue())
+        api_logs = (self.root / "api/.scannerwork" / batch.PROJECT_LOG_FILENAME).read_text()
+        self.assertIn("INFO: Engine started for api", api_logs)
+        self.assertNotIn("[api]", api_logs)
@@ -0,0 +1,95 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+from unittest.mock import patch
+
+import pyfakefs.fake_filesystem_unittest as pyfakefs
+
+from pysonar_scanner import cgroups
+
+
+class TestMemoryLimit(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+
+    def test_no_cgroup(self):
+        self.assertIsNone(cgroups.get_memory_limit())
+
+    def test_cgroup_v2(self):
+        self.fs.create_file("/proc/self/cgroup", contents="0::/\n")
+        self.fs.create_file("/sys/fs/cgroup/memory.max", contents="2147483648\n")
+        self.assertEqual(cgroups.get_memory_limit(), 2147483648)
+
+    def test_cgroup_v2_nested(self):
+        self.fs.create_file("/proc/self/cgroup", contents="0::/ci/job\n")
+        self.fs.create_file("/sys/fs/cgroup/ci/job/memory.max", contents="1073741824\n")
+        self.assertEqual(cgroups.get_memory_limit(), 1073741824)
+
+    def test_cgroup_v2_unlimited(self):
+        self.fs.create_file("/proc/self/cgroup", contents="0::/\n")
+        self.fs.create_file("/sys/fs/cgroup/memory.max", contents="max\n")
+        self.assertIsNone(cgroups.get_memory_limit())
+
+    def test_cgroup_v1(self):
+        self.fs.create_file("/proc/self/cgroup", contents="5:cpu,cpuacct:/\n4:memory:/docker/abc\n")
+        self.fs.create_file("/sys/fs/cgroup/memory/memory.limit_in_bytes", contents="536870912\n")
+        self.assertEqual(cgroups.get_memory_limit(), 536870912)
+
+    def test_cgroup_v1_unlimited(self):
+        self.fs.create_file("/proc/self/cgroup", contents="4:memory:/\n")
+        self.fs.create_file("/sys/fs/cgroup/memory/memory.limit_in_bytes", contents="9223372036854771712\n")
+        self.assertIsNone(cgroups.get_memory_limit())
+
+
+class TestCpuLimit(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+
+    def test_no_cgroup(self):
+        self.assertIsNone(cgroups.get_cpu_limit())
+
+    def test_cgroup_v2(self):
+        self.fs.create_file("/proc/self/cgroup", contents="0::/\n")
+        self.fs.create_file("/sys/fs/cgroup/cpu.max", contents="150000 100000\n")
+        self.assertEqual(cgroups.get_cpu_limit(), 1.5)
+
+    def test_cgroup_v2_unlimited(self):
+        self.fs.create_file("/proc/self/cgroup", contents="0::/\n")
+        self.fs.create_file("/sys/fs/cgroup/cpu.max", contents="max 100000\n")
+        self.assertIsNone(cgroups.get_cpu_limit())
+
+    def test_cgroup_v1(self):
+        self.fs.create_file("/proc/self/cgroup", contents="5:cpu,cpuacct:/\n")
+        self.fs.create_file("/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_quota_us", contents="200000\n")
+        self.fs.create_file("/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_period_us", contents="100000\n")
+        self.assertEqual(cgroups.get_cpu_limit(), 2)
+
+    def test_cgroup_v1_unlimited(self):
+        self.fs.create_file("/proc/self/cgroup", contents="5:cpu,cpuacct:/\n")
+        self.fs.create_file("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", contents="-1\n")
+        self.fs.create_file("/sys/fs/cgroup/cpu/cpu.cfs_period_us", contents="100000\n")
+        self.assertIsNone(cgroups.get_cpu_limit())
+
+    @patch("os.cpu_count", return_value=16)
+    @patch("os.sched_getaffinity", return_value=set(range(8)), create=True)
+    def test_available_cpus(self, *args):
+        with patch("pysonar_scanner.cgroups.get_cpu_limit", return_value=None):
+            self.assertEqual(cgroups.get_available_cpus(), 8)
+        with patch("pysonar_scanner.cgroups.get_cpu_limit", return_value=1.5):
+            self.assertEqual(cgroups.get_available_cpus(), 2)
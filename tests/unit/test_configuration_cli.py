@@ -41,6 +41,7 @@ from pysonar_scanner.configuration.properties import (
     SONAR_SCANNER_JAVA_EXE_PATH,
     SONAR_SCANNER_JAVA_OPTS,
     SONAR_SCANNER_JAVA_HEAP_SIZE,
+    SONAR_SCANNER_CLASS_DATA_SHARING,
     SONAR_SCANNER_KEYSTORE_PASSWORD,
     SONAR_SCANNER_KEYSTORE_PATH,
     SONAR_SCANNER_OS,
@@ -50,6 +51,23 @@ from pysonar_scanner.configuration.properties import (
     SONAR_SCANNER_PROXY_USER,
     SONAR_SCANNER_RESPONSE_TIMEOUT,
     SONAR_SCANNER_SKIP_JRE_PROVISIONING,
+    SONAR_SCANNER_USE_SYSTEM_JRE,
+    SONAR_SCANNER_ASYNC_LOGGING,
+    SONAR_SCANNER_ENGINE_LOG_CAPTURE,
+    SONAR_SCANNER_SENSOR_TIMINGS,
+    SONAR_SCANNER_PROFILE_JVM,
+    SONAR_SCANNER_JVM_PROFILE,
+    SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL,
+    SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES,
+    SONAR_SCANNER_ENGINE_TIMEOUT,
+    SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT,
+    SONAR_SCANNER_ENGINE_NICENESS,
+    SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS,
+    SONAR_SCANNER_ENGINE_CPU_AFFINITY,
+    SONAR_SCANNER_CONFIGURATION_SNAPSHOT,
+    SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT,
+    SONAR_SCANNER_BATCH_PROJECTS,
+    SONAR_SCANNER_BATCH_WORKERS,
     SONAR_SCANNER_SOCKET_TIMEOUT,
     SONAR_SCANNER_SONARCLOUD_URL,
     SONAR_SCANNER_TRUSTSTORE_PASSWORD,
@@ -127,9 +145,27 @@ EXPECTED_CONFIGURATION = {
     SONAR_SCANNER_PROXY_USER: "mySonarScannerProxyUser",
     SONAR_SCANNER_PROXY_PASSWORD: "mySonarScannerProxyPassword",
     SONAR_SCANNER_SKIP_JRE_PROVISIONING: True,
+    SONAR_SCANNER_USE_SYSTEM_JRE: True,
+    SONAR_SCANNER_ASYNC_LOGGING: True,
+    SONAR_SCANNER_ENGINE_LOG_CAPTURE: "gzip",
+    SONAR_SCANNER_SENSOR_TIMINGS: True,
+    SONAR_SCANNER_PROFILE_JVM: "profile",
+    SONAR_SCANNER_JVM_PROFILE: "throughput",
+    SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL: 0.5,
+    SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES: True,
+    SONAR_SCANNER_ENGINE_TIMEOUT: 3600,
+    SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT: 600,
+    SONAR_SCANNER_ENGINE_NICENESS: 10,
+    SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS: "idle",
+    SONAR_SCANNER_ENGINE_CPU_AFFINITY: "0-3,6",
+    SONAR_SCANNER_CONFIGURATION_SNAPSHOT: True,
+    SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT: True,
+    SONAR_SCANNER_BATCH_PROJECTS: "services/api,services/worker",
+    SONAR_SCANNER_BATCH_WORKERS: 2,
     SONAR_SCANNER_JAVA_EXE_PATH: "mySonarScannerJavaExePath",
     SONAR_SCANNER_JAVA_OPTS: "mySonarScannerJavaOpts",
     SONAR_SCANNER_JAVA_HEAP_SIZE: "8000Mb",
+    SONAR_SCANNER_CLASS_DATA_SHARING: True,
     SONAR_SCANNER_METADATA_FILEPATH: "myMetadataFilepath",
     SONAR_REGION: "us",
     SONAR_ORGANIZATION: "mySonarOrganization",
@@ -291,6 +327,11 @@ class TestCliConfigurationLoader(unittest.TestCase):
                 }
                 self.assertDictEqual(configuration, expected_configuration)
 
+    @patch("sys.argv", ["myscript.py", "-t", "myToken", "--sonar-project-key", "myProjectKey", "--profile-jvm"])
+    def test_profile_jvm_default_settings(self):
+        configuration = CliConfigurationLoader.load()
+        self.assertEqual(configuration[SONAR_SCANNER_PROFILE_JVM], "default")
+
     @patch(
         "sys.argv",
         ["myscript.py", "-t", "myToken", "--sonar-project-key", "myProjectKey", "--sonar-scanner-os", "windows2"],
@@ -339,6 +380,35 @@ class TestCliConfigurationLoader(unittest.TestCase):
             "--sonar-scanner-arch",
             "x64",
             "--skip-jre-provisioning",
+            "--use-system-jre",
+            "--sonar-scanner-async-logging",
+            "--sonar-scanner-engine-log-capture",
+            "gzip",
+            "--sonar-scanner-sensor-timings",
+            "--sonar-scanner-resource-sampling-interval",
+            "0.5",
+            "--sonar-scanner-resource-sampling-time-series",
+            "--sonar-scanner-engine-timeout",
+            "3600",
+            "--sonar-scanner-engine-inactivity-timeout",
+            "600",
+            "--sonar-scanner-engine-niceness",
+            "10",
+            "--sonar-scanner-engine-io-priority-class",
+            "idle",
+            "--sonar-scanner-engine-cpu-affinity",
+            "0-3,6",
+            "--sonar-scanner-configuration-snapshot",
+            "--sonar-scanner-configuration-sources-report",
+            "--sonar-scanner-batch-projects",
+            "services/api,services/worker",
+            "--sonar-scanner-batch-workers",
+            "2",
+            "--sonar-scanner-class-data-sharing",
+            "--profile-jvm",
+            "profile",
+            "--sonar-scanner-jvm-profile",
+            "throughput",
             "--sonar-scanner-java-exe-path",
             "mySonarScannerJavaExePath",
             "--sonar-scanner-java-opts",
@@ -478,6 +548,24 @@ class TestCliConfigurationLoader(unittest.TestCase):
             "-Dsonar.scanner.proxyUser=mySonarScannerProxyUser",
             "-Dsonar.scanner.proxyPassword=mySonarScannerProxyPassword",
             "-Dsonar.scanner.skipJreProvisioning",
+            "-Dsonar.scanner.useSystemJre",
+            "-Dsonar.scanner.asyncLogging",
+            "-Dsonar.scanner.engineLogCapture=gzip",
+            "-Dsonar.scanner.sensorTimings",
+            "-Dsonar.scanner.resourceSamplingInterval=0.5",
+            "-Dsonar.scanner.resourceSamplingTimeSeries",
+            "-Dsonar.scanner.engineTimeout=3600",
+            "-Dsonar.scanner.engineInactivityTimeout=600",
+            "-Dsonar.scanner.engineNiceness=10",
+            "-Dsonar.scanner.engineIoPriorityClass=idle",
+            "-Dsonar.scanner.engineCpuAffinity=0-3,6",
+            "-Dsonar.scanner.configurationSnapshot",
+            "-Dsonar.scanner.configurationSourcesReport",
+            "-Dsonar.scanner.batchProjects=services/api,services/worker",
+            "-Dsonar.scanner.batchWorkers=2",
+            "-Dsonar.scanner.classDataSharing",
+            "-Dsonar.scanner.profileJvm=profile",
+            "-Dsonar.scanner.jvmProfile=throughput",
             "-Dsonar.scanner.javaExePath=mySonarScannerJavaExePath",
             "-Dsonar.scanner.javaOpts=mySonarScannerJavaOpts",
             "-Dsonar.scanner.metadataFilepath=myMetadataFilepath",
@@ -662,3 +750,46 @@ class TestCliConfigurationLoader(unittest.TestCase):
             "sonar.unknown.property": "some_value=another_value",
         }
         self.assertDictEqual(configuration, expected_configuration)
+
+    def test_analysis_properties_mixed_with_options(self):
+        argv = [
+            "-Dsonar.custom.first=1",
+            "-Dsonar.token=myToken",
+            "-Dsonar.custom.flag",
+            "--sonar-project-key",
+            "myProjectKey",
+            "-Dsonar.custom.first=2",
+        ]
+        configuration = CliConfigurationLoader.load(argv)
+        expected_configuration = {
+            SONAR_TOKEN: "myToken",
+            SONAR_PROJECT_KEY: "myProjectKey",
+            "sonar.custom.first": "2",
+            "sonar.custom.flag": "true",
+        }
+        self.assertDictEqual(configuration, expected_configuration)
+
+    def test_abbreviated_jvm_style_option(self):
+        configuration = CliConfigurationLoader.load(["-Dsonar.tok", "myToken", "-Dsonar.projectKey=myProjectKey"])
+        self.assertDictEqual(configuration, {SONAR_TOKEN: "myToken", SONAR_PROJECT_KEY: "myProjectKey"})
+
+    def test_java_opts_given_as_separate_argument(self):
+        configuration = CliConfigurationLoader.load(
+            ["--sonar-scanner-java-opts", "-Dhttp.proxyHost=x -Dhttp.proxyPort=y", "-Dsonar.custom=1"]
+        )
+        self.assertEqual(configuration[SONAR_SCANNER_JAVA_OPTS], "-Dhttp.proxyHost=x -Dhttp.proxyPort=y")
+        self.assertEqual(configuration["sonar.custom"], "1")
+        self.assertNotIn("http.proxyHost", configuration)
+
+    def test_option_is_not_taken_as_a_value(self):
+        with self.assertRaises(SystemExit):
+            CliConfigurationLoader.load(["--token", "-Dsonar.projectKey=myProjectKey"])
+
+    def test_analysis_property_is_not_taken_as_a_value(self):
+        for argv in (["--sonar-project-key", "-Dfoo"], ["-Dsonar.scanner.javaOpts", "-Dfoo=bar"]):
+            with self.subTest(argv=argv), self.assertRaises(SystemExit):
+                CliConfigurationLoader.load(argv)
+
+    def test_parser_is_built_once(self):
+        get_parser = CliConfigurationLoader._CliConfigurationLoader__get_parser
+        self.assertIs(get_parser(), get_parser())
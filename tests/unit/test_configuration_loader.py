@@ -55,6 +55,7 @@ from pysonar_scanner.configuration.properties import (
     SONAR_COVERAGE_EXCLUSIONS,
     SONAR_PYTHON_TEST_FILE_HEURISTIC_DISABLED,
 )
+from pysonar_scanner.configuration.provenance import ConfigurationProvenance
 from pysonar_scanner.utils import Arch, Os
 from pysonar_scanner.configuration.configuration_loader import ConfigurationLoader, SONAR_PROJECT_BASE_DIR
 from pysonar_scanner.exceptions import MissingPropertyException
@@ -163,6 +164,20 @@ class TestConfigurationLoader(pyfakefs.TestCase):
         }
         self.assertDictEqual(configuration, expected_configuration)
 
+    @patch("sys.argv", ["myscript.py", "--token", "myToken", "-Dapi.sonar.sources=app"])
+    def test_modules_are_expanded(self, mock_get_os, mock_get_arch):
+        self.fs.create_file("sonar-project.properties", contents="sonar.projectKey=my-project\nsonar.modules=api\n")
+        self.fs.create_file("api/sonar-project.properties", contents="sonar.sources=src\nsonar.projectName=API\n")
+        provenance = ConfigurationProvenance()
+
+        configuration = ConfigurationLoader.load(provenance)
+
+        self.assertEqual(configuration["api.sonar.projectName"], "API")
+        self.assertEqual(configuration["api.sonar.sources"], "app")
+        self.assertEqual(configuration["api.sonar.projectBaseDir"], os.path.abspath("api"))
+        self.assertEqual(provenance.sources["api.sonar.projectName"], "module configuration files")
+        self.assertEqual(provenance.sources["api.sonar.sources"], "command line")
+
     @patch(
         "sys.argv",
         [
@@ -660,6 +675,42 @@ class TestConfigurationLoader(pyfakefs.TestCase):
         self.assertEqual(configuration[SONAR_PROJECT_KEY], "ProjectKeyFromCLI")
         self.assertEqual(configuration[SONAR_TOKEN], "myToken")  # CLI overrides env var
 
+    @patch("sys.argv", ["myscript.py", "--token", "myToken", "-Dsonar.projectName=CLI Project"])
+    def test_provenance(self, mock_get_os, mock_get_arch):
+        self.fs.create_file(
+            "sonar-project.properties", contents="sonar.projectKey=properties-key\nsonar.projectName=P\n"
+        )
+        self.fs.create_file("pyproject.toml", contents='[tool.sonar]\nprojectKey = "toml-key"\n')
+        self.fs.create_dir("tests")
+        provenance = ConfigurationProvenance()
+
+        with patch.dict("os.environ", {"SONAR_HOST_URL": "https://sonar.env.example.com"}):
+            configuration = ConfigurationLoader.load(provenance)
+
+        self.assertEqual(set(provenance.sources), set(configuration))
+        self.assertEqual(provenance.sources[SONAR_TOKEN], "command line")
+        self.assertEqual(provenance.sources[SONAR_HOST_URL], "environment variables")
+        self.assertEqual(provenance.sources[SONAR_PROJECT_KEY], "pyproject.toml [tool.sonar]")
+        self.assertEqual(provenance.overridden_sources[SONAR_PROJECT_KEY], ["sonar-project.properties"])
+        self.assertEqual(provenance.sources[SONAR_PROJECT_NAME], "command line")
+        self.assertEqual(provenance.overridden_sources[SONAR_PROJECT_NAME], ["sonar-project.properties"])
+        self.assertEqual(provenance.sources[SONAR_TESTS], "test paths detection")
+        self.assertEqual(provenance.sources[SONAR_SOURCES], "inferred")
+        self.assertEqual(provenance.sources[SONAR_SCANNER_CONNECT_TIMEOUT], "static defaults")
+        self.assertEqual(provenance.sources[SONAR_SCANNER_OS], "dynamic defaults")
+        self.assertNotIn(SONAR_TOKEN, provenance.overridden_sources)
+        self.assertLessEqual(
+            {
+                "command line",
+                "environment variables",
+                "pyproject.toml",
+                ".coveragerc",
+                "sonar-project.properties",
+                "test paths detection",
+            },
+            set(provenance.durations_ms),
+        )
+
     @patch(
         "sys.argv",
         [
@@ -0,0 +1,173 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import json
+import os
+import pathlib
+from unittest.mock import patch
+
+import pyfakefs.fake_filesystem_unittest as pyfakefs
+
+from pysonar_scanner.configuration import configuration_snapshot
+from pysonar_scanner.configuration.configuration_loader import ConfigurationLoader
+from pysonar_scanner.configuration.configuration_snapshot import SNAPSHOT_FILENAME
+from pysonar_scanner.configuration.properties import (
+    SONAR_EXCLUSIONS,
+    SONAR_PROJECT_KEY,
+    SONAR_PROJECT_NAME,
+    SONAR_TESTS,
+    SONAR_TOKEN,
+)
+from pysonar_scanner.configuration.pyproject_toml import TomlConfigurationLoader
+from pysonar_scanner.utils import Arch, Os
+
+SNAPSHOT_ARGV = ["pysonar", "--token", "myToken", "--sonar-scanner-configuration-snapshot"]
+SNAPSHOT_PATH = pathlib.Path(".scannerwork") / SNAPSHOT_FILENAME
+
+
+@patch("pysonar_scanner.utils.get_arch", return_value=Arch.X64)
+@patch("pysonar_scanner.utils.get_os", return_value=Os.LINUX)
+class TestConfigurationSnapshot(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        env_patcher = patch.dict("os.environ", {}, clear=True)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        os.makedirs("/project/tests")
+        os.chdir("/project")
+        self.fs.create_file("pyproject.toml", contents='[tool.sonar]\nprojectKey = "my-project"\n')
+
+    def load(self, argv: list[str] = SNAPSHOT_ARGV) -> tuple[dict, int]:
+        """Load the configuration and return it with the number of times pyproject.toml was loaded."""
+        with patch("sys.argv", argv), patch.object(
+            TomlConfigurationLoader, "load", wraps=TomlConfigurationLoader.load
+        ) as toml_load:
+            return ConfigurationLoader.load(), toml_load.call_count
+
+    def test_disabled_by_default(self, *_):
+        self.load(["pysonar", "--token", "myToken"])
+        self.assertFalse(SNAPSHOT_PATH.exists())
+
+    def test_unchanged_project_is_not_parsed_again(self, *_):
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_PROJECT_KEY], "my-project")
+        self.assertEqual(configuration[SONAR_TESTS], "tests")
+        self.assertTrue(SNAPSHOT_PATH.exists())
+
+        snapshot_configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 0)
+        self.assertEqual(snapshot_configuration, configuration)
+
+    def test_command_line_and_environment_values_are_not_stored(self, *_):
+        with patch.dict("os.environ", {"SONAR_PROJECT_NAME": "My project"}):
+            configuration, _ = self.load(SNAPSHOT_ARGV + ["-Dsonar.exclusions=generated/**"])
+            snapshot_configuration, toml_loads = self.load(SNAPSHOT_ARGV + ["-Dsonar.exclusions=generated/**"])
+
+        self.assertEqual(toml_loads, 0)
+        self.assertEqual(snapshot_configuration[SONAR_TOKEN], "myToken")
+        self.assertEqual(snapshot_configuration[SONAR_PROJECT_NAME], "My project")
+        # Completed with the test directories, so stored
+        self.assertEqual(snapshot_configuration[SONAR_EXCLUSIONS], "generated/**,tests/**")
+        self.assertEqual(snapshot_configuration, configuration)
+        stored = json.loads(SNAPSHOT_PATH.read_text())["configuration"]
+        self.assertNotIn(SONAR_TOKEN, stored)
+        self.assertNotIn(SONAR_PROJECT_NAME, stored)
+        self.assertEqual(stored[SONAR_EXCLUSIONS], "generated/**,tests/**")
+
+    def test_changed_project_file_invalidates_the_snapshot(self, *_):
+        self.load()
+        pathlib.Path("pyproject.toml").write_text('[tool.sonar]\nprojectKey = "renamed-project"\n')
+
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_PROJECT_KEY], "renamed-project")
+
+    def test_new_project_file_invalidates_the_snapshot(self, *_):
+        self.load()
+        self.fs.create_file("sonar-project.properties", contents="sonar.projectName=My project\n")
+
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_PROJECT_NAME], "My project")
+
+    def test_changed_module_file_invalidates_the_snapshot(self, *_):
+        self.fs.create_file("sonar-project.properties", contents="sonar.modules=api\n")
+        self.fs.create_file("api/sonar-project.properties", contents="sonar.projectName=API\n")
+        self.load()
+        _, toml_loads = self.load()
+        self.assertEqual(toml_loads, 0)
+
+        pathlib.Path("api/sonar-project.properties").write_text("sonar.projectName=API service\n")
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 2)
+        self.assertEqual(configuration["api.sonar.projectName"], "API service")
+
+    def test_nested_test_directory_invalidates_the_snapshot(self, *_):
+        pathlib.Path("pyproject.toml").write_text(
+            '[tool.sonar]\nprojectKey = "my-project"\n[tool.pytest.ini_options]\ntestpaths = ["src/tests"]\n'
+        )
+        os.makedirs("src")
+        configuration, _ = self.load()
+        self.assertNotIn(SONAR_TESTS, configuration)
+
+        os.makedirs("src/tests")
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_TESTS], "src/tests")
+
+        # Adding a test file does not change the configuration
+        self.fs.create_file("src/tests/test_app.py")
+        _, toml_loads = self.load()
+        self.assertEqual(toml_loads, 0)
+
+        os.remove("src/tests/test_app.py")
+        os.rmdir("src/tests")
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertNotIn(SONAR_TESTS, configuration)
+
+    def test_changed_inputs_invalidate_the_snapshot(self, *_):
+        self.load()
+
+        configuration, toml_loads = self.load(SNAPSHOT_ARGV + ["-Dsonar.projectKey=cli-project"])
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_PROJECT_KEY], "cli-project")
+
+        with patch.dict("os.environ", {"SONAR_PROJECT_KEY": "env-project"}):
+            configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_PROJECT_KEY], "env-project")
+
+    def test_corrupted_snapshot_is_ignored(self, *_):
+        self.load()
+        SNAPSHOT_PATH.write_text("{not json")
+
+        configuration, toml_loads = self.load()
+        self.assertEqual(toml_loads, 1)
+        self.assertEqual(configuration[SONAR_PROJECT_KEY], "my-project")
+
+    def test_snapshot_is_preserved_when_the_working_directory_is_cleaned(self, *_):
+        self.load()
+        content = SNAPSHOT_PATH.read_bytes()
+
+        with configuration_snapshot.preserved(SNAPSHOT_PATH.parent):
+            SNAPSHOT_PATH.unlink()
+
+        self.assertEqual(SNAPSHOT_PATH.read_bytes(), content)
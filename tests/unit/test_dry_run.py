@@ -17,11 +17,14 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
+import json
+import os
 import platform
 import unittest
 from unittest.mock import patch
 
 import pyfakefs.fake_filesystem_unittest as pyfakefs
+from pyfakefs import helpers
 
 from pysonar_scanner.__main__ import run_dry_run
 from pysonar_scanner.configuration.properties import (
@@ -33,7 +36,9 @@ from pysonar_scanner.configuration.properties import (
     SONAR_PYTHON_COVERAGE_REPORT_PATHS,
     SONAR_PROJECT_BASE_DIR,
     SONAR_HOST_URL,
+    SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT,
 )
+from pysonar_scanner.configuration.provenance import ConfigurationProvenance
 from pysonar_scanner.dry_run_reporter import (
     DryRunReporter,
     CoverageReportValidator,
@@ -112,6 +117,22 @@ class TestDryRunReporter(unittest.TestCase):
         joined = " ".join(logged_messages)
         self.assertIn("N/A", joined)
 
+    @patch("pysonar_scanner.dry_run_reporter.logging")
+    def test_report_provenance(self, mock_logging):
+        provenance = ConfigurationProvenance()
+        provenance.record("static defaults", {"sonar.scanner.connectTimeout": 5})
+        provenance.record("sonar-project.properties", {SONAR_PROJECT_KEY: "properties-key"})
+        provenance.record("command line", {SONAR_PROJECT_KEY: "cli-key"})
+        provenance.durations_ms["command line"] = 1.5
+
+        DryRunReporter.report_provenance(provenance)
+
+        logged_messages = [c.args[0] for c in mock_logging.info.call_args_list]
+        self.assertIn("DRY RUN MODE - Configuration Sources", logged_messages)
+        self.assertIn("  command line: 1.5 ms", logged_messages)
+        self.assertIn("  sonar.projectKey: command line (overrides sonar-project.properties)", logged_messages)
+        self.assertFalse(any("connectTimeout" in message for message in logged_messages))
+
     @patch("pysonar_scanner.dry_run_reporter.logging")
     def test_report_validation_results_valid(self, mock_logging):
         result = ValidationResult()
@@ -323,3 +344,35 @@ class TestRunDryRun(pyfakefs.TestCase):
 
         mock_logging.info.assert_any_call("Running in DRY RUN mode")
         mock_logging.info.assert_any_call("No server connection will be made and no analysis will be submitted")
+
+    @patch("pysonar_scanner.__main__.logging")
+    def test_run_dry_run_writes_configuration_sources(self, mock_logging):
+        self.fs.create_dir("/project")
+        config = {SONAR_PROJECT_KEY: "my-project", SONAR_PROJECT_BASE_DIR: "/project"}
+        config[SONAR_SCANNER_CONFIGURATION_SOURCES_REPORT] = True
+        provenance = ConfigurationProvenance()
+        provenance.record("command line", {SONAR_PROJECT_KEY: "my-project"})
+
+        run_dry_run(config, provenance)
+
+        with open("/project/.scannerwork/configuration-sources.json") as f:
+            report = json.load(f)
+        self.assertEqual(report["properties"], {SONAR_PROJECT_KEY: {"source": "command line", "overriddenSources": []}})
+
+    @patch("pysonar_scanner.__main__.logging")
+    def test_run_dry_run_in_read_only_directory(self, mock_logging):
+        self.fs.create_dir("/project")
+        self.fs.chmod("/project", mode=0o555, force_unix_mode=True)
+        # As root, the permissions of the fake file system would not be enforced
+        helpers.set_uid(1000)
+        self.addCleanup(helpers.reset_ids)
+        config = {SONAR_PROJECT_KEY: "my-project", SONAR_PROJECT_BASE_DIR: "/project"}
+        provenance = ConfigurationProvenance()
+        provenance.record("command line", {SONAR_PROJECT_KEY: "my-project"})
+
+        with self.assertLogs(level="INFO") as logs:
+            exit_code = run_dry_run(config, provenance)
+
+        self.assertEqual(exit_code, 0)
+        self.assertFalse(os.path.exists("/project/.scannerwork"))
+        self.assertFalse(any("configuration sources" in line for line in logs.output))
@@ -0,0 +1,109 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from pysonar_scanner.engine_timings import PHASE, SENSOR, Timing, TimingProfiler, parse_timing
+from pysonar_scanner.scannerengine import LogLine
+
+
+def info(message: str) -> LogLine:
+    return LogLine(level="INFO", message=message)
+
+
+class TestParseTiming(unittest.TestCase):
+    def test_sensor(self):
+        timing = parse_timing(info("Sensor Python Sensor [python] (done) | time=1234ms"))
+        self.assertEqual(timing, Timing(SENSOR, "Python Sensor [python]", 1234))
+
+    def test_phases(self):
+        cases = {
+            "SCM Publisher 10/10 source files have been analyzed (done) | time=500ms": Timing(PHASE, "SCM blame", 500),
+            "CPD Executor CPD calculation finished (done) | time=20ms": Timing(PHASE, "CPD", 20),
+            "Load quality profiles (done) | time=12ms": Timing(PHASE, "Load quality profiles", 12),
+            "Analysis report generated in 50ms, dir size=1 MB": Timing(PHASE, "Report generation", 50),
+            "Analysis report compressed in 30ms, zip size=100 kB": Timing(PHASE, "Report compression", 30),
+            "Analysis report uploaded in 120ms": Timing(PHASE, "Report upload", 120),
+        }
+        for message, expected in cases.items():
+            with self.subTest(message=message):
+                self.assertEqual(parse_timing(info(message)), expected)
+
+    def test_lines_without_timing(self):
+        for message in ["Sensor Python Sensor [python]", "Load project settings", "Took 10ms", ""]:
+            with self.subTest(message=message):
+                self.assertIsNone(parse_timing(info(message)))
+
+
+class TestTimingProfiler(unittest.TestCase):
+    def test_collects_timings_and_forwards_lines(self):
+        listener = Mock()
+        profiler = TimingProfiler(listener)
+        lines = [
+            info("Sensor JaCoCo XML Report Importer [jacoco] (done) | time=5ms"),
+            info("Indexing files..."),
+            info("Project configuration:"),
+            info("42 files indexed"),
+            info("Sensor Python Sensor [python] (done) | time=1234ms"),
+        ]
+        with patch("pysonar_scanner.engine_timings.time.monotonic", side_effect=[10.0, 12.5]):
+            for line in lines:
+                profiler(line)
+
+        self.assertEqual([call.args[0] for call in listener.call_args_list], lines)
+        self.assertEqual(
+            profiler.sorted_timings(),
+            [
+                Timing(PHASE, "File indexing", 2500),
+                Timing(SENSOR, "Python Sensor [python]", 1234),
+                Timing(SENSOR, "JaCoCo XML Report Importer [jacoco]", 5),
+            ],
+        )
+
+    def test_summary_and_report(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = pathlib.Path(temp_dir) / ".scannerwork" / "analysis-timings.json"
+            profiler = TimingProfiler(Mock(), report_path)
+            profiler(info("CPD Executor CPD calculation finished (done) | time=20ms"))
+            profiler(info("Sensor Python Sensor [python] (done) | time=1234ms"))
+
+            with self.assertLogs(level="INFO") as logs:
+                profiler.complete()
+
+            self.assertIn("Analysis timings:", logs.output[0])
+            self.assertLess(logs.output[0].index("Python Sensor"), logs.output[0].index("CPD"))
+            self.assertEqual(
+                json.loads(report_path.read_text()),
+                {
+                    "timings": [
+                        {"category": "sensor", "name": "Python Sensor [python]", "durationMs": 1234},
+                        {"category": "phase", "name": "CPD", "durationMs": 20},
+                    ]
+                },
+            )
+
+    def test_no_timing(self):
+        profiler = TimingProfiler(Mock())
+        with self.assertLogs(level="INFO") as logs:
+            profiler.complete()
+        self.assertIn("No sensor or phase timing", logs.output[0])
@@ -20,6 +20,7 @@
 import pytest
 import unittest
 import logging
+from unittest.mock import patch
 from pysonar_scanner.exceptions import log_error, EXCEPTION_RETURN_CODE
 
 
@@ -55,3 +56,8 @@ class TestExceptions(unittest.TestCase):
 
         self.assertIn("Test exception", self.caplog.text)
         self.assertIn("Traceback", self.caplog.text)
+
+    def test_log_error_flushes_logs(self):
+        with patch("pysonar_scanner.app_logging.flush") as flush_mock:
+            log_error(Exception("Test exception"))
+        flush_mock.assert_called_once()
@@ -0,0 +1,118 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import io
+import random
+import unittest
+
+from jproperties import Properties
+
+from pysonar_scanner.configuration import java_properties
+from pysonar_scanner.configuration.java_properties import PropertiesParseError
+
+KEY_TOKENS = ["sonar", ".", "module", "a", "-", "_", "é", "\\ ", "\\=", "\\:", "\\#", "\\!", "\\t", "\\\\", "\\u00e9"]
+SEPARATORS = ["=", ":", " ", "  ", "\f", " = ", "\t: ", "=\t"]
+# Values never start with whitespace or a line continuation: jproperties differs from java.util.Properties there
+VALUE_START_TOKENS = ["src", "/", ",", "=", ":", "#", "!", "é", "\\n", "\\\\", "\\q", "\\u0041", "\\u00e9"]
+VALUE_TOKENS = VALUE_START_TOKENS + [" ", "**", "\\ud83d\\ude00", "\\\n   ", "\\\r\n\t"]
+LINE_ENDINGS = ["\n", "\r\n", "\r"]
+
+
+def parse(content: str) -> dict[str, str]:
+    return dict(java_properties.iter_properties(io.StringIO(content, newline=None)))
+
+
+def parse_with_jproperties(content: bytes) -> dict[str, str]:
+    properties = Properties()
+    properties.load(io.BytesIO(content))
+    return {key: value.data for key, value in properties.items()}
+
+
+def generate_properties(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(0, 12)):
+        kind = rng.random()
+        if kind < 0.1:
+            lines.append(rng.choice(["", "   ", "\t"]))
+        elif kind < 0.2:
+            comment = rng.choice(["", " comment", " a=b", " trailing backslash \\"])
+            lines.append(rng.choice(["", "  "]) + rng.choice(["#", "!"]) + comment)
+        else:
+            key = "".join(rng.choice(KEY_TOKENS) for _ in range(rng.randint(1, 5)))
+            value = rng.choice(VALUE_START_TOKENS) + "".join(rng.choice(VALUE_TOKENS) for _ in range(rng.randint(0, 8)))
+            lines.append(rng.choice(["", "  ", "\t"]) + key + rng.choice(SEPARATORS) + value)
+    return "".join(line + rng.choice(LINE_ENDINGS) for line in lines)
+
+
+class TestJavaProperties(unittest.TestCase):
+    def test_separators(self):
+        self.assertEqual(
+            parse("a=1\nb:2\nc 3\nd = 4\ne\t:\t5\nf:=6\ng = = 7\nh\n"),
+            {"a": "1", "b": "2", "c": "3", "d": "4", "e": "5", "f": "=6", "g": "= 7", "h": ""},
+        )
+
+    def test_whitespace(self):
+        self.assertEqual(parse("  \t key = value  \n\f\n   \n"), {"key": "value  "})
+
+    def test_comments(self):
+        self.assertEqual(parse("# a=1\n  ! b=2\n#: c=3\n# trailing \\\nd=4\n"), {"d": "4"})
+
+    def test_continuations(self):
+        self.assertEqual(
+            parse("sources=src,\\\n    lib,\\\n    # not a comment\nkey \\\n  = value\nescaped=a\\\\\nend=\\"),
+            {"sources": "src,lib,# not a comment", "key": "value", "escaped": "a\\", "end": ""},
+        )
+
+    def test_line_endings(self):
+        self.assertEqual(parse("a=1\r\nb=2\rc=3\\\r\n  4\n"), {"a": "1", "b": "2", "c": "34"})
+
+    def test_escapes(self):
+        self.assertEqual(
+            parse("key\\ with\\:separators\\=\\#=\\t\\n\\r\\f\\q\\\\ \\u0041\\u00e9\\ud83d\\ude00\n"),
+            {"key with:separators=#": "\t\n\r\fq\\ Aé\U0001f600"},
+        )
+
+    def test_last_value_wins(self):
+        self.assertEqual(list(parse("a=1\nb=2\na=3\n").items()), [("a", "3"), ("b", "2")])
+
+    def test_malformed_unicode_escapes(self):
+        for content in ["a=1\nb=\\u00", "a=\\uZZZZ", "a=\\ud83d", "a=\\ude00\\ud83d"]:
+            with self.subTest(content=content), self.assertRaises(PropertiesParseError):
+                parse(content)
+        with self.assertRaisesRegex(PropertiesParseError, "^Line 3: "):
+            parse("a=1\nb=2\\\n  \\u00")
+
+    def test_streaming(self):
+        lines = iter(["a=1\n", "b=2\\\n", "  3\n", "c=4\n"])
+        properties = java_properties.iter_properties(lines)
+        self.assertEqual(next(properties), ("a", "1"))
+        self.assertEqual(next(properties), ("b", "23"))
+        self.assertEqual(next(lines), "c=4\n")
+
+    def test_same_as_jproperties(self):
+        for seed in range(500):
+            content = generate_properties(random.Random(seed))
+            with self.subTest(seed=seed, content=content):
+                self.assertEqual(parse(content), parse_with_jproperties(content.encode("iso-8859-1")))
+
+    def test_java_behaviour_where_jproperties_differs(self):
+        # jproperties parses "#:" comments as metadata and fails on them, java.util.Properties ignores them
+        self.assertEqual(parse("#:\nkey=value\n"), {"key": "value"})
+        # java.util.Properties joins the lines before looking for the separator
+        self.assertEqual(parse("key \\\n  = value\n"), {"key": "value"})
@@ -18,6 +18,7 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
 import io
+import os
 import pathlib
 import tarfile
 from typing import cast
@@ -32,6 +33,7 @@ from pysonar_scanner.configuration.properties import (
     SONAR_SCANNER_JAVA_EXE_PATH,
     SONAR_SCANNER_OS,
     SONAR_SCANNER_SKIP_JRE_PROVISIONING,
+    SONAR_SCANNER_USE_SYSTEM_JRE,
 )
 from pysonar_scanner.exceptions import (
     ChecksumException,
@@ -39,7 +41,15 @@ from pysonar_scanner.exceptions import (
     NoJreAvailableException,
     UnsupportedArchiveFormat,
 )
-from pysonar_scanner.jre import JREProvisioner, JREResolvedPath, JREResolver, JREResolverConfiguration
+from pysonar_scanner.jre import (
+    JREProvisioner,
+    JREResolvedPath,
+    JREResolver,
+    JREResolverConfiguration,
+    SystemJREDetector,
+    parse_java_version,
+    read_release_java_version,
+)
 from pysonar_scanner.utils import Os, Arch
 from tests.unit import sq_api_utils
 
@@ -246,6 +256,74 @@ class TestJREProvisioner(pyfakefs.TestCase):
             self.assertEqual(metadata_rsps.call_count, 1, msg="Metadata should be fetched once")
             self.assertEqual(download_rsps.call_count, 0, msg="Download should not be attempted")
 
+    def test_prefers_cached_jre_over_first_candidate(self, *args):
+        with sq_api_utils.sq_api_mocker(assert_all_requests_are_fired=False) as mocker:
+            jres = [sq_api_utils.jre_to_dict(self.tar_gz_jre), sq_api_utils.jre_to_dict(self.zip_jre)]
+            mocker.mock_analysis_jres(body=jres)
+            download_rsps = mocker.mock_analysis_jre_download(id="tar_gz_jre", body=self.tar_gz_bytes, status=200)
+
+            with self.cache.get_file(self.zip_jre.filename, self.zip_checksum).open(mode="wb") as f:
+                f.write(self.zip_bytes)
+
+            jre_path = JREProvisioner(self.api, self.cache, utils.get_os().value, utils.get_arch().value).provision()
+
+            self.assertEqual(jre_path, JREResolvedPath(self.cache.get_file_path("jre.zip_unzip") / "java"))
+            self.assertEqual(download_rsps.call_count, 0, msg="Download should not be attempted")
+
+    def test_only_the_selected_archive_is_checksummed(self, *args):
+        with sq_api_utils.sq_api_mocker(assert_all_requests_are_fired=False) as mocker:
+            jres = [sq_api_utils.jre_to_dict(self.zip_jre), sq_api_utils.jre_to_dict(self.tar_gz_jre)]
+            mocker.mock_analysis_jres(body=jres)
+            for jre, content in ((self.zip_jre, self.zip_bytes), (self.tar_gz_jre, self.tar_gz_bytes)):
+                with self.cache.get_file(jre.filename, jre.sha256).open(mode="wb") as f:
+                    f.write(content)
+
+            with patch("pysonar_scanner.utils.calculate_checksum", wraps=utils.calculate_checksum) as checksum:
+                JREProvisioner(self.api, self.cache, utils.get_os().value, utils.get_arch().value).provision()
+
+            checksum.assert_called_once()
+
+    def test_server_order_breaks_ties(self, *args):
+        with sq_api_utils.sq_api_mocker(assert_all_requests_are_fired=False) as mocker:
+            jres = [sq_api_utils.jre_to_dict(self.tar_gz_jre), sq_api_utils.jre_to_dict(self.zip_jre)]
+            mocker.mock_analysis_jres(body=jres)
+            mocker.mock_analysis_jre_download(id="tar_gz_jre", body=self.tar_gz_bytes, status=200)
+
+            jre_path = JREProvisioner(self.api, self.cache, utils.get_os().value, utils.get_arch().value).provision()
+
+            self.assertEqual(jre_path, JREResolvedPath(self.cache.get_file_path("jre17.0.13.tar.gz_unzip") / "java"))
+
+    def test_extracted_jre_is_reused(self, *args):
+        with sq_api_utils.sq_api_mocker(assert_all_requests_are_fired=False) as mocker:
+            mocker.mock_analysis_jres(body=[sq_api_utils.jre_to_dict(self.zip_jre)])
+            download_rsps = mocker.mock_analysis_jre_download(id="zip_jre", body=self.zip_bytes, status=200)
+
+            unzip_dir = self.cache.get_file_path("jre.zip_unzip")
+            unzip_dir.mkdir()
+            (unzip_dir / "java").write_text("java")
+            (unzip_dir / ".pysonar-extracted").write_text(self.zip_checksum)
+
+            jre_path = JREProvisioner(self.api, self.cache, utils.get_os().value, utils.get_arch().value).provision()
+
+            self.assertEqual(jre_path, JREResolvedPath(unzip_dir / "java"))
+            self.assertEqual(download_rsps.call_count, 0, msg="Download should not be attempted")
+            self.assertFalse((unzip_dir / "readme.md").exists(), msg="The JRE should not be extracted again")
+
+    def test_extracted_jre_with_stale_marker_is_extracted_again(self, *args):
+        with sq_api_utils.sq_api_mocker() as mocker:
+            mocker.mock_analysis_jres(body=[sq_api_utils.jre_to_dict(self.zip_jre)])
+            mocker.mock_analysis_jre_download(id="zip_jre", body=self.zip_bytes, status=200)
+
+            unzip_dir = self.cache.get_file_path("jre.zip_unzip")
+            unzip_dir.mkdir()
+            (unzip_dir / "java").write_text("java")
+            (unzip_dir / ".pysonar-extracted").write_text("another checksum")
+
+            JREProvisioner(self.api, self.cache, utils.get_os().value, utils.get_arch().value).provision()
+
+            self.assertTrue((unzip_dir / "readme.md").exists())
+            self.assertEqual((unzip_dir / ".pysonar-extracted").read_text(), self.zip_checksum)
+
     def test_file_already_exists_with_invalid_checksum(self, *args):
         with sq_api_utils.sq_api_mocker() as mocker:
             jre_dict = sq_api_utils.jre_to_dict(self.zip_jre)
@@ -321,6 +399,7 @@ class TestJREResolverConfiguration(unittest.TestCase):
         self.assertIsNone(config.sonar_scanner_java_exe_path)
         self.assertFalse(config.sonar_scanner_skip_jre_provisioning)
         self.assertIsNone(config.sonar_scanner_os)
+        self.assertFalse(config.sonar_scanner_use_system_jre)
 
     def test(self):
         config = JREResolverConfiguration.from_dict(
@@ -328,12 +407,28 @@ class TestJREResolverConfiguration(unittest.TestCase):
                 SONAR_SCANNER_JAVA_EXE_PATH: "a/b",
                 SONAR_SCANNER_SKIP_JRE_PROVISIONING: True,
                 SONAR_SCANNER_OS: Os.WINDOWS.value,
+                SONAR_SCANNER_USE_SYSTEM_JRE: True,
             }
         )
 
         self.assertEqual(config.sonar_scanner_java_exe_path, "a/b")
         self.assertTrue(config.sonar_scanner_skip_jre_provisioning)
         self.assertEqual(config.sonar_scanner_os, Os.WINDOWS.value)
+        self.assertTrue(config.sonar_scanner_use_system_jre)
+
+    def test_use_system_jre_from_string(self):
+        self.assertTrue(
+            JREResolverConfiguration.from_dict({SONAR_SCANNER_USE_SYSTEM_JRE: "true"}).sonar_scanner_use_system_jre
+        )
+        self.assertTrue(
+            JREResolverConfiguration.from_dict({SONAR_SCANNER_USE_SYSTEM_JRE: "TRUE"}).sonar_scanner_use_system_jre
+        )
+        self.assertFalse(
+            JREResolverConfiguration.from_dict({SONAR_SCANNER_USE_SYSTEM_JRE: "false"}).sonar_scanner_use_system_jre
+        )
+        self.assertFalse(
+            JREResolverConfiguration.from_dict({SONAR_SCANNER_USE_SYSTEM_JRE: False}).sonar_scanner_use_system_jre
+        )
 
 
 class TestJREResolver(unittest.TestCase):
@@ -400,3 +495,97 @@ class TestJREResolver(unittest.TestCase):
             with self.subTest(case["name"], config=case["config"], expected=expected):
                 actual = JREResolver(case["config"], provisioner).resolve_jre()
                 self.assertEqual(actual, expected)
+
+    def test_resolve_system_jre(self):
+        provisioner = Mock()
+        provisioner.provision.return_value = JREResolvedPath.from_string("provisioned/java")
+        detector = Mock()
+        config = JREResolverConfiguration(
+            sonar_scanner_java_exe_path=None,
+            sonar_scanner_skip_jre_provisioning=False,
+            sonar_scanner_os=None,
+            sonar_scanner_use_system_jre=True,
+        )
+
+        with self.subTest("a detected system JRE is used"):
+            detector.detect.return_value = JREResolvedPath.from_string("system/java")
+            self.assertEqual(JREResolver(config, provisioner, detector).resolve_jre(), detector.detect.return_value)
+
+        with self.subTest("the JRE is provisioned when no system JRE is detected"):
+            detector.detect.return_value = None
+            self.assertEqual(
+                JREResolver(config, provisioner, detector).resolve_jre(), provisioner.provision.return_value
+            )
+
+        with self.subTest("the detector is not used unless enabled"):
+            detector.reset_mock()
+            config = JREResolverConfiguration(
+                sonar_scanner_java_exe_path=None, sonar_scanner_skip_jre_provisioning=False, sonar_scanner_os=None
+            )
+            JREResolver(config, provisioner, detector).resolve_jre()
+            detector.detect.assert_not_called()
+
+
+class TestJavaVersion(unittest.TestCase):
+    def test_parse_java_version(self):
+        self.assertEqual(parse_java_version('"17.0.9"'), 17)
+        self.assertEqual(parse_java_version("21"), 21)
+        self.assertEqual(parse_java_version('"1.8.0_392"'), 8)
+        self.assertEqual(parse_java_version('"22-ea"'), 22)
+        self.assertIsNone(parse_java_version('"unknown"'))
+
+
+class TestSystemJREDetector(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.cache = cache.get_cache({})
+        self.env_patcher = patch.dict("os.environ", {}, clear=True)
+        self.env_patcher.start()
+        self.addCleanup(self.env_patcher.stop)
+
+    def __create_java_home(self, java_home: str, version: str) -> pathlib.Path:
+        home = pathlib.Path(java_home)
+        self.fs.create_file(home / "release", contents=f'IMPLEMENTOR="Eclipse Adoptium"\nJAVA_VERSION="{version}"\n')
+        self.fs.create_file(home / "bin" / "java")
+        return home
+
+    def test_read_release_java_version(self):
+        home = self.__create_java_home("/opt/jdk", "17.0.9")
+        self.assertEqual(read_release_java_version(home), 17)
+        self.assertIsNone(read_release_java_version(pathlib.Path("/missing")))
+
+    def test_detect_from_java_home(self):
+        home = self.__create_java_home("/opt/jdk", "21.0.1")
+        os.environ["JAVA_HOME"] = str(home)
+
+        self.assertEqual(SystemJREDetector(self.cache, "linux").detect(), JREResolvedPath(home / "bin" / "java"))
+
+    def test_detect_from_path(self):
+        home = self.__create_java_home("/usr/lib/jvm/java-17", "17.0.2")
+        self.fs.create_symlink("/usr/bin/java", home / "bin" / "java")
+
+        with patch("pysonar_scanner.jre.shutil.which", return_value="/usr/bin/java"):
+            detected = SystemJREDetector(self.cache, "linux").detect()
+
+        self.assertEqual(detected, JREResolvedPath(home / "bin" / "java"))
+
+    def test_incompatible_java_is_ignored(self):
+        os.environ["JAVA_HOME"] = str(self.__create_java_home("/opt/jdk8", "1.8.0_392"))
+
+        with patch("pysonar_scanner.jre.shutil.which", return_value=None):
+            self.assertIsNone(SystemJREDetector(self.cache, "linux").detect())
+
+    def test_probe_is_cached_by_mtime(self):
+        home = self.__create_java_home("/opt/jdk", "17.0.9")
+        os.environ["JAVA_HOME"] = str(home)
+
+        with patch("pysonar_scanner.jre.shutil.which", return_value=None):
+            SystemJREDetector(self.cache, "linux").detect()
+            with patch("pysonar_scanner.jre.read_release_java_version") as read_mock:
+                self.assertIsNotNone(SystemJREDetector(self.cache, "linux").detect())
+                read_mock.assert_not_called()
+
+            release_file = home / "release"
+            release_file.write_text('JAVA_VERSION="11.0.2"\n')
+            os.utime(release_file, ns=(0, release_file.stat().st_mtime_ns + 1))
+            self.assertIsNone(SystemJREDetector(self.cache, "linux").detect())
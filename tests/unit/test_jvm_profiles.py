@@ -0,0 +1,93 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import pathlib
+import unittest
+
+import pyfakefs.fake_filesystem_unittest as pyfakefs
+
+from pysonar_scanner import jvm_profiles
+from pysonar_scanner.configuration.properties import SONAR_PROJECT_BASE_DIR, SONAR_SCANNER_JVM_PROFILE, SONAR_SOURCES
+
+
+class TestGetProfileOptions(unittest.TestCase):
+    def test_fast_startup(self):
+        options = jvm_profiles.get_profile_options(jvm_profiles.FAST_STARTUP, 17, None)
+        self.assertEqual(options, ["-XX:+UseSerialGC", "-XX:TieredStopAtLevel=1", "-XX:MetaspaceSize=128m"])
+
+    def test_flags_validated_against_java_version(self):
+        self.assertIn(
+            "-XX:+UseStringDeduplication", jvm_profiles.get_profile_options(jvm_profiles.THROUGHPUT, 21, None)
+        )
+        for java_version in [17, None]:
+            with self.subTest(java_version=java_version):
+                options = jvm_profiles.get_profile_options(jvm_profiles.THROUGHPUT, java_version, None)
+                self.assertNotIn("-XX:+UseStringDeduplication", options)
+                self.assertIn("-XX:+UseParallelGC", options)
+
+    def test_java_opts_take_precedence(self):
+        options = jvm_profiles.get_profile_options(
+            jvm_profiles.THROUGHPUT, 21, "-XX:+UseG1GC -XX:-UseStringDeduplication -Xmx2g"
+        )
+        self.assertEqual(options, ["-XX:+TieredCompilation", "-XX:MetaspaceSize=256m"])
+
+    def test_only_the_same_flag_takes_precedence(self):
+        options = jvm_profiles.get_profile_options(
+            jvm_profiles.FAST_STARTUP, 17, "-XX:MaxMetaspaceSize=512m -XX:TieredStopAtLevel=4"
+        )
+        self.assertEqual(options, ["-XX:+UseSerialGC", "-XX:MetaspaceSize=128m"])
+        options = jvm_profiles.get_profile_options(jvm_profiles.FAST_STARTUP, 17, "-XX:MetaspaceSize=64m")
+        self.assertEqual(options, ["-XX:+UseSerialGC", "-XX:TieredStopAtLevel=1"])
+
+
+class TestSelectProfile(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+
+    def test_no_profile_by_default(self):
+        self.assertIsNone(jvm_profiles.select_profile({}))
+
+    def test_configured_profile(self):
+        self.assertEqual(jvm_profiles.select_profile({SONAR_SCANNER_JVM_PROFILE: "Throughput"}), "throughput")
+
+    def test_unsupported_profile(self):
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(jvm_profiles.select_profile({SONAR_SCANNER_JVM_PROFILE: "turbo"}))
+        self.assertIn("Unsupported value 'turbo'", logs.output[0])
+
+    def test_auto_profile_from_file_count(self):
+        for i in range(10):
+            self.fs.create_file(f"/project/src/module_{i}.py")
+        for i in range(2000):
+            self.fs.create_file(f"/project/.venv/lib/dependency_{i}.py")
+        config = {SONAR_SCANNER_JVM_PROFILE: "auto", SONAR_PROJECT_BASE_DIR: "/project"}
+        self.assertEqual(jvm_profiles.select_profile(config), jvm_profiles.FAST_STARTUP)
+
+        for i in range(1000):
+            self.fs.create_file(f"/project/src/generated/file_{i}.py")
+        self.assertEqual(jvm_profiles.select_profile(config), jvm_profiles.THROUGHPUT)
+        self.assertEqual(
+            jvm_profiles.select_profile({**config, SONAR_SOURCES: "src/module_1.py, src/module_2.py"}),
+            jvm_profiles.FAST_STARTUP,
+        )
+
+    def test_estimate_stops_at_limit(self):
+        for i in range(50):
+            self.fs.create_file(f"/project/{i}/file.py")
+        self.assertEqual(jvm_profiles.estimate_file_count(pathlib.Path("/project"), ["."], 10), 10)
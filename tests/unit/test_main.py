@@ -22,7 +22,7 @@ from unittest.mock import patch, Mock, call
 
 from pyfakefs import fake_filesystem_unittest as pyfakefs
 
-from pysonar_scanner.__main__ import scan, main, check_version, create_jre
+from pysonar_scanner.__main__ import scan, main, check_version, create_jre, set_logging_options
 from pysonar_scanner.api import SQVersion, SonarQubeApi
 from pysonar_scanner.cache import Cache
 from pysonar_scanner.configuration.configuration_loader import ConfigurationLoader
@@ -36,6 +36,9 @@ from pysonar_scanner.configuration.properties import (
     SONAR_SCANNER_OS,
     SONAR_SCANNER_ARCH,
     SONAR_SCANNER_JAVA_EXE_PATH,
+    SONAR_PROJECT_BASE_DIR,
+    SONAR_SCANNER_BATCH_PROJECTS,
+    SONAR_SCANNER_ASYNC_LOGGING,
 )
 from pysonar_scanner.exceptions import SQTooOldException
 from pysonar_scanner.jre import JREResolvedPath, JREResolver
@@ -96,6 +99,48 @@ class TestMain(pyfakefs.TestCase):
         ]
         mock_logging.info.assert_has_calls(info_logs)
 
+    @patch.object(pathlib.Path, "home", return_value=pathlib.Path("home/user"))
+    @patch.object(ConfigurationLoader, "load")
+    @patch.object(
+        ScannerEngineProvisioner, "provision", return_value=JREResolvedPath(pathlib.Path("scanner_engine_path"))
+    )
+    @patch("pysonar_scanner.__main__.create_jre", return_value=JREResolvedPath(pathlib.Path("jre_path")))
+    @patch.object(ScannerEngine, "run", side_effect=[0, 2])
+    def test_batch_run(self, run_mock, create_jre_mock, provision_mock, load_mock, path_home_mock):
+        self.setUpPyfakefs()
+        self.fs.create_dir("repo/api")
+        self.fs.create_dir("repo/worker")
+        root_config = {
+            SONAR_TOKEN: "myToken",
+            SONAR_SCANNER_OS: "linux",
+            SONAR_SCANNER_ARCH: "x64",
+            SONAR_PROJECT_BASE_DIR: "repo",
+            SONAR_SCANNER_BATCH_PROJECTS: "api,worker",
+        }
+        load_mock.side_effect = [root_config] + [
+            {SONAR_TOKEN: "myToken", SONAR_PROJECT_KEY: name, SONAR_PROJECT_BASE_DIR: f"repo/{name}"}
+            for name in ("api", "worker")
+        ]
+
+        with patch("sys.argv", ["pysonar", "--sonar-scanner-batch-projects", "api,worker"]), self.assertLogs():
+            exitcode = scan()
+
+        self.assertEqual(exitcode, 2)
+        create_jre_mock.assert_called_once()
+        provision_mock.assert_called_once()
+        self.assertEqual(
+            load_mock.call_args_list[1:],
+            [
+                call(argv=["--sonar-scanner-batch-projects", "api,worker", "--sonar-project-base-dir", "repo/api"]),
+                call(argv=["--sonar-scanner-batch-projects", "api,worker", "--sonar-project-base-dir", "repo/worker"]),
+            ],
+        )
+        project_configs = [run_call.args[0] for run_call in run_mock.call_args_list]
+        self.assertEqual([config[SONAR_PROJECT_KEY] for config in project_configs], ["api", "worker"])
+        for config in project_configs:
+            self.assertEqual(config[SONAR_SCANNER_JAVA_EXE_PATH], "jre_path")
+            self.assertEqual(config[SONAR_HOST_URL], "https://sonarcloud.io")
+
     @patch.object(ConfigurationLoader, "load")
     def test_scan_with_exception(self, load_mock):
         load_mock.side_effect = Exception("Test exception")
@@ -109,6 +154,14 @@ class TestMain(pyfakefs.TestCase):
                 main()
             self.assertEqual(main_exit.exception.code, 42)
 
+    @patch("pysonar_scanner.__main__.app_logging")
+    def test_async_logging_option(self, app_logging_mock):
+        for value, enabled in ((True, True), ("true", True), ("TRUE", True), ("false", False), (False, False)):
+            with self.subTest(value=value):
+                app_logging_mock.reset_mock()
+                set_logging_options({SONAR_SCANNER_ASYNC_LOGGING: value})
+                self.assertEqual(app_logging_mock.enable_async_logging.called, enabled)
+
     def test_version_check_outdated_sonarqube(self):
         sq_cloud_api = sq_api_utils.get_sq_server()
         sq_cloud_api.get_analysis_version = Mock(return_value=SQVersion.from_str("9.9.9"))
@@ -0,0 +1,106 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+import pathlib
+
+import pyfakefs.fake_filesystem_unittest as pyfakefs
+
+from pysonar_scanner.configuration import modules
+from pysonar_scanner.configuration.properties import SONAR_MODULES
+
+
+class TestModules(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        os.makedirs("/project")
+        os.chdir("/project")
+
+    def test_no_modules(self):
+        expanded = modules.expand({"sonar.projectKey": "my-project"}, pathlib.Path("."))
+        self.assertEqual(expanded.properties, {})
+        self.assertEqual(expanded.files, [])
+
+    def test_expand(self):
+        self.fs.create_file(
+            "api/sonar-project.properties",
+            contents="sonar.projectName=API\nsonar.sources=src\nsonar.modules=client\n",
+        )
+        self.fs.create_file(
+            "api/client/pyproject.toml",
+            contents='[project]\nname = "api-client"\n\n[tool.sonar]\nsources = "lib"\n',
+        )
+        self.fs.create_file("worker/sonar-project.properties", contents="sonar.projectName=Worker\n")
+
+        expanded = modules.expand(
+            {
+                SONAR_MODULES: "api, worker",
+                "worker.sonar.projectName": "Background worker",
+                "api.client.sonar.tests": "tests",
+            },
+            pathlib.Path("."),
+        )
+
+        self.assertEqual(
+            expanded.properties,
+            {
+                "api.sonar.projectBaseDir": "/project/api",
+                "api.sonar.projectName": "API",
+                "api.sonar.sources": "src",
+                "api.sonar.modules": "client",
+                "api.client.sonar.projectBaseDir": "/project/api/client",
+                "api.client.sonar.projectName": "api-client",
+                "api.client.sonar.sources": "lib",
+                "worker.sonar.projectBaseDir": "/project/worker",
+            },
+        )
+        self.assertEqual(
+            expanded.files,
+            [
+                pathlib.Path("/project/api/pyproject.toml"),
+                pathlib.Path("/project/api/sonar-project.properties"),
+                pathlib.Path("/project/worker/pyproject.toml"),
+                pathlib.Path("/project/worker/sonar-project.properties"),
+                pathlib.Path("/project/api/client/pyproject.toml"),
+                pathlib.Path("/project/api/client/sonar-project.properties"),
+            ],
+        )
+
+    def test_module_base_dir(self):
+        self.fs.create_file("services/api/sonar-project.properties", contents="sonar.projectName=API\n")
+
+        expanded = modules.expand({SONAR_MODULES: "api", "api.sonar.projectBaseDir": "services/api"}, pathlib.Path("."))
+
+        self.assertEqual(expanded.properties["api.sonar.projectBaseDir"], "/project/services/api")
+        self.assertEqual(expanded.properties["api.sonar.projectName"], "API")
+
+    def test_invalid_modules_are_ignored(self):
+        self.fs.create_file(
+            "api/sonar-project.properties", contents="sonar.modules=parent\nparent.sonar.projectBaseDir=..\n"
+        )
+
+        with self.assertLogs(level="WARNING") as logs:
+            expanded = modules.expand({SONAR_MODULES: "api,missing"}, pathlib.Path("."))
+
+        self.assertEqual(
+            set(expanded.properties),
+            {"api.sonar.projectBaseDir", "api.sonar.modules", "api.parent.sonar.projectBaseDir"},
+        )
+        self.assertIn("The base directory /project/missing of the module missing does not exist", logs.output[0])
+        self.assertIn("The module api.parent is ignored", logs.output[1])
@@ -0,0 +1,138 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import errno
+import functools
+import os
+import platform
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from pysonar_scanner.configuration.properties import (
+    SONAR_SCANNER_ENGINE_CPU_AFFINITY,
+    SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS,
+    SONAR_SCANNER_ENGINE_NICENESS,
+)
+from pysonar_scanner.process_priority import ProcessPriority, parse_cpu_list
+
+IS_LINUX = platform.system() == "Linux"
+
+
+class TestParseCpuList(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_cpu_list("0-3,6"), {0, 1, 2, 3, 6})
+        self.assertEqual(parse_cpu_list(" 2 , 4-5 "), {2, 4, 5})
+        self.assertEqual(parse_cpu_list(""), set())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_cpu_list("first")
+
+
+@unittest.skipUnless(IS_LINUX, "process priorities are only supported on Linux")
+class TestProcessPriority(unittest.TestCase):
+    def test_nothing_configured(self):
+        self.assertIsNone(ProcessPriority.create({}))
+
+    def test_not_supported_outside_linux(self):
+        with patch("pysonar_scanner.process_priority.platform.system", return_value="Darwin"):
+            self.assertIsNone(ProcessPriority.create({SONAR_SCANNER_ENGINE_NICENESS: 10}))
+
+    def test_create(self):
+        cpu = min(os.sched_getaffinity(0))
+        priority = ProcessPriority.create(
+            {
+                SONAR_SCANNER_ENGINE_NICENESS: "25",
+                SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS: "Idle",
+                SONAR_SCANNER_ENGINE_CPU_AFFINITY: str(cpu),
+            }
+        )
+        self.assertEqual(priority, ProcessPriority(19, 3, frozenset({cpu})))
+        self.assertEqual(priority.describe(), f"niceness 19, I/O class idle, CPUs {cpu}")
+
+    def test_invalid_values(self):
+        cases = {
+            SONAR_SCANNER_ENGINE_NICENESS: "low",
+            SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS: "background",
+            SONAR_SCANNER_ENGINE_CPU_AFFINITY: "100000",
+        }
+        for key, value in cases.items():
+            with self.subTest(key=key), self.assertLogs(level="WARNING") as logs:
+                self.assertIsNone(ProcessPriority.create({key: value}))
+                self.assertIn(f"Invalid value '{value}'", logs.output[0])
+
+    @patch("pysonar_scanner.process_priority.os.geteuid", return_value=1000)
+    def test_privileged_settings_are_ignored(self, _):
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(ProcessPriority.create({SONAR_SCANNER_ENGINE_IO_PRIORITY_CLASS: "realtime"}))
+        self.assertIn("Only root can use the realtime I/O class", logs.output[0])
+
+    def test_applied_to_every_thread_of_child_process(self):
+        cpu = min(os.sched_getaffinity(0))
+        niceness = min(os.getpriority(os.PRIO_PROCESS, 0) + 5, 19)
+        priority = ProcessPriority(niceness, 3, frozenset({cpu}))
+        # The settings are read from a thread started by the child process
+        child_script = (
+            "import os, threading\n"
+            "def report():\n"
+            "    print(os.getpriority(os.PRIO_PROCESS, 0), *os.sched_getaffinity(0))\n"
+            "thread = threading.Thread(target=report)\n"
+            "thread.start()\n"
+            "thread.join()\n"
+        )
+        own_niceness = os.getpriority(os.PRIO_PROCESS, 0)
+        own_affinity = os.sched_getaffinity(0)
+
+        start = functools.partial(
+            subprocess.Popen, [sys.executable, "-c", child_script], stdout=subprocess.PIPE, text=True
+        )
+        with priority.spawn(start) as process:
+            output, _ = process.communicate()
+
+        self.assertEqual(output.split(), [str(niceness), str(cpu)])
+        self.assertEqual(os.getpriority(os.PRIO_PROCESS, 0), own_niceness)
+        self.assertEqual(os.sched_getaffinity(0), own_affinity)
+
+    def test_process_started_when_settings_cannot_be_applied(self):
+        start = functools.partial(subprocess.Popen, [sys.executable, "-c", "pass"])
+        with patch("pysonar_scanner.process_priority.os.setpriority", side_effect=PermissionError(1, "denied")):
+            with self.assertLogs(level="WARNING") as logs:
+                with ProcessPriority(niceness=19).spawn(start) as process:
+                    self.assertEqual(process.wait(), 0)
+        self.assertIn("Failed to run the scanner engine with niceness 19", logs.output[0])
+
+    def test_start_error_is_raised(self):
+        start = functools.partial(subprocess.Popen, ["/nonexistent/java"])
+        with self.assertRaises(FileNotFoundError):
+            ProcessPriority(niceness=19).spawn(start)
+
+    @patch("pysonar_scanner.process_priority.ctypes.get_errno", return_value=errno.EPERM)
+    @patch("pysonar_scanner.process_priority.ctypes.CDLL")
+    @patch("pysonar_scanner.process_priority.platform.machine", return_value="x86_64")
+    def test_failed_io_priority_is_reported(self, _, cdll, __):
+        cdll.return_value.syscall.return_value = -1
+        start = functools.partial(subprocess.Popen, [sys.executable, "-c", "pass"])
+        with self.assertLogs(level="WARNING") as logs:
+            with ProcessPriority(io_priority_class=3).spawn(start) as process:
+                self.assertEqual(process.wait(), 0)
+        self.assertIn(
+            "Failed to run the scanner engine with I/O class idle: [Errno 1] ioprio_set failed", logs.output[0]
+        )
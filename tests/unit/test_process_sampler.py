@@ -0,0 +1,124 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import csv
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pyfakefs.fake_filesystem_unittest as pyfakefs
+
+from pysonar_scanner.process_sampler import ProcessSampler, ResourceSample, read_process_sample
+
+# Fields 3 to 24 of /proc/<pid>/stat: utime=150, stime=50, num_threads=42, rss=1000 pages
+STAT_FIELDS = "S 1 2 3 4 5 6 7 8 9 10 150 50 0 0 20 0 42 0 100 4096000 1000"
+
+
+class TestReadProcessSample(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+
+    def test_read_sample(self):
+        self.fs.create_file("/proc/123/stat", contents=f"123 (java (engine) x) {STAT_FIELDS}\n")
+        self.fs.create_file("/proc/123/io", contents="rchar: 10\nwchar: 20\nread_bytes: 4096\nwrite_bytes: 8192\n")
+
+        sample = read_process_sample(123, 1.5)
+
+        clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.assertEqual(
+            sample,
+            ResourceSample(1.5, 1000 * os.sysconf("SC_PAGE_SIZE"), 200 / clock_ticks, 42, 4096, 8192),
+        )
+
+    def test_io_counters_not_readable(self):
+        self.fs.create_file("/proc/123/stat", contents=f"123 (java) {STAT_FIELDS}\n")
+        sample = read_process_sample(123, 0.0)
+        self.assertIsNone(sample.read_bytes)
+        self.assertIsNone(sample.write_bytes)
+
+    def test_exiting_process(self):
+        self.fs.create_file("/proc/123/stat", contents=f"123 (java) Z {STAT_FIELDS[2:-4]} 0\n")
+        self.assertIsNone(read_process_sample(123, 0.0))
+
+    def test_process_without_memory(self):
+        self.fs.create_file("/proc/123/stat", contents=f"123 (java) R {STAT_FIELDS[2:-4]} 0\n")
+        self.assertEqual(read_process_sample(123, 0.0).rss_bytes, 0)
+
+    def test_process_not_found(self):
+        self.assertIsNone(read_process_sample(123, 0.0))
+
+
+class TestProcessSampler(unittest.TestCase):
+    def test_report(self):
+        mb = 1024 * 1024
+        sampler = ProcessSampler(1.0)
+        sampler.samples = [
+            ResourceSample(0.0, 100 * mb, 0.0, 10, 0, 0),
+            ResourceSample(1.0, 300 * mb, 2.0, 30, mb, 2 * mb),
+            ResourceSample(2.0, 200 * mb, 3.0, 20, 2 * mb, 4 * mb),
+        ]
+        with self.assertLogs(level="INFO") as logs:
+            sampler.report()
+        report = logs.output[0]
+        self.assertIn("RSS: peak 300.0 MB, average 200.0 MB", report)
+        self.assertIn("CPU: 3.0 s, peak 2.00 cores, average 1.50 cores", report)
+        self.assertIn("Threads: peak 30, average 20", report)
+        self.assertIn("I/O: read 2.0 MB, written 4.0 MB", report)
+
+    def test_samples_without_memory_are_skipped(self):
+        samples = [
+            ResourceSample(0.0, 0, 0.0, 1, None, None),
+            ResourceSample(0.1, 100, 0.1, 10, None, None),
+            ResourceSample(0.2, 0, 0.2, 10, None, None),
+            ResourceSample(0.3, 200, 0.3, 20, None, None),
+            None,
+        ]
+        sampler = ProcessSampler(0.0)
+        with patch("pysonar_scanner.process_sampler.read_process_sample", side_effect=samples) as read_sample:
+            sampler._ProcessSampler__sample(123)
+
+        self.assertEqual(read_sample.call_count, 5)
+        self.assertEqual(sampler.samples, [samples[1], samples[3]])
+
+    def test_no_report_without_samples(self):
+        with self.assertNoLogs(level="INFO"):
+            ProcessSampler(1.0).report()
+
+    @unittest.skipUnless(pathlib.Path("/proc/self/stat").exists(), "requires the /proc file system")
+    def test_sample_running_process(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            time_series_path = pathlib.Path(temp_dir) / "engine-resource-usage.csv"
+            sampler = ProcessSampler(0.01, time_series_path)
+            process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+            sampler.start(process.pid)
+            process.wait()
+            sampler.stop()
+
+            self.assertGreater(len(sampler.samples), 1)
+            self.assertTrue(all(sample.rss_bytes > 0 for sample in sampler.samples))
+            with self.assertLogs(level="INFO"):
+                sampler.report()
+            with time_series_path.open(newline="") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0][:3], ["elapsed_seconds", "rss_bytes", "cpu_seconds"])
+            self.assertEqual(len(rows), len(sampler.samples) + 1)
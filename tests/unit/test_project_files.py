@@ -0,0 +1,157 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import configparser
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pyfakefs.fake_filesystem_unittest as pyfakefs
+import tomli
+
+from pysonar_scanner.configuration import test_paths_loader
+from pysonar_scanner.configuration.configuration_loader import ConfigurationLoader
+from pysonar_scanner.configuration.coveragerc_loader import CoverageRCConfigurationLoader
+from pysonar_scanner.configuration.project_files import ProjectFiles
+from pysonar_scanner.configuration.pyproject_toml import TomlConfigurationLoader
+from pysonar_scanner.configuration.provenance import ConfigurationProvenance
+from pysonar_scanner.configuration.properties import SONAR_COVERAGE_EXCLUSIONS, SONAR_PROJECT_NAME, SONAR_TESTS
+from pysonar_scanner.utils import Arch, Os
+
+
+class TestProjectFiles(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        self.fs.create_file("/project/pyproject.toml", contents='[project]\nname = "my-project"\n')
+        self.fs.create_file("/project/setup.cfg", contents="[tool:pytest]\ntestpaths = tests\n")
+        self.project_files = ProjectFiles(Path("/project"))
+
+    def test_base_dir_is_scanned_once(self):
+        with patch("pysonar_scanner.configuration.project_files.os.scandir", wraps=os.scandir) as scandir:
+            self.assertTrue(self.project_files.is_file(Path("/project/pyproject.toml")))
+            self.assertTrue(self.project_files.is_file(Path("/project/setup.cfg")))
+            self.assertFalse(self.project_files.is_file(Path("/project/tox.ini")))
+            self.assertFalse(self.project_files.is_file(Path("/project/.coveragerc")))
+        scandir.assert_called_once()
+
+    def test_directory_index(self):
+        self.fs.create_dir("/project/tests")
+        self.fs.create_file("/project/test")
+        self.fs.create_file("/project/src/tests/conftest.py")
+        project_files = ProjectFiles(Path("/project"))
+
+        self.assertTrue(project_files.is_dir(Path("/project/tests")))
+        self.assertFalse(project_files.is_file(Path("/project/tests")))
+        self.assertFalse(project_files.is_dir(Path("/project/test")))
+        self.assertTrue(project_files.exists(Path("/project/test")))
+        self.assertFalse(project_files.exists(Path("/project/testing")))
+        self.assertTrue(project_files.is_dir(Path("/project/src/tests")))
+
+        self.assertEqual(project_files.counters.directory_scans, 1)
+        self.assertEqual(project_files.counters.index_lookups, 5)
+        self.assertEqual(project_files.counters.stat_calls, 1)
+
+    def test_files_are_parsed_once(self):
+        with patch("pysonar_scanner.configuration.project_files.tomli.load", wraps=tomli.load) as toml_load:
+            first = self.project_files.toml(self.project_files.path("pyproject.toml"))
+            second = self.project_files.toml(self.project_files.path("pyproject.toml"))
+        self.assertEqual(first, {"project": {"name": "my-project"}})
+        self.assertIs(first, second)
+        toml_load.assert_called_once()
+        self.assertEqual(self.project_files.ini(Path("/project/setup.cfg"))["tool:pytest"]["testpaths"], "tests")
+
+    def test_missing_files(self):
+        self.assertIsNone(self.project_files.toml(Path("/project/other/pyproject.toml")))
+        self.assertIsNone(self.project_files.ini(Path("/project/tox.ini")))
+        self.assertIsNone(self.project_files.properties(Path("/project/sonar-project.properties")))
+
+    def test_files_removed_after_the_scan(self):
+        self.fs.create_file("/project/.coveragerc", contents="[run]\nomit = */migrations/*\n")
+        self.fs.create_dir("/project/tests")
+        project_files = ProjectFiles(Path("/project"))
+        self.assertTrue(project_files.is_file(Path("/project/pyproject.toml")))
+        for filename in ("pyproject.toml", "setup.cfg", ".coveragerc"):
+            self.fs.remove(f"/project/{filename}")
+
+        self.assertIsNone(project_files.toml(Path("/project/pyproject.toml")))
+        self.assertIsNone(project_files.ini(Path("/project/setup.cfg")))
+        self.assertEqual(test_paths_loader.load(Path("/project"), project_files), ({SONAR_TESTS: "tests"}, False))
+        self.assertEqual(CoverageRCConfigurationLoader.load_exclusion_properties(Path("/project"), project_files), {})
+        toml_properties = TomlConfigurationLoader.load(Path("/project"), project_files)
+        self.assertEqual((toml_properties.sonar_properties, toml_properties.project_properties), ({}, {}))
+
+    def test_file_outside_base_dir(self):
+        self.fs.create_file("/elsewhere/pyproject.toml", contents='[project]\nname = "other"\n')
+        self.assertEqual(self.project_files.toml(Path("/elsewhere/pyproject.toml")), {"project": {"name": "other"}})
+
+    def test_parsing_error_is_raised_to_every_caller(self):
+        self.fs.create_file("/project/tox.ini", contents="not an ini file")
+        project_files = ProjectFiles(Path("/project"))
+        with patch(
+            "pysonar_scanner.configuration.project_files.configparser.ConfigParser", wraps=configparser.ConfigParser
+        ) as parser:
+            for _ in range(2):
+                with self.assertRaises(configparser.MissingSectionHeaderError):
+                    project_files.ini(Path("/project/tox.ini"))
+        parser.assert_called_once()
+
+
+@patch("pysonar_scanner.utils.get_arch", return_value=Arch.X64)
+@patch("pysonar_scanner.utils.get_os", return_value=Os.LINUX)
+class TestSharedProjectFiles(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        env_patcher = patch.dict("os.environ", {}, clear=True)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    @patch("sys.argv", ["myscript.py"])
+    def test_each_project_file_is_read_once(self, *_):
+        self.fs.create_file(
+            "pyproject.toml",
+            contents='[project]\nname = "my-project"\n\n[tool.pytest.ini_options]\ntestpaths = ["tests"]\n',
+        )
+        self.fs.create_file(".coveragerc", contents="[run]\nomit = */migrations/*\n")
+        self.fs.create_dir("tests")
+
+        with patch("pysonar_scanner.configuration.project_files.tomli.load", wraps=tomli.load) as toml_load:
+            configuration = ConfigurationLoader.load()
+
+        toml_load.assert_called_once()
+        self.assertEqual(configuration[SONAR_PROJECT_NAME], "my-project")
+        self.assertEqual(configuration[SONAR_TESTS], "tests")
+        self.assertEqual(configuration[SONAR_COVERAGE_EXCLUSIONS], "*/migrations/*")
+
+    @patch("sys.argv", ["myscript.py"])
+    def test_base_dir_is_scanned_once_by_all_loaders(self, *_):
+        self.fs.create_file("sonar-project.properties", contents="sonar.projectKey=my-project\n")
+        self.fs.create_file("setup.cfg", contents="[metadata]\nname = my-project\n")
+        self.fs.create_dir("testing")
+        provenance = ConfigurationProvenance()
+
+        with patch("pysonar_scanner.configuration.project_files.os.scandir", wraps=os.scandir) as scandir:
+            configuration = ConfigurationLoader.load(provenance)
+
+        self.assertEqual(configuration[SONAR_TESTS], "testing")
+        scandir.assert_called_once()
+        counters = provenance.filesystem_counters
+        self.assertEqual(counters.directory_scans, 1)
+        self.assertGreaterEqual(counters.index_lookups, 9)
+        self.assertEqual(counters.stat_calls, 0)
+        self.assertEqual(provenance.to_json()["filesystem"]["statCalls"], 0)
@@ -0,0 +1,64 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import unittest
+
+from pysonar_scanner.configuration.provenance import ConfigurationProvenance
+
+
+class TestConfigurationProvenance(unittest.TestCase):
+    def test_record_keeps_overridden_sources(self):
+        provenance = ConfigurationProvenance()
+        provenance.record("static defaults", {"sonar.a": 1, "sonar.b": 2})
+        provenance.record("sonar-project.properties", {"sonar.a": 3})
+        provenance.record("command line", {"sonar.a": 4, "sonar.c": 5})
+
+        self.assertEqual(
+            provenance.sources, {"sonar.a": "command line", "sonar.b": "static defaults", "sonar.c": "command line"}
+        )
+        self.assertEqual(provenance.overridden_sources, {"sonar.a": ["static defaults", "sonar-project.properties"]})
+
+    def test_timed_accumulates_durations(self):
+        provenance = ConfigurationProvenance()
+        with provenance.timed("pyproject.toml"):
+            pass
+        with provenance.timed("pyproject.toml"):
+            pass
+        with provenance.timed("command line"):
+            pass
+
+        self.assertEqual(list(provenance.durations_ms), ["pyproject.toml", "command line"])
+        self.assertEqual(provenance.total_duration_ms(), sum(provenance.durations_ms.values()))
+
+    def test_to_json(self):
+        provenance = ConfigurationProvenance()
+        provenance.record("environment variables", {"sonar.b": "x"})
+        provenance.record("command line", {"sonar.b": "y", "sonar.a": "z"})
+        provenance.durations_ms["command line"] = 1.23456
+
+        self.assertEqual(
+            provenance.to_json(),
+            {
+                "loaders": [{"name": "command line", "durationMs": 1.235}],
+                "properties": {
+                    "sonar.a": {"source": "command line", "overriddenSources": []},
+                    "sonar.b": {"source": "command line", "overriddenSources": ["environment variables"]},
+                },
+            },
+        )
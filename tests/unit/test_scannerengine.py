@@ -17,21 +17,49 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 #
+import gzip
+import io
 import json
 import logging
+import os
+import lzma
 import pathlib
+import signal
+import sys
+import tempfile
+import time
 import unittest
+from functools import partial
 from subprocess import PIPE
+from threading import Thread, Timer
 from unittest.mock import MagicMock, Mock, patch
 
 import pyfakefs.fake_filesystem_unittest as pyfakefs
 
 from pysonar_scanner import cache, scannerengine
 from pysonar_scanner.configuration.properties import (
+    SONAR_LOG_LEVEL,
+    SONAR_PROJECT_BASE_DIR,
+    SONAR_SCANNER_CLASS_DATA_SHARING,
+    SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT,
+    SONAR_SCANNER_ENGINE_LOG_CAPTURE,
+    SONAR_SCANNER_ENGINE_NICENESS,
+    SONAR_SCANNER_ENGINE_TIMEOUT,
+    SONAR_SCANNER_JAVA_HEAP_SIZE,
+    SONAR_SCANNER_JVM_PROFILE,
     SONAR_SCANNER_JAVA_OPTS,
     SONAR_SCANNER_OPTS,
+    SONAR_SCANNER_PROFILE_JVM,
+    SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL,
+    SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES,
+    SONAR_SCANNER_SENSOR_TIMINGS,
+    SONAR_PYTHON_ANALYSIS_PARALLEL,
+    SONAR_PYTHON_ANALYSIS_THREADS,
+    SONAR_VERBOSE,
+    SONAR_WORKING_DIRECTORY,
 )
-from pysonar_scanner.exceptions import ChecksumException
+from pysonar_scanner.exceptions import ENGINE_TIMEOUT_RETURN_CODE, ChecksumException
+from pysonar_scanner.jre import JREResolvedPath
 from pysonar_scanner.scannerengine import (
     LogLine,
     ScannerEngineProvisioner,
@@ -64,13 +92,42 @@ class TestLogLine(unittest.TestCase):
         log_line = scannerengine.parse_log_line(line)
         self.assertEqual(log_line, LogLine(level="INFO", message="a message", stacktrace=None))
 
+    def test_plain_text(self):
+        with patch("json.loads") as loads_mock:
+            log_line = scannerengine.parse_log_line("INFO: a message")
+        self.assertEqual(log_line, LogLine(level="INFO", message="INFO: a message", stacktrace=None))
+        loads_mock.assert_not_called()
+
+    def test_json_that_is_not_an_object(self):
+        line = "{} []"
+        self.assertEqual(scannerengine.parse_log_line(line), LogLine(level="INFO", message=line, stacktrace=None))
+
+
+class TestReadLinesInBatches(unittest.TestCase):
+    def test_lines_are_split_across_chunks(self):
+        stream = io.BufferedReader(io.BytesIO(b"first\r\nsecond\nthird"), buffer_size=4)
+        with patch("pysonar_scanner.scannerengine.LOG_READ_CHUNK_SIZE", 4):
+            lines = [line for batch in scannerengine.read_lines_in_batches(stream) for line in batch]
+        self.assertEqual(lines, ["first", "second", "third"])
+
+    def test_available_lines_are_batched(self):
+        batches = list(scannerengine.read_lines_in_batches(io.BytesIO(b"a\nb\nc\n")))
+        self.assertEqual(batches, [["a", "b", "c"]])
+
+    def test_invalid_utf8(self):
+        batches = list(scannerengine.read_lines_in_batches(io.BytesIO(b"caf\xe9\n")))
+        self.assertEqual(batches, [["caf\ufffd"]])
+
+
+NEW_SESSION_OPTIONS = {"start_new_session": True} if os.name == "posix" else {}
+
 
 class TestCmdExecutor(unittest.TestCase):
     @patch("pysonar_scanner.scannerengine.Popen")
     def test_execute_successful(self, mock_popen):
         mock_process = MagicMock()
-        mock_process.stdout = []
-        mock_process.stderr = []
+        mock_process.stdout = io.BytesIO()
+        mock_process.stderr = io.BytesIO()
         mock_process.wait.return_value = 0
         mock_process.returncode = 0
         mock_popen.return_value = mock_process
@@ -78,11 +135,26 @@ class TestCmdExecutor(unittest.TestCase):
         cmd_executor = scannerengine.CmdExecutor(["echo", "hello"], "key=value")
         return_code = cmd_executor.execute()
 
-        mock_popen.assert_called_once_with(["echo", "hello"], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        mock_popen.assert_called_once_with(
+            ["echo", "hello"], stdin=PIPE, stdout=PIPE, stderr=PIPE, **NEW_SESSION_OPTIONS
+        )
         mock_process.stdin.write.assert_called_once_with(b"key=value")
         mock_process.stdin.close.assert_called_once()
         self.assertEqual(return_code, 0)
 
+    @patch("pysonar_scanner.scannerengine.Popen")
+    def test_execute_with_process_priority(self, mock_popen):
+        mock_popen.return_value.stdout = io.BytesIO()
+        mock_popen.return_value.stderr = io.BytesIO()
+        mock_popen.return_value.returncode = 0
+        process_priority = MagicMock()
+        process_priority.spawn.side_effect = lambda start: start()
+
+        scannerengine.CmdExecutor(["java"], "{}", process_priority=process_priority).execute()
+
+        process_priority.spawn.assert_called_once()
+        mock_popen.assert_called_once_with(["java"], stdin=PIPE, stdout=PIPE, stderr=PIPE, **NEW_SESSION_OPTIONS)
+
     @patch("pysonar_scanner.scannerengine.Popen")
     def test_error_log_extraction(self, popen_mock):
         log_info = [
@@ -95,8 +167,8 @@ class TestCmdExecutor(unittest.TestCase):
         ]
 
         popen_mock.return_value.stdin = MagicMock()
-        popen_mock.return_value.stdout = log_info
-        popen_mock.return_value.stderr = log_error
+        popen_mock.return_value.stdout = io.BytesIO(b"\n".join(log_info))
+        popen_mock.return_value.stderr = io.BytesIO(b"\n".join(log_error))
 
         actual_lines = set()
         expected_lines = {
@@ -121,6 +193,41 @@ class TestCmdExecutor(unittest.TestCase):
         self.assertEqual(LogLine(level="TRACE", message="").get_logging_level(), logging.DEBUG)
         self.assertEqual(LogLine(level="UNKNOWN", message="").get_logging_level(), logging.INFO)
 
+    @patch("pysonar_scanner.scannerengine.Popen")
+    def test_log_lines_keep_their_order(self, popen_mock):
+        popen_mock.return_value.stdout = io.BytesIO(b"".join(b"line %d\n" % i for i in range(10000)))
+        popen_mock.return_value.stderr = io.BytesIO()
+        actual_lines = []
+
+        scannerengine.CmdExecutor(["echo"], "", lambda log_line: actual_lines.append(log_line.message)).execute()
+
+        self.assertEqual(actual_lines, [f"line {i}" for i in range(10000)])
+
+    def test_failing_listener_stops_the_engine(self):
+        # The engine writes far more than the queue and its pipes can buffer, and would never exit on its own
+        engine = "import sys\nwhile True:\n    sys.stdout.write('x' * 1000 + '\\n')\n"
+        listener = MagicMock(side_effect=RuntimeError("listener failure"))
+        errors = []
+
+        def execute():
+            try:
+                scannerengine.CmdExecutor([sys.executable, "-c", engine], "", listener).execute()
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = Thread(target=execute, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([str(error) for error in errors], ["listener failure"])
+        listener.assert_called_once()
+
+    def test_default_log_line_listener_skips_disabled_levels(self):
+        with patch("logging.log") as log_mock, patch.object(logging.getLogger(), "level", logging.INFO):
+            default_log_line_listener(LogLine(level="DEBUG", message="debug", stacktrace="a stacktrace"))
+        log_mock.assert_not_called()
+
     def test_default_log_line_listener(self):
         with (
             self.subTest("log line without stacktrace"),
@@ -140,6 +247,10 @@ class TestCmdExecutor(unittest.TestCase):
 class TestScannerEngineWithFake(pyfakefs.TestCase):
     def setUp(self):
         self.setUpPyfakefs()
+        # The CPUs available on the machine running the tests must not influence the command line
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
 
     @patch("pysonar_scanner.scannerengine.CmdExecutor")
     def test_command_building(self, execute_mock):
@@ -172,6 +283,11 @@ class TestScannerEngineWithFake(pyfakefs.TestCase):
         execute_mock.assert_called_once_with(
             [str(java_path), "-jar", str(pathlib.Path("/test/scanner-engine.jar"))],
             expected_std_in,
+            log_line_listener=default_log_line_listener,
+            process_sampler=None,
+            watchdog=None,
+            process_priority=None,
+            signal_forwarder=None,
         )
 
     @patch("pysonar_scanner.scannerengine.CmdExecutor")
@@ -346,6 +462,209 @@ class TestScannerEngineWithFake(pyfakefs.TestCase):
         self.assertEqual(actual_command, expected_command)
 
 
+class TestHeapSize(unittest.TestCase):
+    def setUp(self):
+        # The CPUs available on the machine running the tests must not influence the command line
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
+        self.jre_path = JREResolvedPath(pathlib.Path("jre/bin/java"))
+        self.engine_path = pathlib.Path("/test/scanner-engine.jar")
+
+    def __command(self, execute_mock, config, concurrent_runs: int = 1) -> list[str]:
+        scannerengine.ScannerEngine(self.jre_path, self.engine_path).run(config, concurrent_runs=concurrent_runs)
+        return execute_mock.call_args[0][0]
+
+    def test_normalize_heap_size(self):
+        self.assertEqual(scannerengine.normalize_heap_size("8000Mb"), "8000m")
+        self.assertEqual(scannerengine.normalize_heap_size("2GB"), "2g")
+        self.assertEqual(scannerengine.normalize_heap_size("512m"), "512m")
+        self.assertEqual(scannerengine.normalize_heap_size("1048576"), "1048576")
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=4 * 1024**3)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_java_heap_size_property(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {SONAR_SCANNER_JAVA_HEAP_SIZE: "8000Mb"})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xmx8000m", "-jar", str(self.engine_path)])
+        properties = json.loads(execute_mock.call_args[0][1])["scannerProperties"]
+        self.assertIn({"key": SONAR_SCANNER_JAVA_HEAP_SIZE, "value": "8000Mb"}, properties)
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=4 * 1024**3)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_heap_derived_from_memory_limit(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xmx3072m", "-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=4 * 1024**3)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_heap_shared_by_concurrent_engines(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {}, concurrent_runs=4)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xmx768m", "-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=4 * 1024**3)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_java_heap_size_property_not_shared(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {SONAR_SCANNER_JAVA_HEAP_SIZE: "2g"}, concurrent_runs=4)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xmx2g", "-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=768 * 1024**2)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_heap_keeps_a_safety_margin(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xmx512m", "-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=384 * 1024**2)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_memory_limit_too_low(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=4 * 1024**3)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_heap_set_in_java_opts(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {SONAR_SCANNER_JAVA_OPTS: "-Xmx1g"})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xmx1g", "-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.cgroups.get_memory_limit", return_value=None)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_no_memory_limit(self, execute_mock, memory_limit_mock):
+        cmd = self.__command(execute_mock, {})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-jar", str(self.engine_path)])
+
+
+@patch("pysonar_scanner.cgroups.get_memory_limit", return_value=None)
+@patch("os.cpu_count", return_value=16)
+class TestCpuLimit(unittest.TestCase):
+    def setUp(self):
+        self.jre_path = JREResolvedPath(pathlib.Path("jre/bin/java"))
+        self.engine_path = pathlib.Path("/test/scanner-engine.jar")
+
+    def __run(self, execute_mock, config, concurrent_runs: int = 1) -> tuple[list[str], list[dict]]:
+        scannerengine.ScannerEngine(self.jre_path, self.engine_path).run(config, concurrent_runs=concurrent_runs)
+        cmd, properties_str = execute_mock.call_args[0]
+        return cmd, json.loads(properties_str)["scannerProperties"]
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=2)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_limited_cpus(self, execute_mock, *args):
+        cmd, properties = self.__run(execute_mock, {})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-XX:ActiveProcessorCount=2", "-jar", str(self.engine_path)])
+        self.assertIn({"key": SONAR_PYTHON_ANALYSIS_THREADS, "value": 2}, properties)
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=2)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_explicit_settings_are_kept(self, execute_mock, *args):
+        config = {SONAR_PYTHON_ANALYSIS_THREADS: 8, SONAR_SCANNER_JAVA_OPTS: "-XX:ActiveProcessorCount=4"}
+        cmd, properties = self.__run(execute_mock, config)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-XX:ActiveProcessorCount=4", "-jar", str(self.engine_path)])
+        self.assertIn({"key": SONAR_PYTHON_ANALYSIS_THREADS, "value": 8}, properties)
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=2)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_single_threaded_analysis(self, execute_mock, *args):
+        _, properties = self.__run(execute_mock, {SONAR_PYTHON_ANALYSIS_PARALLEL: False})
+        self.assertNotIn(SONAR_PYTHON_ANALYSIS_THREADS, [prop["key"] for prop in properties])
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=16)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_cpus_shared_by_concurrent_engines(self, execute_mock, *args):
+        cmd, properties = self.__run(execute_mock, {}, concurrent_runs=3)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-XX:ActiveProcessorCount=5", "-jar", str(self.engine_path)])
+        self.assertIn({"key": SONAR_PYTHON_ANALYSIS_THREADS, "value": 5}, properties)
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=2)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_cpus_shared_by_more_engines_than_cpus(self, execute_mock, *args):
+        cmd, properties = self.__run(execute_mock, {}, concurrent_runs=4)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-XX:ActiveProcessorCount=1", "-jar", str(self.engine_path)])
+        self.assertIn({"key": SONAR_PYTHON_ANALYSIS_THREADS, "value": 1}, properties)
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=16)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_explicit_settings_are_kept_when_shared(self, execute_mock, *args):
+        config = {SONAR_PYTHON_ANALYSIS_THREADS: 8, SONAR_SCANNER_JAVA_OPTS: "-XX:ActiveProcessorCount=8"}
+        cmd, properties = self.__run(execute_mock, config, concurrent_runs=4)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-XX:ActiveProcessorCount=8", "-jar", str(self.engine_path)])
+        self.assertIn({"key": SONAR_PYTHON_ANALYSIS_THREADS, "value": 8}, properties)
+
+    @patch("pysonar_scanner.cgroups.get_available_cpus", return_value=16)
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_unlimited_cpus(self, execute_mock, *args):
+        cmd, properties = self.__run(execute_mock, {})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-jar", str(self.engine_path)])
+        self.assertEqual(properties, [])
+
+
+class TestClassDataSharing(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        # The CPUs available on the machine running the tests must not influence the command line
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
+        self.cache = cache.Cache.create_cache(pathlib.Path("/cache"))
+        self.fs.create_file("/jre/release", contents='JAVA_VERSION="17.0.9"\n')
+        self.fs.create_file("/jre/bin/java", contents="java")
+        self.fs.create_file("/cache/scanner-engine.jar", contents="engine")
+        self.jre_path = JREResolvedPath(pathlib.Path("/jre/bin/java"))
+        self.engine_path = pathlib.Path("/cache/scanner-engine.jar")
+        self.config = {SONAR_SCANNER_CLASS_DATA_SHARING: True}
+
+    def __run(self, execute_mock, returncode: int = 0, config=None) -> list[str]:
+        def execute():
+            cmd = execute_mock.call_args[0][0]
+            dump_option = next((opt for opt in cmd if opt.startswith("-XX:ArchiveClassesAtExit=")), None)
+            if dump_option is not None:
+                self.fs.create_file(dump_option.split("=", 1)[1], contents="archive")
+            return returncode
+
+        execute_mock.return_value.execute.side_effect = execute
+        engine = scannerengine.ScannerEngine(self.jre_path, self.engine_path, self.cache)
+        self.assertEqual(engine.run(config or self.config), returncode)
+        return execute_mock.call_args[0][0]
+
+    def __archives(self) -> list[pathlib.Path]:
+        return list(pathlib.Path("/cache").glob("scanner-engine-cds-*.jsa"))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_archive_is_created_then_reused(self, execute_mock):
+        first_cmd = self.__run(execute_mock)
+        self.assertTrue(any(opt.startswith("-XX:ArchiveClassesAtExit=") for opt in first_cmd))
+        self.assertEqual(len(self.__archives()), 1)
+
+        second_cmd = self.__run(execute_mock)
+        self.assertIn(f"-XX:SharedArchiveFile={self.__archives()[0]}", second_cmd)
+        self.assertEqual(second_cmd[-2:], ["-jar", str(self.engine_path)])
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_archive_is_invalidated_when_engine_changes(self, execute_mock):
+        self.__run(execute_mock)
+        old_archive = self.__archives()[0]
+
+        self.engine_path.write_text("new engine version")
+        cmd = self.__run(execute_mock)
+
+        self.assertTrue(any(opt.startswith("-XX:ArchiveClassesAtExit=") for opt in cmd))
+        self.assertEqual(len(self.__archives()), 1)
+        self.assertNotEqual(self.__archives()[0], old_archive)
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_archive_of_failed_run_is_discarded(self, execute_mock):
+        self.__run(execute_mock, returncode=1)
+        self.assertEqual(self.__archives(), [])
+        self.assertEqual(list(pathlib.Path("/cache").glob("*.tmp")), [])
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_disabled_for_old_jre_or_user_cds_options(self, execute_mock):
+        self.fs.remove_object("/jre/release")
+        self.fs.create_file("/jre/release", contents='JAVA_VERSION="11.0.2"\n')
+        cmd = self.__run(execute_mock)
+        self.assertEqual(cmd, [str(self.jre_path.path), "-jar", str(self.engine_path)])
+
+        cmd = self.__run(execute_mock, config={**self.config, SONAR_SCANNER_JAVA_OPTS: "-Xshare:off"})
+        self.assertEqual(cmd, [str(self.jre_path.path), "-Xshare:off", "-jar", str(self.engine_path)])
+
+
 class TestScannerEngineProvisioner(pyfakefs.TestCase):
     def setUp(self):
         self.setUpPyfakefs(allow_root_user=False)
@@ -427,3 +746,432 @@ class TestScannerEngineProvisioner(pyfakefs.TestCase):
             self.fs.chmod("/some-folder/cache-folder", mode=0o000, force_unix_mode=True)
 
             ScannerEngineProvisioner(self.api, self.cache).provision()
+
+
+class TestEngineLogCapture(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.base_dir = pathlib.Path(temp_dir.name)
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
+        self.log_lines = [
+            LogLine(level="DEBUG", message="a debug message"),
+            LogLine(level="ERROR", message="an error", stacktrace="a stacktrace"),
+        ]
+
+    def __run(self, execute_mock, config: dict) -> list[dict]:
+        def execute():
+            listener = execute_mock.call_args.kwargs["log_line_listener"]
+            for log_line in self.log_lines:
+                listener(log_line)
+            return 0
+
+        execute_mock.return_value.execute.side_effect = execute
+        engine = scannerengine.ScannerEngine(JREResolvedPath(pathlib.Path("java")), pathlib.Path("scanner-engine.jar"))
+        with self.assertLogs(level="INFO") as logs:
+            self.assertEqual(engine.run({SONAR_PROJECT_BASE_DIR: str(self.base_dir), **config}), 0)
+        self.assertIn("an error", "\n".join(logs.output))
+        self.assertNotIn("a debug message", "\n".join(logs.output))
+        return execute_mock.call_args
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_gzip_capture(self, execute_mock):
+        self.__run(execute_mock, {SONAR_SCANNER_ENGINE_LOG_CAPTURE: "gzip"})
+
+        with gzip.open(self.base_dir / ".scannerwork" / "engine-logs.jsonl.gz", "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record["message"] for record in records], ["a debug message", "an error"])
+        self.assertEqual([record["level"] for record in records], ["DEBUG", "ERROR"])
+        self.assertEqual(records[1]["stacktrace"], "a stacktrace")
+        self.assertNotIn("stacktrace", records[0])
+        self.assertTrue(all(isinstance(record["timestamp"], int) for record in records))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_lzma_capture_in_working_directory(self, execute_mock):
+        self.__run(execute_mock, {SONAR_SCANNER_ENGINE_LOG_CAPTURE: "lzma", SONAR_WORKING_DIRECTORY: "work"})
+
+        with lzma.open(self.base_dir / "work" / "engine-logs.jsonl.xz", "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_engine_debug_logs_are_requested(self, execute_mock):
+        call_args = self.__run(execute_mock, {SONAR_SCANNER_ENGINE_LOG_CAPTURE: "gzip"})
+        properties = json.loads(call_args[0][1])["scannerProperties"]
+        self.assertIn({"key": SONAR_LOG_LEVEL, "value": "DEBUG"}, properties)
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_configured_log_level_is_kept(self, execute_mock):
+        call_args = self.__run(execute_mock, {SONAR_SCANNER_ENGINE_LOG_CAPTURE: "gzip", SONAR_VERBOSE: True})
+        properties = json.loads(call_args[0][1])["scannerProperties"]
+        self.assertNotIn(SONAR_LOG_LEVEL, [p["key"] for p in properties])
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_no_capture_by_default(self, execute_mock):
+        execute_mock.return_value.execute.return_value = 0
+        engine = scannerengine.ScannerEngine(JREResolvedPath(pathlib.Path("java")), pathlib.Path("scanner-engine.jar"))
+        engine.run({SONAR_PROJECT_BASE_DIR: str(self.base_dir)})
+        self.assertIs(execute_mock.call_args.kwargs["log_line_listener"], default_log_line_listener)
+        self.assertFalse((self.base_dir / ".scannerwork").exists())
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_capture_with_sensor_timings(self, execute_mock):
+        self.log_lines.append(LogLine(level="INFO", message="Sensor Python Sensor [python] (done) | time=42ms"))
+        self.__run(execute_mock, {SONAR_SCANNER_ENGINE_LOG_CAPTURE: "gzip", SONAR_SCANNER_SENSOR_TIMINGS: True})
+
+        with gzip.open(self.base_dir / ".scannerwork" / "engine-logs.jsonl.gz", "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+        timings = json.loads((self.base_dir / ".scannerwork" / "analysis-timings.json").read_text())
+        self.assertEqual(
+            timings["timings"], [{"category": "sensor", "name": "Python Sensor [python]", "durationMs": 42}]
+        )
+
+    def test_unsupported_compression(self):
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(scannerengine.EngineLogCapture.create({SONAR_SCANNER_ENGINE_LOG_CAPTURE: "zip"}))
+        self.assertIn("Unsupported value 'zip'", logs.output[0])
+
+
+class TestResourceSampling(unittest.TestCase):
+    def setUp(self):
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
+        self.engine = scannerengine.ScannerEngine(JREResolvedPath(pathlib.Path("java")), pathlib.Path("engine.jar"))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_sampler_is_passed_to_executor(self, execute_mock):
+        execute_mock.return_value.execute.return_value = 0
+        config = {
+            SONAR_PROJECT_BASE_DIR: "/project",
+            SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL: "0.5",
+            SONAR_SCANNER_RESOURCE_SAMPLING_TIME_SERIES: True,
+        }
+        self.engine.run(config)
+
+        sampler = execute_mock.call_args.kwargs["process_sampler"]
+        self.assertEqual(sampler.interval_seconds, 0.5)
+        self.assertEqual(sampler.time_series_path, pathlib.Path("/project/.scannerwork/engine-resource-usage.csv"))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_invalid_interval(self, execute_mock):
+        execute_mock.return_value.execute.return_value = 0
+        for interval in ["fast", "0", "-1"]:
+            with self.subTest(interval=interval), self.assertLogs(level="WARNING") as logs:
+                self.engine.run({SONAR_SCANNER_RESOURCE_SAMPLING_INTERVAL: interval})
+                self.assertIsNone(execute_mock.call_args.kwargs["process_sampler"])
+                self.assertIn(f"Invalid value '{interval}'", logs.output[0])
+
+    def test_executor_samples_the_process(self):
+        sampler = MagicMock()
+        process = MagicMock()
+        process.pid = 123
+        process.stdout = io.BytesIO(b"")
+        process.stderr = io.BytesIO(b"")
+        process.returncode = 0
+        with patch("pysonar_scanner.scannerengine.Popen", return_value=process):
+            returncode = scannerengine.CmdExecutor(["java"], "{}", process_sampler=sampler).execute()
+
+        self.assertEqual(returncode, 0)
+        sampler.start.assert_called_once_with(123)
+        sampler.stop.assert_called_once()
+
+
+class TestFlightRecording(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = pathlib.Path(temp_dir.name)
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
+        (self.root / "jre" / "bin").mkdir(parents=True)
+        (self.root / "jre" / "release").write_text('JAVA_VERSION="17.0.9"\n')
+        self.engine = scannerengine.ScannerEngine(
+            JREResolvedPath(self.root / "jre" / "bin" / "java"), pathlib.Path("engine.jar")
+        )
+        self.config = {SONAR_PROJECT_BASE_DIR: str(self.root / "project"), SONAR_SCANNER_PROFILE_JVM: "profile"}
+
+    def __run(self, execute_mock, config: dict, write_recording: bool = True) -> list[str]:
+        def execute():
+            cmd = execute_mock.call_args[0][0]
+            recording = next((opt for opt in cmd if opt.startswith("-XX:StartFlightRecording=")), None)
+            if recording is not None and write_recording:
+                filename = next(part for part in recording.split(",") if part.startswith("filename="))
+                pathlib.Path(filename.removeprefix("filename=")).write_bytes(b"jfr")
+            return 0
+
+        execute_mock.return_value.execute.side_effect = execute
+        self.engine.run(config)
+        return execute_mock.call_args[0][0]
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_recording_is_moved_to_working_directory(self, execute_mock):
+        with self.assertLogs(level="INFO") as logs:
+            cmd = self.__run(execute_mock, self.config)
+
+        recording = [opt for opt in cmd if "FlightRecording" in opt]
+        self.assertEqual(len(recording), 1)
+        self.assertIn("settings=profile", recording[0])
+        self.assertIn("dumponexit=true", recording[0])
+        target_path = self.root / "project" / ".scannerwork" / "scanner-engine.jfr"
+        self.assertEqual(target_path.read_bytes(), b"jfr")
+        self.assertIn(str(target_path), "\n".join(logs.output))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_java_8_enables_flight_recorder(self, execute_mock):
+        (self.root / "jre" / "release").write_text('JAVA_VERSION="1.8.0_392"\n')
+        cmd = self.__run(execute_mock, self.config, write_recording=False)
+        self.assertIn("-XX:+FlightRecorder", cmd)
+        self.assertTrue(any(opt.startswith("-XX:StartFlightRecording=defaultrecording=true,") for opt in cmd))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_recording_from_java_opts_is_kept(self, execute_mock):
+        config = {**self.config, SONAR_SCANNER_JAVA_OPTS: "-XX:StartFlightRecording=filename=my.jfr"}
+        cmd = self.__run(execute_mock, config, write_recording=False)
+        self.assertEqual([opt for opt in cmd if "FlightRecording" in opt], ["-XX:StartFlightRecording=filename=my.jfr"])
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_missing_recording(self, execute_mock):
+        with self.assertLogs(level="WARNING") as logs:
+            self.__run(execute_mock, self.config, write_recording=False)
+        self.assertIn("did not write any flight recording", logs.output[0])
+
+    def test_unsupported_settings(self):
+        with self.assertLogs(level="WARNING") as logs:
+            recording = scannerengine.FlightRecording.create(
+                {SONAR_SCANNER_PROFILE_JVM: "continuous"}, JREResolvedPath(pathlib.Path("java"))
+            )
+        self.assertIsNone(recording)
+        self.assertIn("Unsupported value 'continuous'", logs.output[0])
+
+
+# Child process printing a thread dump on SIGQUIT and ignoring SIGTERM, so that only SIGKILL stops it
+STUCK_ENGINE = """
+import signal, sys, time
+# The dump is printed by the loop: printed by the handler, it could land in the middle of another line
+thread_dump_requests = []
+signal.signal(signal.SIGQUIT, lambda *_: thread_dump_requests.append(True))
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+sys.stdin.read()
+print("started", flush=True)
+while True:
+    time.sleep(0.01)
+    if thread_dump_requests:
+        thread_dump_requests.clear()
+        print("thread dump", flush=True)
+    if len(sys.argv) > 1:
+        print("still working", flush=True)
+"""
+
+
+class TestEngineWatchdog(unittest.TestCase):
+    def __execute(self, watchdog, *args: str) -> tuple[int, list[str]]:
+        messages = []
+        executor = scannerengine.CmdExecutor(
+            [sys.executable, "-c", STUCK_ENGINE, *args],
+            "{}",
+            log_line_listener=lambda log_line: messages.append(log_line.message),
+            watchdog=watchdog,
+        )
+        return executor.execute(), messages
+
+    @unittest.skipUnless(hasattr(signal, "SIGQUIT"), "requires POSIX signals")
+    def test_inactivity_timeout(self):
+        watchdog = scannerengine.EngineWatchdog(inactivity_timeout=0.5, thread_dump_wait=0.5, termination_grace=0.2)
+        with self.assertLogs(level="ERROR") as logs:
+            returncode, messages = self.__execute(watchdog)
+
+        self.assertEqual(returncode, ENGINE_TIMEOUT_RETURN_CODE)
+        self.assertEqual(messages, ["started", "thread dump"])
+        self.assertIn("did not log anything for 0.5 seconds", logs.output[0])
+
+    @unittest.skipUnless(hasattr(signal, "SIGQUIT"), "requires POSIX signals")
+    def test_overall_timeout_despite_activity(self):
+        watchdog = scannerengine.EngineWatchdog(
+            timeout=0.5, inactivity_timeout=5, thread_dump_wait=0.2, termination_grace=0.2
+        )
+        with self.assertLogs(level="ERROR") as logs:
+            returncode, messages = self.__execute(watchdog, "verbose")
+
+        self.assertEqual(returncode, ENGINE_TIMEOUT_RETURN_CODE)
+        self.assertIn("thread dump", messages)
+        self.assertIn("did not complete within 0.5 seconds", logs.output[0])
+
+    def test_process_completing_in_time(self):
+        watchdog = scannerengine.EngineWatchdog(timeout=30, inactivity_timeout=30)
+        executor = scannerengine.CmdExecutor([sys.executable, "-c", "import sys; sys.exit(3)"], "{}", watchdog=watchdog)
+        self.assertEqual(executor.execute(), 3)
+        self.assertFalse(watchdog.expired)
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_watchdog_from_configuration(self, execute_mock):
+        execute_mock.return_value.execute.return_value = 0
+        engine = scannerengine.ScannerEngine(JREResolvedPath(pathlib.Path("java")), pathlib.Path("engine.jar"))
+        with patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1):
+            engine.run({SONAR_SCANNER_ENGINE_TIMEOUT: 3600, SONAR_SCANNER_ENGINE_INACTIVITY_TIMEOUT: "600"})
+
+        watchdog = execute_mock.call_args.kwargs["watchdog"]
+        self.assertEqual((watchdog.timeout, watchdog.inactivity_timeout), (3600, 600))
+
+
+class TestJvmProfile(pyfakefs.TestCase):
+    def setUp(self):
+        self.setUpPyfakefs()
+        cpus_patcher = patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1)
+        cpus_patcher.start()
+        self.addCleanup(cpus_patcher.stop)
+        self.fs.create_file("/jre/release", contents='JAVA_VERSION="21.0.2"\n')
+        self.engine = scannerengine.ScannerEngine(JREResolvedPath(pathlib.Path("/jre/bin/java")), pathlib.Path("e.jar"))
+
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_profile_options_precede_java_opts(self, execute_mock):
+        execute_mock.return_value.execute.return_value = 0
+        with self.assertLogs(level="INFO") as logs:
+            self.engine.run({SONAR_SCANNER_JVM_PROFILE: "throughput", SONAR_SCANNER_JAVA_OPTS: "-Xmx1g"})
+
+        cmd = execute_mock.call_args[0][0]
+        self.assertEqual(
+            cmd,
+            [
+                "/jre/bin/java",
+                "-XX:+UseParallelGC",
+                "-XX:+TieredCompilation",
+                "-XX:+UseStringDeduplication",
+                "-XX:MetaspaceSize=256m",
+                "-Xmx1g",
+                "-jar",
+                "e.jar",
+            ],
+        )
+        self.assertIn("Using the throughput JVM profile", "\n".join(logs.output))
+
+
+class TestProcessPriority(unittest.TestCase):
+    @unittest.skipUnless(sys.platform == "linux", "process priorities are only supported on Linux")
+    @patch("pysonar_scanner.scannerengine.CmdExecutor")
+    def test_priority_from_configuration(self, execute_mock):
+        execute_mock.return_value.execute.return_value = 0
+        engine = scannerengine.ScannerEngine(JREResolvedPath(pathlib.Path("java")), pathlib.Path("engine.jar"))
+        with patch("pysonar_scanner.cgroups.get_available_cpus", return_value=os.cpu_count() or 1):
+            with self.assertLogs(level="INFO") as logs:
+                engine.run({SONAR_SCANNER_ENGINE_NICENESS: 19})
+
+        self.assertEqual(execute_mock.call_args.kwargs["process_priority"].niceness, 19)
+        self.assertIn("Running the scanner engine with niceness 19", "\n".join(logs.output))
+
+
+# Child process starting a grandchild, then waiting; with "ignore-sigterm", only SIGKILL stops it
+CANCELLABLE_ENGINE = """
+import signal, subprocess, sys, time
+if len(sys.argv) > 1:
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+grandchild = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print(grandchild.pid, flush=True)
+time.sleep(60)
+"""
+
+
+def has_exited(pid: int, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            stat = pathlib.Path(f"/proc/{pid}/stat").read_text()
+        except OSError:
+            return True
+        # A killed grandchild may stay a zombie when nothing reaps orphans, as in some containers
+        if stat[stat.rindex(")") + 2] == "Z":
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@unittest.skipUnless(pathlib.Path("/proc/self/stat").exists(), "requires POSIX signals and the /proc file system")
+class TestSignalForwarding(unittest.TestCase):
+    def __execute(self, signals: list[int], *args: str, grace_period: float = 0.5) -> tuple[int, list[str]]:
+        messages = []
+
+        def listener(log_line: LogLine):
+            messages.append(log_line.message)
+            if len(messages) == 1:
+                Timer(0.1, send_signals).start()
+
+        def send_signals():
+            for signal_number in signals:
+                os.kill(os.getpid(), signal_number)
+                time.sleep(0.1)
+
+        executor = scannerengine.CmdExecutor(
+            [sys.executable, "-c", CANCELLABLE_ENGINE, *args], "{}", log_line_listener=listener
+        )
+        with patch.object(
+            scannerengine, "SignalForwarder", partial(scannerengine.SignalForwarder, grace_period=grace_period)
+        ):
+            with self.assertLogs(level="WARNING") as logs:
+                returncode = executor.execute()
+        self.assertIn("The analysis was cancelled", logs.output[-1])
+        return returncode, messages
+
+    def test_sigterm_is_forwarded_to_the_process_group(self):
+        returncode, messages = self.__execute([signal.SIGTERM])
+
+        self.assertEqual(returncode, 128 + signal.SIGTERM)
+        self.assertTrue(has_exited(int(messages[0])))
+        self.assertIs(signal.getsignal(signal.SIGTERM), signal.SIG_DFL)
+
+    def test_sigint_is_forwarded(self):
+        returncode, _ = self.__execute([signal.SIGINT])
+
+        self.assertEqual(returncode, 128 + signal.SIGINT)
+        self.assertIs(signal.getsignal(signal.SIGINT), signal.default_int_handler)
+
+    def test_engine_is_killed_after_grace_period(self):
+        started_at = time.monotonic()
+        returncode, messages = self.__execute([signal.SIGTERM], "ignore-sigterm")
+
+        self.assertEqual(returncode, 128 + signal.SIGTERM)
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.5)
+        self.assertTrue(has_exited(int(messages[0])))
+
+    def test_second_signal_kills_at_once(self):
+        started_at = time.monotonic()
+        returncode, _ = self.__execute([signal.SIGTERM, signal.SIGINT], "ignore-sigterm", grace_period=30)
+
+        self.assertEqual(returncode, 128 + signal.SIGTERM)
+        self.assertLess(time.monotonic() - started_at, 10)
+
+    def test_shared_forwarder_stops_all_engines(self):
+        signal_forwarder = scannerengine.SignalForwarder(grace_period=0.5)
+        pids: list[int] = []
+        returncodes: list[int] = []
+
+        def listener(log_line: LogLine):
+            pids.append(int(log_line.message))
+            if len(pids) == 2:
+                Timer(0.1, os.kill, args=(os.getpid(), signal.SIGTERM)).start()
+
+        def execute():
+            executor = scannerengine.CmdExecutor(
+                [sys.executable, "-c", CANCELLABLE_ENGINE],
+                "{}",
+                log_line_listener=listener,
+                signal_forwarder=signal_forwarder,
+            )
+            returncodes.append(executor.execute())
+
+        signal_forwarder.install()
+        try:
+            threads = [Thread(target=execute) for _ in range(2)]
+            with self.assertLogs(level="WARNING"):
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            signal_forwarder.uninstall()
+
+        self.assertEqual(returncodes, [128 + signal.SIGTERM] * 2)
+        self.assertTrue(all(has_exited(pid) for pid in pids))
+        self.assertEqual(signal_forwarder.processes, [])
+        self.assertIs(signal.getsignal(signal.SIGTERM), signal.SIG_DFL)
@@ -0,0 +1,81 @@
+#
+# Sonar Scanner Python
+# Copyright (C) 2011-2026 SonarSource Sàrl
+# mailto:info AT sonarsource DOT com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+#
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+#
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ANALYSIS_MODULES = (
+    "requests",
+    "urllib3",
+    "tarfile",
+    "pysonar_scanner.api",
+    "pysonar_scanner.cache",
+    "pysonar_scanner.jre",
+    "pysonar_scanner.scannerengine",
+)
+
+RUN_PYSONAR = "import sys; sys.argv = ['pysonar', *sys.argv[1:]]; from pysonar_scanner.__main__ import main; main()"
+
+
+def run_with_import_times(args: list[str], cwd: str) -> tuple[int, dict[str, int]]:
+    """Run pysonar with the given arguments and return its exit code and the cumulative import time of each module."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_PYSONAR, *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            import_times[module.strip()] = int(cumulative)
+    return process.returncode, import_times
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.project_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.project_dir.cleanup)
+
+    def test_help(self):
+        returncode, import_times = run_with_import_times(["--help"], self.project_dir.name)
+
+        self.assertEqual(returncode, 0)
+        self.assertAnalysisModulesNotLoaded(import_times)
+        self.assertNotIn("xml.etree.ElementTree", import_times)
+
+    def test_dry_run(self):
+        returncode, import_times = run_with_import_times(["--dry-run", "-Dsonar.projectKey=key"], self.project_dir.name)
+
+        self.assertEqual(returncode, 0)
+        self.assertAnalysisModulesNotLoaded(import_times)
+        self.assertIn("pysonar_scanner.dry_run_reporter", import_times)
+
+    def assertAnalysisModulesNotLoaded(self, import_times: dict[str, int]):
+        self.assertIn("pysonar_scanner.__main__", import_times)
+        loaded = [module for module in ANALYSIS_MODULES if module in import_times]
+        self.assertEqual(loaded, [], "These modules should only be imported when the analysis runs")
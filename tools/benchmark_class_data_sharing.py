@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Measure the startup time of the scanner engine JVM with and without the class data sharing archive
+managed by ClassDataSharingArchive.
+
+Each run starts the engine JAR with the given JSON input on stdin; the default input holds no property,
+so the engine stops right after bootstrapping and the time measured is mostly the JVM and engine startup.
+Pass the input of a real analysis to measure whole runs instead.
+
+Usage: python tools/benchmark_class_data_sharing.py <java executable> <scanner engine JAR> [input JSON file] [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pysonar_scanner.cache import Cache  # noqa: E402
+from pysonar_scanner.jre import JREResolvedPath  # noqa: E402
+from pysonar_scanner.scannerengine import ClassDataSharingArchive  # noqa: E402
+
+DEFAULT_INPUT = '{"scannerProperties": []}'
+
+
+def run_engine(java: Path, engine: Path, options: list[str], engine_input: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [str(java), *options, "-jar", str(engine)],
+        input=engine_input.encode(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    java, engine = Path(sys.argv[1]), Path(sys.argv[2])
+    engine_input = Path(sys.argv[3]).read_text() if len(sys.argv) > 3 else DEFAULT_INPUT
+    runs = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+
+    with tempfile.TemporaryDirectory() as cache_folder:
+        archive = ClassDataSharingArchive.create(Cache(Path(cache_folder)), JREResolvedPath(java), engine)
+        if archive is None:
+            sys.exit(f"Class data sharing is not available for {java}")
+
+        without_cds = [run_engine(java, engine, [], engine_input) for _ in range(runs)]
+        dump = run_engine(java, engine, archive.jvm_options(), engine_input)
+        # The archive only depends on the classes loaded, so it is kept whatever the exit code of the engine
+        archive.complete(0)
+        if not archive.is_valid():
+            sys.exit("The JVM did not dump a class data sharing archive")
+        with_cds = [run_engine(java, engine, archive.jvm_options(), engine_input) for _ in range(runs)]
+
+    print(f"Without archive (median of {runs}): {statistics.median(without_cds):8.0f} ms")
+    print(f"Dumping the archive:              {dump:8.0f} ms")
+    print(f"With archive (median of {runs}):    {statistics.median(with_cds):8.0f} ms")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Measure how long CliConfigurationLoader takes to build its parser and to parse a command line
+made of a few options and of many -Dkey=value analysis properties.
+
+Usage: python tools/benchmark_cli_parsing.py [number of -D properties] [number of runs]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pysonar_scanner.configuration.cli import CliConfigurationLoader  # noqa: E402
+
+
+def measure(function, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+if __name__ == "__main__":
+    properties = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    argv = ["--token", "benchmark", "--sonar-project-key", "benchmark", "-Dsonar.projectName=benchmark"]
+    argv += [f"-Dsonar.custom.property{i}=value{i}" for i in range(properties)]
+
+    create_parser = CliConfigurationLoader._CliConfigurationLoader__create_parser
+    parser = create_parser()
+    print(f"Parser construction:                     {measure(create_parser, runs):8.2f} ms")
+    print(
+        f"argparse alone, {properties} -D properties:    {measure(lambda: parser.parse_known_args(argv), runs):8.2f} ms"
+    )
+    print(
+        f"CliConfigurationLoader.load (cached):    {measure(lambda: CliConfigurationLoader.load(argv), runs):8.2f} ms"
+    )
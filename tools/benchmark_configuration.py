@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Measure how long ConfigurationLoader.load takes to resolve the configuration of a project.
+
+The project is generated in a temporary directory with hundreds of [tool.sonar] keys in its pyproject.toml,
+and as many -Dkey=value arguments are passed on the command line. The file system accesses of the last run are
+reported too: checks answered from the directory index of the base directory would each have cost a stat call.
+Usage: python tools/benchmark_configuration.py [number of keys] [number of runs]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pysonar_scanner.configuration.configuration_loader import ConfigurationLoader  # noqa: E402
+from pysonar_scanner.configuration.properties import PROPERTIES  # noqa: E402
+from pysonar_scanner.configuration.provenance import ConfigurationProvenance  # noqa: E402
+
+
+def write_project(project_dir: Path, keys: int) -> None:
+    # Known properties go through the property index, unknown ones through the kebab to camel case conversion
+    names = {prop.python_name().removeprefix("sonar.") for prop in PROPERTIES}
+    # A TOML key cannot be both a value and a table, e.g. "scanner" and "scanner.app"
+    known = sorted(name for name in names if "." not in name and not any(n.startswith(name + ".") for n in names))
+    lines = ["[tool.sonar]", 'project-key = "benchmark"']
+    # sonar.tests is left to the test paths detection and sonar.modules would point to missing directories
+    lines += [f'{name} = "value"' for name in known if name not in ("project-key", "tests", "modules")]
+    lines += [f'custom.benchmark-key-{i} = "value {i}"' for i in range(keys)]
+    (project_dir / "pyproject.toml").write_text("\n".join(lines) + "\n")
+    (project_dir / "tox.ini").write_text("[tox]\nenv_list = py311\n")
+    (project_dir / "test").mkdir()
+
+
+def run_benchmark(keys: int, runs: int) -> tuple[float, ConfigurationProvenance]:
+    with tempfile.TemporaryDirectory() as project_dir:
+        write_project(Path(project_dir), keys)
+        argv = ["pysonar", "--token", "benchmark", "--sonar-project-base-dir", project_dir]
+        argv += [f"-Dsonar.custom.cliKey{i}=value{i}" for i in range(keys)]
+        with mock.patch("sys.argv", argv):
+            start = time.perf_counter()
+            for _ in range(runs):
+                provenance = ConfigurationProvenance()
+                ConfigurationLoader.load(provenance)
+            return (time.perf_counter() - start) / runs, provenance
+
+
+if __name__ == "__main__":
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    duration, provenance = run_benchmark(keys, runs)
+    print(f"Configuration with {keys} TOML keys and {keys} -D arguments resolved in {duration * 1000:.2f} ms")
+    counters = provenance.filesystem_counters
+    print(
+        f"File system: {counters.directory_scans} directory scan, {counters.index_lookups} checks answered from it, "
+        f"{counters.stat_calls} stat calls"
+    )
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Measure how many engine log lines per second CmdExecutor forwards to logging.
+
+A child Python process plays the role of the scanner engine and writes a mix of JSON and plain text lines.
+Usage: python tools/benchmark_log_pipeline.py [number of lines]
+"""
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pysonar_scanner.scannerengine import CmdExecutor  # noqa: E402
+
+ENGINE_SCRIPT = """
+import sys
+out = sys.stdout
+for i in range({lines}):
+    if i % 4 == 0:
+        out.write("plain output line %d of the engine\\n" % i)
+    else:
+        out.write('{{"level":"DEBUG","message":"Indexing file src/module_%d.py"}}\\n' % i)
+"""
+
+
+def run_benchmark(lines: int) -> float:
+    cmd = [sys.executable, "-c", ENGINE_SCRIPT.format(lines=lines)]
+    start = time.perf_counter()
+    CmdExecutor(cmd, "").execute()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    # Lines are parsed and dispatched to logging, but only INFO and above are printed, as in a default run
+    logging.basicConfig(level=logging.INFO, stream=open(os.devnull, "w"))
+    duration = run_benchmark(lines)
+    print(f"{lines} lines forwarded in {duration:.2f}s: {lines / duration:,.0f} lines/s")
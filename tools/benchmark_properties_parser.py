@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare how long the built-in Java properties parser and jproperties take to read a large generated
+sonar-project.properties file: module declarations, path lists continued over several lines, escapes and comments.
+
+Usage: python tools/benchmark_properties_parser.py [number of lines] [number of runs]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from jproperties import Properties  # noqa: E402
+
+from pysonar_scanner.configuration import java_properties  # noqa: E402
+
+
+def write_properties(path: Path, lines: int) -> None:
+    content = ["# Generated by the build", "sonar.projectKey=monorepo", "sonar.sources=src"]
+    module = 0
+    while len(content) < lines:
+        prefix = f"module{module}"
+        content += [
+            f"# Module {module}",
+            f"{prefix}.sonar.projectName=Module {module} \\u00e9",
+            f"{prefix}.sonar.projectBaseDir=services/{prefix}",
+            f"{prefix}.sonar.sources=src/main/python,\\",
+            "    src/generated/python,\\",
+            f"    src/vendor/{prefix}",
+            f"{prefix}.sonar.exclusions=**/migrations/**,**/*_pb2.py",
+            f"{prefix}.sonar.python.coverage.reportPaths = build/{prefix}/coverage.xml",
+            f"{prefix}.sonar.tests : tests",
+            "",
+        ]
+        module += 1
+    path.write_text("\n".join(content[:lines]) + "\n", encoding="iso-8859-1")
+
+
+def load_with_jproperties(path: Path) -> dict[str, str]:
+    properties = Properties()
+    with open(path, "rb") as f:
+        properties.load(f)
+    return {key: value.data for key, value in properties.items()}
+
+
+def measure(function, path: Path, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        function(path)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "sonar-project.properties"
+        write_properties(path, lines)
+        if java_properties.load(path) != load_with_jproperties(path):
+            sys.exit("The parsers disagree on the generated file")
+        builtin_ms = measure(java_properties.load, path, runs)
+        jproperties_ms = measure(load_with_jproperties, path, runs)
+    print(f"{lines} lines parsed in {builtin_ms:.2f} ms by the built-in parser")
+    print(f"{lines} lines parsed in {jproperties_ms:.2f} ms by jproperties ({jproperties_ms / builtin_ms:.1f}x slower)")
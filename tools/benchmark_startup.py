@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Measure how long pysonar takes to import its modules for --help and for --dry-run, as reported by -X importtime,
+and compare it with a budget.
+
+Usage: python tools/benchmark_startup.py [budget in ms] [number of runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+RUN_PYSONAR = "import sys; sys.argv = ['pysonar', *sys.argv[1:]]; from pysonar_scanner.__main__ import main; main()"
+COMMANDS = {"--help": ["--help"], "--dry-run": ["--dry-run", "-Dsonar.projectKey=key"]}
+
+
+def main_import_time_ms(args: list[str], cwd: str) -> float:
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_PYSONAR, *args], cwd=cwd, env=env, capture_output=True, text=True
+    )
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and line.rstrip().endswith("| pysonar_scanner.__main__"):
+            return int(line.split("|")[1]) / 1000
+    raise RuntimeError(f"pysonar_scanner.__main__ was not imported:\n{process.stderr}")
+
+
+if __name__ == "__main__":
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 200
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    over_budget = False
+    with tempfile.TemporaryDirectory() as project_dir:
+        for name, args in COMMANDS.items():
+            duration = statistics.median(main_import_time_ms(args, project_dir) for _ in range(runs))
+            over_budget |= duration >= budget_ms
+            print(f"{name:10} imports (median of {runs}): {duration:7.1f} ms (budget: {budget_ms:g} ms)")
+    sys.exit(1 if over_budget else 0)